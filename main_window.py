@@ -2,13 +2,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import os
-import glob
+from collections import OrderedDict
 from PIL import Image, ImageTk
 
 # Add the current directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from shared.asset_catalog import get_asset_catalog
+from shared.thumbnail_cache import ThumbnailCache
 from shared.database import DatabaseManager
+from shared.image_registry import get_image_registry, DEFAULT_BACKGROUND
 from shared.theme import set_dark_theme
 from shared.notes_db import NotesDBManager
 from dictionaries import *
@@ -30,28 +33,46 @@ from shared.settings import SettingsManager
 class AssetViewer(tk.Toplevel):
     """Modal viewer to browse race, weapon, and armor/shield images."""
 
+    THUMB_SIZE = 96
+    CELL_WIDTH = 112
+    CELL_HEIGHT = 124
+    THUMB_POLL_MS = 40
+    MAX_THUMB_PHOTOS = 400
+
     def __init__(self, master, base_dir):
         super().__init__(master)
         self.title("Asset Viewers")
         self.geometry("1100x720")
         self.base_dir = base_dir
+        self.catalog = get_asset_catalog()
+        self.thumbnails = ThumbnailCache(size=(self.THUMB_SIZE, self.THUMB_SIZE))
         self.preview_image = None
+        self.files = []
+        self.file_index = {}
+        self.visible_names = []
+        self.visible_positions = {}
+        self.selected_name = None
+        self.grid_columns = 1
+        self.cell_items = {}
+        self.thumb_photos = OrderedDict()
         self.category_var = tk.StringVar()
         self.filter_var = tk.StringVar()
         self.categories = {
             "Race Images": {
-                "patterns": [(os.path.join(base_dir, "images", "raceimages"), "*.jpg")],
+                "patterns": [("raceimages", "*.jpg")],
             },
             "Weapons": {
-                "patterns": [(os.path.join(base_dir, "images", "Weapon_Images"), "weapon_*.jpg")],
+                "patterns": [("Weapon_Images", "weapon_*.jpg")],
             },
             "Armor / Shields / Misc": {
-                "patterns": [(os.path.join(base_dir, "images", "Weapon_Images"), "*.jpg")],
+                "patterns": [("Weapon_Images", "*.jpg")],
                 "exclude_prefixes": ["weapon_"],
             },
         }
         self._build_ui()
         self._load_files()
+        self.bind("<Destroy>", self._on_destroy)
+        self.after(self.THUMB_POLL_MS, self._poll_thumbnails)
 
     def _build_ui(self):
         self.grid_columnconfigure(0, weight=1)
@@ -88,12 +109,22 @@ class AssetViewer(tk.Toplevel):
         list_frame.grid_columnconfigure(0, weight=1)
 
         ttk.Label(list_frame, text="Files").grid(row=0, column=0, sticky="w")
-        self.file_list = tk.Listbox(list_frame, height=25, exportselection=False)
-        self.file_list.grid(row=1, column=0, sticky="nsew")
-        self.file_list.bind("<<ListboxSelect>>", lambda _e: self._show_selected())
-        list_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.file_list.yview)
-        list_scroll.grid(row=1, column=1, sticky="ns")
-        self.file_list.configure(yscrollcommand=list_scroll.set)
+        self.grid_canvas = tk.Canvas(
+            list_frame,
+            width=3 * self.CELL_WIDTH,
+            background="#1f1f1f",
+            highlightthickness=1,
+            highlightbackground="#3c3c3c",
+        )
+        self.grid_canvas.grid(row=1, column=0, sticky="nsew")
+        self.grid_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self._on_grid_scroll)
+        self.grid_scroll.grid(row=1, column=1, sticky="ns")
+        self.grid_canvas.configure(yscrollcommand=self._on_grid_yview)
+        self.grid_canvas.bind("<Configure>", lambda _e: self._layout_grid())
+        self.grid_canvas.bind("<Button-1>", self._on_grid_click)
+        self.grid_canvas.bind("<MouseWheel>", self._on_grid_mousewheel)
+        self.grid_canvas.bind("<Button-4>", self._on_grid_mousewheel)
+        self.grid_canvas.bind("<Button-5>", self._on_grid_mousewheel)
 
         preview_frame = ttk.Frame(self, padding=(6, 0, 10, 10))
         preview_frame.grid(row=1, column=1, sticky="nsew")
@@ -112,8 +143,8 @@ class AssetViewer(tk.Toplevel):
         patterns = cfg.get("patterns", [])
         exclude_prefixes = cfg.get("exclude_prefixes", [])
         files = []
-        for root, pat in patterns:
-            for path in glob.glob(os.path.join(root, pat)):
+        for folder, pat in patterns:
+            for path in self.catalog.find_files(folder, pat):
                 base = os.path.basename(path)
                 if any(base.lower().startswith(pref) for pref in exclude_prefixes):
                     continue
@@ -131,41 +162,148 @@ class AssetViewer(tk.Toplevel):
         return files
 
     def _load_files(self):
-        self.file_list.delete(0, tk.END)
         self.preview_canvas.delete("all")
         self.status_label.configure(text="")
         category = self.category_var.get() or "Race Images"
         self.files = self._gather_files(category)
+        self.file_index = {os.path.basename(path): path for path in self.files}
         self._apply_filter()
 
     def _apply_filter(self):
         filter_text = (self.filter_var.get() or "").lower().strip()
-        self.file_list.delete(0, tk.END)
-        for path in self.files:
-            base = os.path.basename(path)
-            if filter_text and filter_text not in base.lower():
-                continue
-            self.file_list.insert(tk.END, base)
-        if self.file_list.size() > 0:
-            self.file_list.selection_set(0)
-            self._show_selected()
+        self.visible_names = [
+            name for name in self.file_index
+            if not filter_text or filter_text in name.lower()
+        ]
+        self.visible_positions = {name: index for index, name in enumerate(self.visible_names)}
+        self.grid_canvas.yview_moveto(0)
+        self._layout_grid()
+        if self.visible_names:
+            self._select_name(self.visible_names[0])
         else:
+            self.selected_name = None
             self.preview_canvas.delete("all")
             self.status_label.configure(text="No files match.")
 
-    def _show_selected(self):
-        sel = self.file_list.curselection()
-        if not sel:
+    # ------------------------------------------------------------------
+    # Thumbnail grid (only the cells in view exist on the canvas)
+    # ------------------------------------------------------------------
+    def _layout_grid(self):
+        width = max(self.grid_canvas.winfo_width(), self.CELL_WIDTH)
+        self.grid_columns = max(1, width // self.CELL_WIDTH)
+        rows = -(-len(self.visible_names) // self.grid_columns)
+        self.grid_canvas.configure(scrollregion=(0, 0, width, rows * self.CELL_HEIGHT))
+        self.grid_canvas.delete("cell")
+        self.cell_items = {}
+        self._render_visible_cells()
+
+    def _visible_index_range(self):
+        top = self.grid_canvas.canvasy(0)
+        height = self.grid_canvas.winfo_height() or 600
+        first_row = max(0, int(top // self.CELL_HEIGHT))
+        last_row = int((top + height) // self.CELL_HEIGHT) + 1  # one row of look-ahead
+        start = first_row * self.grid_columns
+        stop = min(len(self.visible_names), (last_row + 1) * self.grid_columns)
+        return range(start, stop)
+
+    def _render_visible_cells(self):
+        wanted = self._visible_index_range()
+        for index in [i for i in self.cell_items if i not in wanted]:
+            self.grid_canvas.delete(f"cell{index}")
+            del self.cell_items[index]
+        wanted_paths = []
+        for index in wanted:
+            path = self.file_index[self.visible_names[index]]
+            wanted_paths.append(path)
+            if index not in self.cell_items:
+                self._draw_cell(index)
+            if path not in self.thumb_photos:
+                self.thumbnails.request(path)
+        self.thumbnails.retain(wanted_paths)
+
+    def _draw_cell(self, index):
+        name = self.visible_names[index]
+        path = self.file_index[name]
+        row, column = divmod(index, self.grid_columns)
+        x0 = column * self.CELL_WIDTH
+        y0 = row * self.CELL_HEIGHT
+        tags = ("cell", f"cell{index}")
+        outline = "#6a9fd4" if name == self.selected_name else "#2d2d2d"
+        rect = self.grid_canvas.create_rectangle(
+            x0 + 2, y0 + 2, x0 + self.CELL_WIDTH - 2, y0 + self.CELL_HEIGHT - 2,
+            fill="#262626", outline=outline, width=2, tags=tags,
+        )
+        center_x = x0 + self.CELL_WIDTH // 2
+        photo = self.thumb_photos.get(path)
+        if photo is not None:
+            self.thumb_photos.move_to_end(path)
+            self.grid_canvas.create_image(center_x, y0 + 6 + self.THUMB_SIZE // 2, image=photo, tags=tags)
+        else:
+            self.grid_canvas.create_text(
+                center_x, y0 + 6 + self.THUMB_SIZE // 2, text="...", fill="#777777", tags=tags,
+            )
+        label = name if len(name) <= 16 else f"{name[:15]}\u2026"
+        self.grid_canvas.create_text(
+            center_x, y0 + self.CELL_HEIGHT - 6, text=label, anchor="s",
+            fill="#cfcfcf", font=("Arial", 8), tags=tags,
+        )
+        self.cell_items[index] = rect
+
+    def _poll_thumbnails(self):
+        if not self.winfo_exists():
+            return
+        for path, image in self.thumbnails.drain():
+            if image is None:
+                continue
+            self.thumb_photos[path] = ImageTk.PhotoImage(image)
+            while len(self.thumb_photos) > self.MAX_THUMB_PHOTOS:
+                self.thumb_photos.popitem(last=False)
+            index = self.visible_positions.get(os.path.basename(path))
+            if index is not None and index in self.cell_items:
+                self.grid_canvas.delete(f"cell{index}")
+                self._draw_cell(index)
+        self.after(self.THUMB_POLL_MS, self._poll_thumbnails)
+
+    def _on_grid_scroll(self, *args):
+        self.grid_canvas.yview(*args)
+
+    def _on_grid_yview(self, first, last):
+        self.grid_scroll.set(first, last)
+        self._render_visible_cells()
+
+    def _on_grid_mousewheel(self, event):
+        delta = event.delta
+        if delta == 0:
+            delta = 120 if getattr(event, "num", 0) == 4 else -120
+        self.grid_canvas.yview_scroll(-1 if delta > 0 else 1, "units")
+        return "break"
+
+    def _on_grid_click(self, event):
+        column = int(self.grid_canvas.canvasx(event.x) // self.CELL_WIDTH)
+        row = int(self.grid_canvas.canvasy(event.y) // self.CELL_HEIGHT)
+        if column >= self.grid_columns:
             return
-        name = self.file_list.get(sel[0])
-        match = None
-        for path in self.files:
-            if os.path.basename(path) == name:
-                match = path
-                break
-        if not match:
+        index = row * self.grid_columns + column
+        if 0 <= index < len(self.visible_names):
+            self._select_name(self.visible_names[index])
+
+    def _select_name(self, name):
+        previous = self.visible_positions.get(self.selected_name)
+        self.selected_name = name
+        for index, outline in ((previous, "#2d2d2d"), (self.visible_positions.get(name), "#6a9fd4")):
+            if index in self.cell_items:
+                self.grid_canvas.itemconfigure(self.cell_items[index], outline=outline)
+        self._show_selected()
+
+    def _show_selected(self):
+        path = self.file_index.get(self.selected_name)
+        if not path:
             return
-        self._render_image(match)
+        self._render_image(path)
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.thumbnails.shutdown()
 
     def _render_image(self, path):
         try:
@@ -213,11 +351,8 @@ class EQToolsSuite:
 
         # Set application icon from default.jpg (favicon)
         try:
-            icon_path = os.path.join(os.path.dirname(__file__), "images", "other", "default.jpg")
-            if os.path.exists(icon_path):
-                _icon_img = Image.open(icon_path)
-                self.app_icon = ImageTk.PhotoImage(_icon_img)
-                self.root.iconphoto(True, self.app_icon)
+            self.app_icon = get_image_registry().get_photo(DEFAULT_BACKGROUND)
+            self.root.iconphoto(True, self.app_icon)
         except Exception as _e:
             # Non-fatal if icon fails to load
             pass
@@ -405,6 +540,8 @@ class EQToolsSuite:
 
         if self.interface_initialized:
             # Ensure database uses latest IP on next query
+            if hasattr(self, 'inventory_tool'):
+                self.inventory_tool.close()
             self.db_manager.close()
             self.test_database_connection()
     
@@ -744,6 +881,10 @@ class EQToolsSuite:
     
     def on_closing(self):
         """Handle application closing"""
+        # Stop background workers and their connections
+        if hasattr(self, 'inventory_tool'):
+            self.inventory_tool.close()
+
         # Close database connection
         self.db_manager.close()
 
@@ -18,6 +18,9 @@ python -m venv venv
 python -m pip install --upgrade pip
 pip install -r requirements.txt
 
+Write-Host "Packing item and spell icons..."
+python -m shared.icon_atlas
+
 Write-Host ""
 Write-Host "Virtual environment setup complete!"
 Write-Host "To activate later: .\venv\Scripts\activate"
@@ -20,6 +20,9 @@ source venv/bin/activate
 pip install --upgrade pip
 pip install -r requirements.txt
 
+echo "Packing item and spell icons..."
+python -m shared.icon_atlas
+
 echo ""
 echo "Virtual environment setup complete!"
 echo "To activate later: source venv/bin/activate"
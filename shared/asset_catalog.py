@@ -0,0 +1,168 @@
+"""
+Asset Catalog - in-memory index of the race and weapon preview images
+Folder listings are read once and re-read only when a folder's mtime changes.
+Race images are indexed by (race, gender, texture, helm) from their
+race_gender_texture_helm.jpg names, and weapon images by model number.
+"""
+import fnmatch
+import os
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGES_DIR = os.path.join(BASE_DIR, "images")
+RACE_IMAGES_FOLDER = "raceimages"
+WEAPON_IMAGES_FOLDER = "Weapon_Images"
+
+RaceKey = Tuple[int, Optional[int], Optional[int], Optional[int]]
+
+
+def _parse_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AssetCatalog:
+    """Answer preview image lookups from memory instead of globbing the image folders."""
+
+    def __init__(self, images_dir: str = IMAGES_DIR) -> None:
+        self.images_dir = images_dir
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
+        self._race_source: Optional[List[str]] = None
+        self._race_index: Dict[int, List[Tuple[RaceKey, str]]] = {}
+        self._weapon_source: Optional[List[str]] = None
+        self._weapon_index: Dict[int, str] = {}
+
+    # ------------------------------------------------------------------
+    # Folder listings
+    # ------------------------------------------------------------------
+    def folder_path(self, folder: str) -> str:
+        return os.path.join(self.images_dir, folder)
+
+    def list_files(self, folder: str) -> List[str]:
+        """Return the sorted file names in images/<folder>, re-listing only when its mtime changes."""
+        path = self.folder_path(folder)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._listings.pop(folder, None)
+            return []
+        cached = self._listings.get(folder)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            names = []
+        self._listings[folder] = (mtime, names)
+        return names
+
+    def find_files(self, folder: str, pattern: str = "*") -> List[str]:
+        """Return full paths in images/<folder> whose names match a glob pattern."""
+        root = self.folder_path(folder)
+        return [
+            os.path.join(root, name)
+            for name in self.list_files(folder)
+            if fnmatch.fnmatch(name, pattern)
+        ]
+
+    # ------------------------------------------------------------------
+    # Race images
+    # ------------------------------------------------------------------
+    def _get_race_index(self) -> Dict[int, List[Tuple[RaceKey, str]]]:
+        names = self.list_files(RACE_IMAGES_FOLDER)
+        if names is self._race_source:
+            return self._race_index
+        root = self.folder_path(RACE_IMAGES_FOLDER)
+        index: Dict[int, List[Tuple[RaceKey, str]]] = {}
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext.lower() != ".jpg":
+                continue
+            parts = stem.split("_")
+            race = _parse_int(parts[0])
+            if race is None:
+                continue
+            fields = [_parse_int(part) for part in parts[1:4]]
+            fields += [None] * (3 - len(fields))
+            key = (race, fields[0], fields[1], fields[2])
+            index.setdefault(race, []).append((key, os.path.join(root, name)))
+        self._race_source = names
+        self._race_index = index
+        return index
+
+    def find_race_image(self, race, gender=None, texture=None, helm=None) -> Optional[str]:
+        """Return the closest race image, preferring gender, then texture, then helm matches.
+
+        Without a gender the neutral (gender 2) image is preferred.
+        """
+        race = _parse_int(race)
+        if race is None:
+            return None
+        candidates = self._get_race_index().get(race)
+        if not candidates:
+            return None
+        gender = _parse_int(gender)
+        texture = _parse_int(texture)
+        helm = _parse_int(helm)
+
+        def score(candidate):
+            (_, p_gender, p_texture, p_helm), _path = candidate
+            s = 0
+            if gender is not None and p_gender == gender:
+                s += 8
+            elif gender is None and p_gender == 2:
+                s += 2
+            if texture is not None and p_texture == texture:
+                s += 4
+            if helm is not None and p_helm == helm:
+                s += 1
+            return s
+
+        # max() keeps the first of equal scores, i.e. the lowest file name
+        return max(candidates, key=score)[1]
+
+    # ------------------------------------------------------------------
+    # Weapon images
+    # ------------------------------------------------------------------
+    def _get_weapon_index(self) -> Dict[int, str]:
+        names = self.list_files(WEAPON_IMAGES_FOLDER)
+        if names is self._weapon_source:
+            return self._weapon_index
+        root = self.folder_path(WEAPON_IMAGES_FOLDER)
+        index: Dict[int, str] = {}
+        # Shorter names first so an unpadded weapon_12.jpg wins over weapon_012.jpg
+        for name in sorted(names, key=lambda n: (len(n), n)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() != ".jpg" or not stem.lower().startswith("weapon_"):
+                continue
+            model = _parse_int(stem[len("weapon_"):])
+            if model is not None and model not in index:
+                index[model] = os.path.join(root, name)
+        self._weapon_source = names
+        self._weapon_index = index
+        return index
+
+    def find_weapon_image(self, model) -> Optional[str]:
+        """Return the weapon image for a model number (IT prefix and zero padding are ignored)."""
+        if isinstance(model, str):
+            cleaned = model.strip().lower()
+            if cleaned.startswith("it"):
+                cleaned = cleaned[2:]
+            model = "".join(ch for ch in cleaned if ch.isdigit())
+        model = _parse_int(model)
+        if model is None:
+            return None
+        return self._get_weapon_index().get(model)
+
+
+_shared_catalog: Optional[AssetCatalog] = None
+
+
+def get_asset_catalog() -> AssetCatalog:
+    """Return the process-wide asset catalog."""
+    global _shared_catalog
+    if _shared_catalog is None:
+        _shared_catalog = AssetCatalog()
+    return _shared_catalog
@@ -0,0 +1,306 @@
+"""
+Bulk Inventory - delete, replace or recharge items across many characters
+A job names item ids, a scope (account ids, a level range and zone ids;
+empty filters mean every character) and an action. preview() counts what
+the job would touch in one aggregate query. Applying walks the affected
+characters in character-id order, one chunk per transaction, and records
+the last finished character in a local SQLite file. An interrupted job
+resumes after that character.
+"""
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BULK_JOBS_PATH = os.path.join(BASE_DIR, "cache", "bulk_jobs.db")
+BULK_CHUNK_SIZE = 500
+
+ACTION_DELETE = "delete"
+ACTION_REPLACE = "replace"
+ACTION_SET_CHARGES = "set_charges"
+ACTIONS = (ACTION_DELETE, ACTION_REPLACE, ACTION_SET_CHARGES)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+
+BULK_JOBS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    job_id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    server TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_character_id INTEGER NOT NULL DEFAULT 0,
+    characters_done INTEGER NOT NULL DEFAULT 0,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    characters_total INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass
+class BulkScope:
+    account_ids: List[int] = field(default_factory=list)
+    min_level: Optional[int] = None
+    max_level: Optional[int] = None
+    zone_ids: List[int] = field(default_factory=list)
+
+    def describe(self) -> str:
+        parts = []
+        if self.account_ids:
+            parts.append(f"accounts {', '.join(map(str, self.account_ids))}")
+        if self.min_level is not None or self.max_level is not None:
+            parts.append(f"levels {self.min_level or 1}-{self.max_level or 'max'}")
+        if self.zone_ids:
+            parts.append(f"zones {', '.join(map(str, self.zone_ids))}")
+        return "; ".join(parts) or "all characters"
+
+
+@dataclass
+class BulkAction:
+    kind: str
+    replacement_item_id: Optional[int] = None
+    charges: Optional[int] = None
+
+    def describe(self) -> str:
+        if self.kind == ACTION_REPLACE:
+            return f"replace with item {self.replacement_item_id}"
+        if self.kind == ACTION_SET_CHARGES:
+            return f"set charges to {self.charges}"
+        return "delete"
+
+
+@dataclass
+class BulkJobSpec:
+    item_ids: List[int]
+    scope: BulkScope
+    action: BulkAction
+
+    def __post_init__(self) -> None:
+        if not self.item_ids:
+            raise ValueError("Enter at least one item ID.")
+        if self.action.kind not in ACTIONS:
+            raise ValueError(f"Unknown action '{self.action.kind}'.")
+        if self.action.kind == ACTION_REPLACE:
+            if not self.action.replacement_item_id or self.action.replacement_item_id <= 0:
+                raise ValueError("Enter the ID of the replacement item.")
+            if self.action.replacement_item_id in self.item_ids:
+                raise ValueError("The replacement item is one of the items being replaced.")
+        if self.action.kind == ACTION_SET_CHARGES and (self.action.charges is None or self.action.charges < 0):
+            raise ValueError("Charges must be zero or more.")
+
+    def describe(self) -> str:
+        items = ", ".join(map(str, self.item_ids))
+        return f"{self.action.describe().capitalize()}: items {items} ({self.scope.describe()})"
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str) -> "BulkJobSpec":
+        data = json.loads(text)
+        return cls(
+            item_ids=data["item_ids"],
+            scope=BulkScope(**data["scope"]),
+            action=BulkAction(**data["action"]),
+        )
+
+
+@dataclass
+class BulkPreview:
+    # item id -> (inventory rows, characters)
+    per_item: Dict[int, Tuple[int, int]]
+    rows: int
+    characters: int
+    replacement_name: Optional[str] = None
+
+
+@dataclass
+class BulkJob:
+    job_id: int
+    spec: BulkJobSpec
+    status: str
+    last_character_id: int
+    characters_done: int
+    rows_done: int
+    characters_total: int
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def _match_clause(spec: BulkJobSpec) -> Tuple[str, List]:
+    """WHERE conditions over inventory i joined to character_data cd, with their params."""
+    conditions = [f"i.item_id IN ({_placeholders(spec.item_ids)})"]
+    params: List = list(spec.item_ids)
+    scope = spec.scope
+    if scope.account_ids:
+        conditions.append(f"cd.account_id IN ({_placeholders(scope.account_ids)})")
+        params.extend(scope.account_ids)
+    if scope.min_level is not None:
+        conditions.append("cd.level >= %s")
+        params.append(scope.min_level)
+    if scope.max_level is not None:
+        conditions.append("cd.level <= %s")
+        params.append(scope.max_level)
+    if scope.zone_ids:
+        conditions.append(f"cd.zone_id IN ({_placeholders(scope.zone_ids)})")
+        params.extend(scope.zone_ids)
+    return " AND ".join(conditions), params
+
+
+def preview(db_manager, spec: BulkJobSpec) -> BulkPreview:
+    """Count the inventory rows and characters the job would change, per item and in total.
+
+    One grouped query with ROLLUP gives both; the rollup row's
+    COUNT(DISTINCT) is the true number of characters across all items.
+    Raises ValueError if a replacement item does not exist.
+    """
+    replacement_name = None
+    if spec.action.kind == ACTION_REPLACE:
+        item = db_manager.execute_query(
+            "SELECT Name FROM items WHERE id = %s", (spec.action.replacement_item_id,), fetch_all=False
+        )
+        if not item:
+            raise ValueError(f"Item {spec.action.replacement_item_id} does not exist.")
+        replacement_name = item["Name"]
+
+    where, params = _match_clause(spec)
+    rows = db_manager.execute_query(
+        "SELECT i.item_id, COUNT(*) AS inventory_rows, COUNT(DISTINCT i.character_id) AS characters "
+        "FROM inventory i JOIN character_data cd ON cd.id = i.character_id "
+        f"WHERE {where} GROUP BY i.item_id WITH ROLLUP",
+        tuple(params),
+    )
+    per_item = {}
+    total_rows = total_characters = 0
+    for row in rows:
+        if row["item_id"] is None:
+            total_rows, total_characters = int(row["inventory_rows"]), int(row["characters"])
+        else:
+            per_item[int(row["item_id"])] = (int(row["inventory_rows"]), int(row["characters"]))
+    return BulkPreview(per_item, total_rows, total_characters, replacement_name)
+
+
+def next_chunk(db_manager, spec: BulkJobSpec, after_character_id: int,
+               chunk_size: int = BULK_CHUNK_SIZE) -> Optional[List[Tuple[int, int]]]:
+    """Return up to chunk_size (character id, matching rows) pairs after after_character_id.
+
+    Returns None if the query failed, which is not the same as no characters left.
+    """
+    where, params = _match_clause(spec)
+    rows = db_manager.execute_query(
+        "SELECT i.character_id, COUNT(*) AS inventory_rows "
+        "FROM inventory i JOIN character_data cd ON cd.id = i.character_id "
+        f"WHERE {where} AND i.character_id > %s "
+        "GROUP BY i.character_id ORDER BY i.character_id LIMIT %s",
+        tuple(params) + (after_character_id, chunk_size),
+        none_on_error=True,
+    )
+    if rows is None:
+        return None
+    return [(int(row["character_id"]), int(row["inventory_rows"])) for row in rows]
+
+
+def chunk_statement(spec: BulkJobSpec, character_ids: Sequence[int]) -> Tuple[str, Tuple]:
+    """Build the single statement applying the job's action to character_ids."""
+    item_params = tuple(spec.item_ids)
+    target = (
+        f"WHERE item_id IN ({_placeholders(spec.item_ids)}) "
+        f"AND character_id IN ({_placeholders(character_ids)})"
+    )
+    params = item_params + tuple(character_ids)
+    action = spec.action
+    if action.kind == ACTION_DELETE:
+        return f"DELETE FROM inventory {target}", params
+    if action.kind == ACTION_REPLACE:
+        return f"UPDATE inventory SET item_id = %s {target}", (action.replacement_item_id,) + params
+    return f"UPDATE inventory SET charges = %s {target}", (action.charges,) + params
+
+
+class BulkJobStore:
+    """Local record of bulk jobs and how far each got. Use one instance per thread."""
+
+    def __init__(self, db_path: str = BULK_JOBS_PATH) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute(BULK_JOBS_TABLE_SQL)
+        self._connection.commit()
+
+    def _job(self, row) -> BulkJob:
+        return BulkJob(
+            job_id=row["job_id"],
+            spec=BulkJobSpec.from_json(row["spec"]),
+            status=row["status"],
+            last_character_id=row["last_character_id"],
+            characters_done=row["characters_done"],
+            rows_done=row["rows_done"],
+            characters_total=row["characters_total"],
+        )
+
+    def create(self, server: str, spec: BulkJobSpec, characters_total: int) -> BulkJob:
+        cursor = self._connection.execute(
+            "INSERT INTO bulk_jobs(created, server, spec, status, characters_total) VALUES(?, ?, ?, ?, ?)",
+            (time.time(), server, spec.to_json(), JOB_PENDING, characters_total),
+        )
+        self._connection.commit()
+        return self.get(cursor.lastrowid)
+
+    def get(self, job_id: int) -> Optional[BulkJob]:
+        row = self._connection.execute("SELECT * FROM bulk_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def unfinished(self, server: str) -> List[BulkJob]:
+        rows = self._connection.execute(
+            "SELECT * FROM bulk_jobs WHERE server = ? AND status != ? ORDER BY job_id", (server, JOB_DONE)
+        ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def checkpoint(self, job: BulkJob) -> None:
+        self._connection.execute(
+            "UPDATE bulk_jobs SET status = ?, last_character_id = ?, characters_done = ?, rows_done = ? "
+            "WHERE job_id = ?",
+            (job.status, job.last_character_id, job.characters_done, job.rows_done, job.job_id),
+        )
+        self._connection.commit()
+
+    def discard(self, job_id: int) -> None:
+        self._connection.execute("DELETE FROM bulk_jobs WHERE job_id = ?", (job_id,))
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def run_chunk(db_manager, store: BulkJobStore, job: BulkJob,
+              chunk_size: int = BULK_CHUNK_SIZE) -> Optional[List[int]]:
+    """Apply the job to its next chunk of characters in one transaction.
+
+    Returns the character ids changed (an empty list once the job is done),
+    or None if the chunk query or the transaction failed, leaving the
+    checkpoint where it was.
+    """
+    chunk = next_chunk(db_manager, job.spec, job.last_character_id, chunk_size)
+    if chunk is None:
+        return None
+    if not chunk:
+        job.status = JOB_DONE
+        store.checkpoint(job)
+        return []
+    character_ids = [character_id for character_id, _rows in chunk]
+    query, params = chunk_statement(job.spec, character_ids)
+    if not db_manager.execute_transaction([(query, [params])]):
+        return None
+    job.status = JOB_RUNNING
+    job.last_character_id = character_ids[-1]
+    job.characters_done += len(chunk)
+    job.rows_done += sum(rows for _character_id, rows in chunk)
+    store.checkpoint(job)
+    return character_ids
@@ -0,0 +1,196 @@
+"""
+Character Bundle - everything the Inventory tab shows for one character
+Inventory rows with item names, character stats with guild membership, and
+buffs with spell names are fetched as one multi-statement call, so selecting
+a character costs a single round trip instead of one query per panel.
+Neighbouring characters can be loaded ahead of time into an LRU by
+CharacterPrefetcher.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from shared.database import BackgroundConnection
+
+PREFETCH_CACHE_SIZE = 32
+# Cached bundles older than this are reloaded; in-game changes do not invalidate them
+PREFETCH_MAX_AGE_SECONDS = 120
+
+CHARACTER_BUNDLE_SQL = """
+    SELECT i.slot_id, i.item_id, COALESCE(it.Name, 'Unknown Item') as item_name, i.charges
+    FROM inventory i
+    LEFT JOIN items it ON i.item_id = it.id
+    WHERE i.character_id = %(char_id)s AND i.item_id > 0
+    ORDER BY i.slot_id;
+
+    SELECT cd.name, cd.level, cd.class, cd.race, cd.deity, cd.last_login, cd.time_played,
+           cd.cur_hp, cd.mana, cd.endurance, cd.str, cd.sta, cd.cha, cd.dex, cd.`int`, cd.agi, cd.wis,
+           g.name as guild_name, gm.rank as guild_rank
+    FROM character_data cd
+    LEFT JOIN guild_members gm ON gm.char_id = cd.id
+    LEFT JOIN guilds g ON gm.guild_id = g.id
+    WHERE cd.id = %(char_id)s
+    LIMIT 1;
+
+    SELECT cb.spell_id, sn.name
+    FROM character_buffs cb
+    LEFT JOIN spells_new sn ON cb.spell_id = sn.id
+    WHERE cb.character_id = %(char_id)s
+    ORDER BY sn.name
+"""
+
+
+@dataclass
+class CharacterBundle:
+    char_id: int
+    inventory: List[Dict] = field(default_factory=list)
+    details: Optional[Dict] = None
+    buffs: List[Dict] = field(default_factory=list)
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+def fetch_character_bundle(db_manager, char_id) -> Optional[CharacterBundle]:
+    """Fetch a character's inventory, details and buffs in one round trip, or None on failure."""
+    results = db_manager.execute_multi(CHARACTER_BUNDLE_SQL, {"char_id": int(char_id)})
+    if results is None or len(results) != 3:
+        return None
+    inventory, details, buffs = results
+    return CharacterBundle(
+        char_id=int(char_id),
+        inventory=inventory,
+        details=details[0] if details else None,
+        buffs=buffs,
+    )
+
+
+class CharacterPrefetcher:
+    """Bounded LRU of character bundles, filled ahead of time on a background connection.
+
+    prefetch() is called from the UI thread with the characters likely to be
+    selected next; a single worker thread loads them on its own connection.
+    Only the most recent request is kept, so stepping quickly through the
+    list does not queue up stale work. invalidate() drops a character and
+    discards any load of it that was already in flight.
+    """
+
+    def __init__(self, db_manager, max_characters: int = PREFETCH_CACHE_SIZE) -> None:
+        self.db_manager = db_manager
+        self.max_characters = max_characters
+        self._bundles: "OrderedDict[int, CharacterBundle]" = OrderedDict()
+        # Bumped by invalidate(); a load only lands if neither moved while it ran
+        self._epoch = 0
+        self._generations: Dict[int, int] = {}
+        self._pending: List[int] = []
+        self._settings: Optional[Dict] = None
+        self._condition = threading.Condition()
+        # The current worker; one that is no longer current stops and closes its connection
+        self._worker: Optional[threading.Thread] = None
+
+    def _cached(self, char_id: int) -> Optional[CharacterBundle]:
+        """Return the cached bundle for char_id, dropping it if it has expired. Call with the lock held."""
+        bundle = self._bundles.get(char_id)
+        if bundle is not None and time.monotonic() - bundle.fetched_at > PREFETCH_MAX_AGE_SECONDS:
+            del self._bundles[char_id]
+            return None
+        return bundle
+
+    def get(self, char_id) -> Optional[CharacterBundle]:
+        with self._condition:
+            bundle = self._cached(int(char_id))
+            if bundle is not None:
+                self._bundles.move_to_end(bundle.char_id)
+            return bundle
+
+    def put(self, bundle: CharacterBundle) -> None:
+        with self._condition:
+            self._store(bundle)
+
+    def _store(self, bundle: CharacterBundle) -> None:
+        self._bundles[bundle.char_id] = bundle
+        self._bundles.move_to_end(bundle.char_id)
+        while len(self._bundles) > self.max_characters:
+            self._bundles.popitem(last=False)
+
+    def invalidate(self, char_ids: Optional[Iterable] = None) -> None:
+        """Forget char_ids, or every character when None."""
+        with self._condition:
+            if char_ids is None:
+                self._bundles.clear()
+                self._epoch += 1
+                return
+            for char_id in char_ids:
+                char_id = int(char_id)
+                self._bundles.pop(char_id, None)
+                self._generations[char_id] = self._generations.get(char_id, 0) + 1
+
+    def prefetch(self, char_ids: Iterable) -> None:
+        """Replace the pending work with char_ids that are not cached yet."""
+        settings = self.db_manager.connection_settings()
+        if not settings["host"]:
+            return
+        with self._condition:
+            self._settings = settings
+            self._pending = [int(char_id) for char_id in char_ids if self._cached(int(char_id)) is None]
+            if not self._pending:
+                return
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="character-prefetch", daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        worker = threading.current_thread()
+        connection = None
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and self._worker is worker:
+                        self._condition.wait()
+                    if self._worker is not worker:
+                        break
+                    char_id = self._pending.pop(0)
+                    if self._cached(char_id) is not None:
+                        continue
+                    started = (self._epoch, self._generations.get(char_id, 0))
+                    settings = self._settings
+
+                try:
+                    if connection is None or connection.settings != settings or not connection.is_connected():
+                        self._close_connection(connection)
+                        connection = BackgroundConnection(settings)
+                    bundle = fetch_character_bundle(connection, char_id)
+                except Exception as exc:
+                    print(f"Prefetch of character {char_id} failed: {exc}")
+                    self._close_connection(connection)
+                    connection = None
+                    continue
+
+                with self._condition:
+                    current = (self._epoch, self._generations.get(char_id, 0)) == started
+                    if bundle is not None and self._worker is worker and current:
+                        self._store(bundle)
+        finally:
+            self._close_connection(connection)
+
+    @staticmethod
+    def _close_connection(connection: Optional[BackgroundConnection]) -> None:
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Stop the worker, which then closes its connection, and drop every cached bundle.
+
+        The prefetcher stays usable: the next prefetch() starts a new worker
+        with the settings current at that time.
+        """
+        with self._condition:
+            self._worker = None
+            self._pending = []
+            self._bundles.clear()
+            self._epoch += 1
+            self._condition.notify_all()
@@ -0,0 +1,322 @@
+"""
+Character Summary - local SQLite copy of the player list columns
+The player list used to join character_data with every inventory slot and the
+shared bank, then group the result, on each load and each search keystroke.
+This cache keeps one row per character (level, class, race, zone, AA,
+currency, whether the inventory holds anything) plus each account's shared
+bank item count. It is refreshed incrementally: only characters whose
+character_data.last_login moved past the stored high-water mark are fetched.
+Pages are read with keyset pagination on (name, id), and the uncached query
+pages the same way.
+"""
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHARACTER_SUMMARY_PATH = os.path.join(BASE_DIR, "cache", "character_summary.db")
+SCHEMA_VERSION = 1
+PLAYER_PAGE_SIZE = 500
+REFRESH_BATCH_SIZE = 5000
+# Keeps IN (...) lists well under server packet and placeholder limits
+ID_CHUNK_SIZE = 1000
+
+SUMMARY_COLUMNS = (
+    "id", "account_id", "name", "level", "class", "race", "zone_id", "time_played",
+    "aa_points_spent", "aa_points", "platinum", "platinum_bank", "platinum_cursor",
+    "has_inventory", "last_login",
+)
+
+CHARACTER_SUMMARY_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS character_summary (
+    id INTEGER PRIMARY KEY,
+    account_id INTEGER NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    level INTEGER NOT NULL,
+    class INTEGER NOT NULL,
+    race INTEGER NOT NULL,
+    zone_id INTEGER NOT NULL,
+    time_played INTEGER NOT NULL,
+    aa_points_spent INTEGER NOT NULL,
+    aa_points INTEGER NOT NULL,
+    platinum INTEGER NOT NULL,
+    platinum_bank INTEGER NOT NULL,
+    platinum_cursor INTEGER NOT NULL,
+    has_inventory INTEGER NOT NULL,
+    last_login INTEGER NOT NULL
+);
+"""
+
+CHARACTER_SUMMARY_INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS character_summary_name ON character_summary(name, id);",
+    "CREATE INDEX IF NOT EXISTS character_summary_account ON character_summary(account_id);",
+)
+
+ACCOUNT_SHARED_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS account_shared (
+    account_id INTEGER PRIMARY KEY,
+    shared_items_count INTEGER NOT NULL
+);
+"""
+
+SUMMARY_META_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS summary_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Per-character columns without the inventory join: EXISTS stops at the first
+# item through the inventory primary key, so no GROUP BY is needed.
+SERVER_SUMMARY_SELECT = """
+    SELECT cd.id, cd.account_id, cd.name, cd.level, cd.class, cd.race,
+           cd.zone_id, cd.time_played, cd.aa_points_spent, cd.aa_points,
+           COALESCE(cc.platinum, 0) as platinum,
+           COALESCE(cc.platinum_bank, 0) as platinum_bank,
+           COALESCE(cc.platinum_cursor, 0) as platinum_cursor,
+           EXISTS (SELECT 1 FROM inventory i WHERE i.character_id = cd.id AND i.item_id > 0) as has_inventory,
+           COALESCE(cd.last_login, 0) as last_login
+    FROM character_data cd
+    LEFT JOIN character_currency cc ON cd.id = cc.id
+"""
+
+CHANGED_CHARACTERS_SQL = SERVER_SUMMARY_SELECT + """
+    WHERE COALESCE(cd.last_login, 0) > %s
+       OR (COALESCE(cd.last_login, 0) = %s AND cd.id > %s)
+    ORDER BY COALESCE(cd.last_login, 0), cd.id
+    LIMIT %s
+"""
+
+# The uncached player list: same filters and order as PLAYER_PAGE_SQL
+LIVE_PLAYER_PAGE_SQL = """
+    SELECT cd.id, cd.name, cd.level, cd.class, cd.race,
+           cd.zone_id, cd.time_played, cd.aa_points_spent, cd.aa_points,
+           COALESCE(cc.platinum, 0) as platinum,
+           COALESCE(cc.platinum_bank, 0) as platinum_bank,
+           COALESCE(cc.platinum_cursor, 0) as platinum_cursor,
+           (SELECT COUNT(DISTINCT sb.item_id) FROM sharedbank sb
+            WHERE sb.account_id = cd.account_id AND sb.item_id > 0) as shared_items_count
+    FROM character_data cd
+    LEFT JOIN character_currency cc ON cd.id = cc.id
+    WHERE cd.level > 0
+        AND cd.name NOT LIKE '%%-deleted%%'
+        AND EXISTS (SELECT 1 FROM inventory i WHERE i.character_id = cd.id AND i.item_id > 0)
+        AND LOWER(cd.name) LIKE %s
+        AND (cd.name > %s OR (cd.name = %s AND cd.id > %s))
+    ORDER BY cd.name, cd.id
+    LIMIT %s
+"""
+
+PLAYER_PAGE_SQL = """
+    SELECT c.id, c.name, c.level, c.class, c.race, c.zone_id, c.time_played,
+           c.aa_points_spent, c.aa_points, c.platinum, c.platinum_bank, c.platinum_cursor,
+           COALESCE(a.shared_items_count, 0) AS shared_items_count
+    FROM character_summary c
+    LEFT JOIN account_shared a ON a.account_id = c.account_id
+    WHERE c.has_inventory
+        AND c.level > 0
+        AND c.name NOT LIKE '%-deleted%'
+        AND c.name LIKE ?
+        AND (c.name, c.id) > (?, ?)
+    ORDER BY c.name, c.id
+    LIMIT ?
+"""
+
+PageKey = Tuple[str, int]
+FIRST_PAGE: PageKey = ("", 0)
+
+
+def page_key(player: Dict) -> PageKey:
+    """Return the keyset position just after player, for fetching the next page."""
+    return player["name"], player["id"]
+
+
+def fetch_live_page(db_manager, search: str = "", after: PageKey = FIRST_PAGE,
+                    limit: int = PLAYER_PAGE_SIZE) -> List[Dict]:
+    """Read one page of the player list straight from the server."""
+    name, char_id = after
+    return db_manager.execute_query(
+        LIVE_PLAYER_PAGE_SQL, (f"%{search.lower()}%", name, name, char_id, limit)
+    )
+
+
+def _chunks(values: Sequence, size: int = ID_CHUNK_SIZE) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class CharacterSummaryCache:
+    """Per-character player list rows cached from the server. Use one instance per thread."""
+
+    def __init__(self, db_path: str = CHARACTER_SUMMARY_PATH) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode = WAL;")
+        self._connection.execute("PRAGMA synchronous = NORMAL;")
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version;").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS character_summary;")
+            self._connection.execute("DROP TABLE IF EXISTS account_shared;")
+            self._connection.execute("DROP TABLE IF EXISTS summary_meta;")
+        self._connection.execute(CHARACTER_SUMMARY_TABLE_SQL)
+        for index_sql in CHARACTER_SUMMARY_INDEXES_SQL:
+            self._connection.execute(index_sql)
+        self._connection.execute(ACCOUNT_SHARED_TABLE_SQL)
+        self._connection.execute(SUMMARY_META_TABLE_SQL)
+        self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        self._connection.commit()
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+    def _meta(self, key: str, default: str = "") -> str:
+        row = self._connection.execute("SELECT value FROM summary_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def _set_meta(self, key: str, value) -> None:
+        self._connection.execute(
+            "INSERT INTO summary_meta(key, value) VALUES(?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def _high_water_mark(self) -> Tuple[int, int]:
+        return int(self._meta("last_login", "-1")), int(self._meta("last_id", "0"))
+
+    @property
+    def is_empty(self) -> bool:
+        return self._connection.execute("SELECT 1 FROM character_summary LIMIT 1").fetchone() is None
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM character_summary;")
+        self._connection.execute("DELETE FROM account_shared;")
+        self._connection.execute("DELETE FROM summary_meta;")
+        self._connection.commit()
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+    def refresh(self, db_manager, batch_size: int = REFRESH_BATCH_SIZE) -> Optional[int]:
+        """Pull characters that logged in since the last refresh and return how many changed.
+
+        The first refresh (or one against a different server) copies every
+        character. Characters removed from the server are pruned when the
+        server's character count no longer matches the cache. Returns None if
+        the server could not be queried.
+        """
+        server = db_manager.server_identity()
+        if server is None:
+            return None
+        full = server != self._meta("server")
+        if full:
+            self.clear()
+            self._set_meta("server", server)
+
+        last_login, last_id = self._high_water_mark()
+        changed = 0
+        accounts = set()
+        while True:
+            rows = db_manager.execute_query(CHANGED_CHARACTERS_SQL, (last_login, last_login, last_id, batch_size))
+            if not rows:
+                break
+            self._upsert(rows)
+            accounts.update(row["account_id"] for row in rows)
+            changed += len(rows)
+            last_login, last_id = int(rows[-1]["last_login"]), int(rows[-1]["id"])
+            if len(rows) < batch_size:
+                break
+
+        self._refresh_shared_counts(db_manager, None if full else sorted(accounts))
+        self._prune(db_manager)
+        self._set_meta("last_login", last_login)
+        self._set_meta("last_id", last_id)
+        self._connection.commit()
+        return changed
+
+    def refresh_characters(self, db_manager, char_ids: Iterable[int]) -> None:
+        """Re-read specific characters, e.g. after this tool edited them without a login."""
+        char_ids = sorted({int(char_id) for char_id in char_ids})
+        if not char_ids or self.is_empty:
+            return
+        accounts = set()
+        for chunk in _chunks(char_ids):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            rows = db_manager.execute_query(
+                SERVER_SUMMARY_SELECT + f" WHERE cd.id IN ({placeholders})", tuple(chunk)
+            )
+            self._upsert(rows)
+            accounts.update(row["account_id"] for row in rows)
+            found = {row["id"] for row in rows}
+            self._connection.executemany(
+                "DELETE FROM character_summary WHERE id = ?",
+                [(char_id,) for char_id in chunk if char_id not in found],
+            )
+        self._refresh_shared_counts(db_manager, sorted(accounts))
+        self._connection.commit()
+
+    def _upsert(self, rows: Sequence[Dict]) -> None:
+        columns = ", ".join(SUMMARY_COLUMNS)
+        placeholders = ", ".join("?" for _ in SUMMARY_COLUMNS)
+        self._connection.executemany(
+            f"INSERT OR REPLACE INTO character_summary({columns}) VALUES({placeholders})",
+            [tuple(int(row[col]) if col != "name" else row[col] for col in SUMMARY_COLUMNS) for row in rows],
+        )
+
+    def _refresh_shared_counts(self, db_manager, account_ids: Optional[Sequence[int]]) -> None:
+        """Recount shared bank items for account_ids, or for every account when None."""
+        query = (
+            "SELECT account_id, COUNT(DISTINCT item_id) AS shared_items_count "
+            "FROM sharedbank WHERE item_id > 0"
+        )
+        if account_ids is None:
+            batches = [db_manager.execute_query(query + " GROUP BY account_id")]
+            self._connection.execute("DELETE FROM account_shared;")
+        else:
+            batches = []
+            for chunk in _chunks(account_ids):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                self._connection.executemany(
+                    "DELETE FROM account_shared WHERE account_id = ?", [(account_id,) for account_id in chunk]
+                )
+                batches.append(db_manager.execute_query(
+                    query + f" AND account_id IN ({placeholders}) GROUP BY account_id", tuple(chunk)
+                ))
+        for rows in batches:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO account_shared(account_id, shared_items_count) VALUES(?, ?)",
+                [(int(row["account_id"]), int(row["shared_items_count"])) for row in rows],
+            )
+
+    def _prune(self, db_manager) -> None:
+        row = db_manager.execute_query("SELECT COUNT(*) AS total FROM character_data", fetch_all=False)
+        cached = self._connection.execute("SELECT COUNT(*) FROM character_summary").fetchone()[0]
+        if not row or int(row["total"]) == cached:
+            return
+        id_rows = db_manager.execute_query("SELECT id FROM character_data", none_on_error=True)
+        # A failed or short id list would look like mass deletion; keep the cache until a full list arrives
+        if id_rows is None or len(id_rows) < int(row["total"]):
+            return
+        server_ids = {int(server_row["id"]) for server_row in id_rows}
+        stale = [
+            (cached_row["id"],)
+            for cached_row in self._connection.execute("SELECT id FROM character_summary")
+            if cached_row["id"] not in server_ids
+        ]
+        self._connection.executemany("DELETE FROM character_summary WHERE id = ?", stale)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def page(self, search: str = "", after: PageKey = FIRST_PAGE, limit: int = PLAYER_PAGE_SIZE) -> List[Dict]:
+        """Return up to limit player rows ordered by name after the keyset position."""
+        name, char_id = after
+        rows = self._connection.execute(PLAYER_PAGE_SQL, (f"%{search}%", name, char_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        self._connection.close()
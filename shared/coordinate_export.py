@@ -0,0 +1,192 @@
+"""
+Coordinate Export - turn captured /loc lines into grid_entries, spawn2 or CSV rows
+Coordinate-bearing log entries are collected in time order, near-identical
+points are dropped with a spatial hash grid, and the rest are written to the
+server in a single transaction or saved as CSV.
+
+The client's "Your Location is" output lists Y before X; those points are
+swapped here so rows use the server's x, y, z order. "#loc"-style
+"Location for ... | XYZ:" output is already in x, y, z order.
+"""
+import csv
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from shared.log_parser import log_character_name
+from shared.log_store import LogStore, split_ref
+
+DEFAULT_DEDUPE_DISTANCE = 5.0
+DEFAULT_RESPAWN_SECONDS = 640
+CLIENT_LOC_PREFIX = "your location is"
+CSV_COLUMNS = ("x", "y", "z", "heading", "timestamp", "keyword", "character", "message")
+
+GRID_INSERT_SQL = "INSERT INTO grid (id, zoneid, type, type2) VALUES (%s, %s, %s, %s)"
+GRID_ENTRY_INSERT_SQL = (
+    "INSERT INTO grid_entries (gridid, zoneid, number, x, y, z, heading, pause, centerpoint) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+SPAWN2_INSERT_SQL = (
+    "INSERT INTO spawn2 (spawngroupID, zone, version, x, y, z, heading, respawntime, variance, pathgrid) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+@dataclass
+class ExportPoint:
+    x: float
+    y: float
+    z: float
+    heading: float
+    timestamp: str
+    keyword: str
+    character: str
+    message: str
+
+
+def collect_points(stores: Sequence[LogStore], refs: Iterable[int]) -> List[ExportPoint]:
+    """Return the coordinate-bearing entries among refs, in the order given."""
+    points = []
+    for ref in refs:
+        store_index, row = split_ref(ref)
+        store = stores[store_index]
+        base = row * 4
+        x_val, y_val, z_val, heading = store.coordinates[base:base + 4]
+        if math.isnan(x_val) or math.isnan(y_val) or math.isnan(z_val):
+            continue
+        message = store.message(row)
+        if message.lower().startswith(CLIENT_LOC_PREFIX):
+            x_val, y_val = y_val, x_val
+        points.append(ExportPoint(
+            x=x_val,
+            y=y_val,
+            z=z_val,
+            heading=0.0 if math.isnan(heading) else heading,
+            timestamp=store.timestamp(row),
+            keyword=store.keyword(row),
+            character=log_character_name(store.path),
+            message=message,
+        ))
+    return points
+
+
+def dedupe_points(points: Sequence[ExportPoint], distance: float = DEFAULT_DEDUPE_DISTANCE) -> List[ExportPoint]:
+    """Drop points within distance of an earlier kept point, preserving order.
+
+    Kept points are hashed into cubes of side distance, so each point is only
+    compared with the kept points in its own and the 26 neighbouring cubes.
+    """
+    if distance <= 0:
+        return list(points)
+    limit = distance * distance
+    cells: Dict[Tuple[int, int, int], List[ExportPoint]] = {}
+    kept = []
+    for point in points:
+        cell_x = math.floor(point.x / distance)
+        cell_y = math.floor(point.y / distance)
+        cell_z = math.floor(point.z / distance)
+        neighbours = (
+            other
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for dz in (-1, 0, 1)
+            for other in cells.get((cell_x + dx, cell_y + dy, cell_z + dz), ())
+        )
+        if any(
+            (other.x - point.x) ** 2 + (other.y - point.y) ** 2 + (other.z - point.z) ** 2 <= limit
+            for other in neighbours
+        ):
+            continue
+        cells.setdefault((cell_x, cell_y, cell_z), []).append(point)
+        kept.append(point)
+    return kept
+
+
+def write_csv(path: str, points: Iterable[ExportPoint]) -> int:
+    """Write points to a CSV file and return how many were written."""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_COLUMNS)
+        for point in points:
+            writer.writerow((
+                round(point.x, 2), round(point.y, 2), round(point.z, 2), round(point.heading, 2),
+                point.timestamp, point.keyword, point.character, point.message,
+            ))
+            count += 1
+    return count
+
+
+# ----------------------------------------------------------------------
+# Server rows
+# ----------------------------------------------------------------------
+def grid_entry_rows(zone_id: int, grid_id: int, points: Iterable[ExportPoint],
+                    first_number: int = 1, pause: int = 0) -> List[Tuple]:
+    return [
+        (grid_id, zone_id, number, round(point.x, 2), round(point.y, 2), round(point.z, 2),
+         round(point.heading, 2), pause, 0)
+        for number, point in enumerate(points, start=first_number)
+    ]
+
+
+def spawn2_rows(zone: str, spawngroup_id: int, points: Iterable[ExportPoint], version: int = 0,
+                respawn: int = DEFAULT_RESPAWN_SECONDS, variance: int = 0, pathgrid: int = 0) -> List[Tuple]:
+    return [
+        (spawngroup_id, zone, version, round(point.x, 2), round(point.y, 2), round(point.z, 2),
+         round(point.heading, 2), respawn, variance, pathgrid)
+        for point in points
+    ]
+
+
+def lookup_zone_id(db_manager, zone: str) -> int:
+    """Return the zone id for a short name. Raises ValueError if the server does not know it."""
+    row = db_manager.execute_query(
+        "SELECT zoneidnumber FROM zone WHERE short_name = %s LIMIT 1", (zone,), fetch_all=False
+    )
+    if not row:
+        raise ValueError(f"Zone '{zone}' was not found in the zone table.")
+    return int(row["zoneidnumber"])
+
+
+def export_grid(db_manager, zone: str, points: Sequence[ExportPoint], grid_id: Optional[int] = None,
+                pause: int = 0) -> Optional[Tuple[int, int]]:
+    """Write points as waypoints of a grid in one transaction.
+
+    With no grid_id a new grid is created; otherwise the points are appended
+    after the grid's last waypoint. Returns (grid id, first waypoint number),
+    or None if the transaction failed.
+    """
+    zone_id = lookup_zone_id(db_manager, zone)
+    statements = []
+    if grid_id is None:
+        row = db_manager.execute_query(
+            "SELECT COALESCE(MAX(id), 0) + 1 AS next_id FROM grid WHERE zoneid = %s", (zone_id,), fetch_all=False
+        )
+        grid_id = int(row["next_id"]) if row else 1
+        statements.append((GRID_INSERT_SQL, [(grid_id, zone_id, 0, 0)]))
+        first_number = 1
+    else:
+        exists = db_manager.execute_query(
+            "SELECT id FROM grid WHERE zoneid = %s AND id = %s", (zone_id, grid_id), fetch_all=False
+        )
+        if not exists:
+            statements.append((GRID_INSERT_SQL, [(grid_id, zone_id, 0, 0)]))
+        row = db_manager.execute_query(
+            "SELECT COALESCE(MAX(number), 0) + 1 AS next_number FROM grid_entries WHERE zoneid = %s AND gridid = %s",
+            (zone_id, grid_id),
+            fetch_all=False,
+        )
+        first_number = int(row["next_number"]) if row else 1
+
+    statements.append((GRID_ENTRY_INSERT_SQL, grid_entry_rows(zone_id, grid_id, points, first_number, pause)))
+    if not db_manager.execute_transaction(statements):
+        return None
+    return grid_id, first_number
+
+
+def export_spawns(db_manager, zone: str, spawngroup_id: int, points: Sequence[ExportPoint], version: int = 0,
+                  respawn: int = DEFAULT_RESPAWN_SECONDS, variance: int = 0) -> bool:
+    """Write one spawn2 row per point in one transaction."""
+    lookup_zone_id(db_manager, zone)
+    rows = spawn2_rows(zone, spawngroup_id, points, version, respawn, variance)
+    return db_manager.execute_transaction([(SPAWN2_INSERT_SQL, rows)])
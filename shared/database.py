@@ -3,6 +3,50 @@ from mysql.connector import Error
 from tkinter import messagebox
 
 
+def fetch_multi(cursor, query, params=()):
+    """Run several ;-separated SELECTs on cursor and return one row list per statement"""
+    try:
+        cursor.execute(query, params, map_results=True)
+    except TypeError:
+        # Connector/Python before 9.2 spells this multi=True and yields one cursor per result
+        return [result.fetchall() for result in cursor.execute(query, params, multi=True) if result.with_rows]
+    results = [cursor.fetchall()]
+    while cursor.nextset():
+        results.append(cursor.fetchall())
+    return results
+
+
+class BackgroundConnection:
+    """A private connection for a worker thread. Errors are raised rather than shown in dialogs."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        # Autocommit so each read sees current data instead of the first read's snapshot
+        self._connection = mysql.connector.connect(autocommit=True, **settings)
+
+    def is_connected(self):
+        return self._connection.is_connected()
+
+    def execute_query(self, query, params=()):
+        cursor = self._connection.cursor(dictionary=True)
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def execute_multi(self, query, params=()):
+        cursor = self._connection.cursor(dictionary=True)
+        try:
+            return fetch_multi(cursor, query, params)
+        finally:
+            cursor.close()
+
+    def close(self):
+        if self._connection.is_connected():
+            self._connection.close()
+
+
 class DatabaseManager:
     """Singleton database manager for EQ Tools Suite"""
 
@@ -14,13 +58,14 @@ class DatabaseManager:
             cls._instance = super().__new__(cls)
             cls._instance._settings_manager = None
             cls._instance._last_host = None
+            cls._instance._server_identity = None
         return cls._instance
 
     def configure(self, settings_manager):
         self._settings_manager = settings_manager
 
-    def connect(self):
-        """Get or create database connection using configured settings"""
+    def connection_settings(self):
+        """Return the configured connect() keyword arguments; host is empty when unset"""
         host = ""
         user = "eqemu"
         password = "eqemu"
@@ -30,6 +75,12 @@ class DatabaseManager:
             user = (self._settings_manager.server_user or "eqemu").strip() or "eqemu"
             password = self._settings_manager.server_password or "eqemu"
             database = (self._settings_manager.server_db or "peq").strip() or "peq"
+        return {"host": host, "user": user, "password": password, "database": database}
+
+    def connect(self):
+        """Get or create database connection using configured settings"""
+        settings = self.connection_settings()
+        host = settings["host"]
 
         if not host:
             messagebox.showerror(
@@ -43,13 +94,9 @@ class DatabaseManager:
 
         if self._connection is None or not self._connection.is_connected():
             try:
-                self._connection = mysql.connector.connect(
-                    host=host,
-                    user=user,
-                    password=password,
-                    database=database
-                )
+                self._connection = mysql.connector.connect(**settings)
                 self._last_host = host
+                self._server_identity = None
             except Error as err:
                 messagebox.showerror("Database Error", f"Failed to connect to database:\n{err}")
                 return None
@@ -62,11 +109,15 @@ class DatabaseManager:
             return conn.cursor(dictionary=dictionary)
         return None
     
-    def execute_query(self, query, params=(), fetch_all=True):
-        """Execute a SELECT query and return results"""
+    def execute_query(self, query, params=(), fetch_all=True, none_on_error=False):
+        """Execute a SELECT query and return results
+
+        Pass none_on_error=True to get None when the query fails, so a failure
+        can be told apart from a query that matched no rows.
+        """
         cursor = self.get_cursor()
         if not cursor:
-            return []
+            return None if none_on_error else []
         
         try:
             cursor.execute(query, params)
@@ -76,10 +127,36 @@ class DatabaseManager:
                 return cursor.fetchone()
         except Error as err:
             messagebox.showerror("Database Error", f"Query failed:\n{err}")
-            return [] if fetch_all else None
+            return [] if fetch_all and not none_on_error else None
         finally:
             cursor.close()
     
+    def server_identity(self):
+        """Return "host/database" as reported by the server, or None if it cannot be reached
+
+        The answer is kept until the connection is replaced or closed, so callers
+        can ask on every use without a round trip.
+        """
+        if self._server_identity is None:
+            row = self.execute_query("SELECT @@hostname AS host, DATABASE() AS db", fetch_all=False)
+            if row:
+                self._server_identity = f"{row['host']}/{row['db']}"
+        return self._server_identity
+
+    def execute_multi(self, query, params=()):
+        """Execute several ;-separated SELECTs in one round trip and return one row list per statement"""
+        cursor = self.get_cursor()
+        if not cursor:
+            return None
+
+        try:
+            return fetch_multi(cursor, query, params)
+        except Error as err:
+            messagebox.showerror("Database Error", f"Query failed:\n{err}")
+            return None
+        finally:
+            cursor.close()
+
     def execute_update(self, query, params=()):
         """Execute an INSERT, UPDATE, or DELETE query"""
         cursor = self.get_cursor()
@@ -96,10 +173,31 @@ class DatabaseManager:
             return False
         finally:
             cursor.close()
-    
+
+    def execute_transaction(self, statements):
+        """Run (query, rows) pairs with executemany and commit them together, or roll all back"""
+        cursor = self.get_cursor(dictionary=False)
+        if not cursor:
+            return False
+
+        try:
+            for query, rows in statements:
+                rows = list(rows)
+                if rows:
+                    cursor.executemany(query, rows)
+            self._connection.commit()
+            return True
+        except Error as err:
+            messagebox.showerror("Database Error", f"Update failed:\n{err}")
+            self._connection.rollback()
+            return False
+        finally:
+            cursor.close()
+
     def close(self):
         """Close the database connection"""
         if self._connection and self._connection.is_connected():
             self._connection.close()
             self._connection = None
             self._last_host = None
+        self._server_identity = None
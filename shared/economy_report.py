@@ -0,0 +1,201 @@
+"""
+Economy Report - server-wide platinum and item aggregates
+Wealth is platinum + platinum_bank + platinum_cursor per live character.
+Every figure is aggregated by the server in six SELECTs sent as one
+multi-statement call:
+- totals
+- nearest-rank percentiles from a window function
+- a power-of-ten wealth histogram
+- the top holders
+- the most-held items
+- wealth by level bracket
+Only summary rows reach the client. Reports are kept in a local SQLite file
+with the time they were generated.
+"""
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ECONOMY_REPORTS_PATH = os.path.join(BASE_DIR, "cache", "economy_reports.db")
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+TOP_HOLDERS = 50
+TOP_ITEMS = 100
+LEVEL_BRACKET_SIZE = 10
+REPORTS_KEPT = 20
+
+ECONOMY_REPORTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS economy_reports (
+    report_id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    generated_at REAL NOT NULL,
+    report TEXT NOT NULL
+);
+"""
+
+WEALTH_SQL = """
+    SELECT cd.id, cd.name, cd.level, cd.account_id,
+           COALESCE(cc.platinum, 0) AS platinum,
+           COALESCE(cc.platinum_bank, 0) AS platinum_bank,
+           COALESCE(cc.platinum_cursor, 0) AS platinum_cursor,
+           COALESCE(cc.platinum, 0) + COALESCE(cc.platinum_bank, 0) + COALESCE(cc.platinum_cursor, 0) AS total
+    FROM character_data cd
+    LEFT JOIN character_currency cc ON cc.id = cd.id
+    WHERE cd.level > 0 AND cd.name NOT LIKE '%%-deleted%%'
+"""
+
+_PERCENT_ROWS = " UNION ALL ".join(f"SELECT {percent} AS percent" for percent in PERCENTILES)
+
+ECONOMY_REPORT_SQL = f"""
+    SELECT COUNT(*) AS characters,
+           COALESCE(SUM(platinum), 0) AS platinum,
+           COALESCE(SUM(platinum_bank), 0) AS platinum_bank,
+           COALESCE(SUM(platinum_cursor), 0) AS platinum_cursor,
+           COALESCE(SUM(total), 0) AS total,
+           COALESCE(AVG(total), 0) AS average,
+           COALESCE(MAX(total), 0) AS max_total
+    FROM ({WEALTH_SQL}) w;
+
+    SELECT p.percent, r.total
+    FROM (
+        SELECT total, ROW_NUMBER() OVER (ORDER BY total) AS rn, COUNT(*) OVER () AS n
+        FROM ({WEALTH_SQL}) w
+    ) r
+    JOIN ({_PERCENT_ROWS}) p ON r.rn = GREATEST(CEIL(p.percent * r.n / 100), 1)
+    ORDER BY p.percent;
+
+    SELECT CASE WHEN total < 1 THEN -1 ELSE CHAR_LENGTH(CAST(total AS CHAR)) - 1 END AS magnitude,
+           COUNT(*) AS characters
+    FROM ({WEALTH_SQL}) w
+    GROUP BY magnitude
+    ORDER BY magnitude;
+
+    SELECT id, name, level, account_id, platinum, platinum_bank, platinum_cursor, total
+    FROM ({WEALTH_SQL}) w
+    ORDER BY total DESC
+    LIMIT %(top_holders)s;
+
+    SELECT t.item_id, COALESCE(it.Name, 'Unknown Item') AS item_name, t.holders, t.stacks, t.quantity
+    FROM (
+        SELECT item_id, COUNT(DISTINCT character_id) AS holders, COUNT(*) AS stacks,
+               SUM(GREATEST(charges, 1)) AS quantity
+        FROM inventory
+        WHERE item_id > 0
+        GROUP BY item_id
+        ORDER BY holders DESC
+        LIMIT %(top_items)s
+    ) t
+    LEFT JOIN items it ON it.id = t.item_id
+    ORDER BY t.holders DESC;
+
+    SELECT FLOOR((level - 1) / %(bracket)s) AS bracket, COUNT(*) AS characters,
+           SUM(total) AS total, AVG(total) AS average, MAX(total) AS max_total
+    FROM ({WEALTH_SQL}) w
+    GROUP BY bracket
+    ORDER BY bracket
+"""
+
+
+@dataclass
+class EconomyReport:
+    generated_at: float
+    elapsed: float
+    totals: Dict[str, float]
+    # (percent, total platinum at that rank)
+    percentiles: List[List[int]]
+    # (lowest total, highest total, characters) per power of ten
+    distribution: List[List[int]]
+    top_holders: List[Dict]
+    top_items: List[Dict]
+    # (first level, last level, characters, total, average, max)
+    level_brackets: List[List[float]]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> "EconomyReport":
+        return cls(**json.loads(text))
+
+
+def _number(value) -> float:
+    """Convert the server's Decimal aggregates to int where whole, else float."""
+    value = float(value or 0)
+    return int(value) if value.is_integer() else round(value, 2)
+
+
+def run_report(db_manager) -> Optional[EconomyReport]:
+    """Compute the report on the server in one round trip, or return None if it failed."""
+    started = time.perf_counter()
+    results = db_manager.execute_multi(
+        ECONOMY_REPORT_SQL,
+        {"top_holders": TOP_HOLDERS, "top_items": TOP_ITEMS, "bracket": LEVEL_BRACKET_SIZE},
+    )
+    if results is None or len(results) != 6:
+        return None
+    totals_rows, percentile_rows, magnitude_rows, holder_rows, item_rows, bracket_rows = results
+
+    totals = {key: _number(value) for key, value in (totals_rows[0] if totals_rows else {}).items()}
+    distribution = []
+    for row in magnitude_rows:
+        magnitude = int(row["magnitude"])
+        low, high = (0, 0) if magnitude < 0 else (10 ** magnitude, 10 ** (magnitude + 1) - 1)
+        distribution.append([low, high, int(row["characters"])])
+    level_brackets = [
+        [
+            int(row["bracket"]) * LEVEL_BRACKET_SIZE + 1,
+            (int(row["bracket"]) + 1) * LEVEL_BRACKET_SIZE,
+            int(row["characters"]),
+            _number(row["total"]),
+            _number(row["average"]),
+            _number(row["max_total"]),
+        ]
+        for row in bracket_rows
+    ]
+    return EconomyReport(
+        generated_at=time.time(),
+        elapsed=time.perf_counter() - started,
+        totals=totals,
+        percentiles=[[int(row["percent"]), _number(row["total"])] for row in percentile_rows],
+        distribution=distribution,
+        top_holders=[{key: _number(value) if key != "name" else value for key, value in row.items()}
+                     for row in holder_rows],
+        top_items=[{key: _number(value) if key != "item_name" else value for key, value in row.items()}
+                   for row in item_rows],
+        level_brackets=level_brackets,
+    )
+
+
+class EconomyReportStore:
+    """The most recent reports per server. Use one instance per thread."""
+
+    def __init__(self, db_path: str = ECONOMY_REPORTS_PATH) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.execute(ECONOMY_REPORTS_TABLE_SQL)
+        self._connection.commit()
+
+    def latest(self, server: str) -> Optional[EconomyReport]:
+        row = self._connection.execute(
+            "SELECT report FROM economy_reports WHERE server = ? ORDER BY generated_at DESC LIMIT 1", (server,)
+        ).fetchone()
+        return EconomyReport.from_json(row[0]) if row else None
+
+    def save(self, server: str, report: EconomyReport) -> None:
+        self._connection.execute(
+            "INSERT INTO economy_reports(server, generated_at, report) VALUES(?, ?, ?)",
+            (server, report.generated_at, report.to_json()),
+        )
+        self._connection.execute(
+            "DELETE FROM economy_reports WHERE server = ? AND report_id NOT IN "
+            "(SELECT report_id FROM economy_reports WHERE server = ? ORDER BY generated_at DESC LIMIT ?)",
+            (server, server, REPORTS_KEPT),
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
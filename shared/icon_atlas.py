@@ -0,0 +1,187 @@
+"""
+Icon Atlas - pack images/icons into one memory-mapped file
+The icons folder holds thousands of small GIFs. build_icon_atlas() packs their
+encoded bytes into a single file with an offset index, and IconAtlas maps that
+file and decodes icons on demand into a bounded PhotoImage LRU.
+
+Build (also run by the setup scripts):
+    python -m shared.icon_atlas
+"""
+import io
+import json
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageTk
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ICONS_DIR = os.path.join(BASE_DIR, "images", "icons")
+ATLAS_PATH = os.path.join(BASE_DIR, "images", "icons.atlas")
+
+# Layout: magic, index length (uint32 LE), JSON index {name: [offset, length]}, icon bytes.
+# Offsets are relative to the first byte after the index.
+ATLAS_MAGIC = b"EQICONS1"
+HEADER_STRUCT = struct.Struct("<8sI")
+ICON_EXTENSION = ".gif"
+
+DEFAULT_PHOTO_CACHE_SIZE = 256
+
+
+def build_icon_atlas(icons_dir: str = ICONS_DIR, atlas_path: str = ATLAS_PATH) -> int:
+    """Pack every icon in icons_dir into atlas_path. Returns the number of icons packed."""
+    names = sorted(
+        entry for entry in os.listdir(icons_dir)
+        if entry.lower().endswith(ICON_EXTENSION)
+    )
+    blobs = []
+    for entry in names:
+        with open(os.path.join(icons_dir, entry), "rb") as icon_file:
+            blobs.append((entry[:-len(ICON_EXTENSION)], icon_file.read()))
+
+    index: Dict[str, Tuple[int, int]] = {}
+    position = 0
+    for name, data in blobs:
+        index[name] = (position, len(data))
+        position += len(data)
+    index_bytes = json.dumps(index).encode("utf-8")
+
+    tmp_path = f"{atlas_path}.tmp"
+    with open(tmp_path, "wb") as atlas_file:
+        atlas_file.write(HEADER_STRUCT.pack(ATLAS_MAGIC, len(index_bytes)))
+        atlas_file.write(index_bytes)
+        for _, data in blobs:
+            atlas_file.write(data)
+    os.replace(tmp_path, atlas_path)
+    return len(blobs)
+
+
+def atlas_is_stale(icons_dir: str = ICONS_DIR, atlas_path: str = ATLAS_PATH) -> bool:
+    """True when the atlas is missing or older than the icons folder."""
+    if not os.path.isfile(atlas_path):
+        return True
+    try:
+        return os.path.getmtime(icons_dir) > os.path.getmtime(atlas_path)
+    except OSError:
+        return False
+
+
+class IconAtlas:
+    """Read icons from a packed atlas, falling back to the loose files when it is unavailable."""
+
+    def __init__(self, atlas_path: str = ATLAS_PATH, icons_dir: str = ICONS_DIR,
+                 max_photos: int = DEFAULT_PHOTO_CACHE_SIZE) -> None:
+        self.atlas_path = atlas_path
+        self.icons_dir = icons_dir
+        self.max_photos = max_photos
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._photos: "OrderedDict[str, Optional[ImageTk.PhotoImage]]" = OrderedDict()
+        self.open()
+
+    def open(self) -> bool:
+        """Map the atlas file and read its index. Returns False if the atlas cannot be used."""
+        self.close()
+        try:
+            self._file = open(self.atlas_path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_length = HEADER_STRUCT.unpack_from(self._map, 0)
+            if magic != ATLAS_MAGIC:
+                raise ValueError("not an icon atlas")
+            raw_index = self._map[HEADER_STRUCT.size:HEADER_STRUCT.size + index_length]
+            data_start = HEADER_STRUCT.size + index_length
+            self._index = {
+                name: (data_start + offset, length)
+                for name, (offset, length) in json.loads(raw_index).items()
+            }
+            return True
+        except (OSError, ValueError, struct.error) as exc:
+            if os.path.exists(self.atlas_path):
+                print(f"Warning: could not open icon atlas ({exc}); reading loose icon files.")
+            self.close()
+            return False
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._index = {}
+        self._photos.clear()
+
+    def __contains__(self, name: str) -> bool:
+        if self._map is not None:
+            return name in self._index
+        return os.path.isfile(os.path.join(self.icons_dir, f"{name}{ICON_EXTENSION}"))
+
+    def get_bytes(self, name: str) -> Optional[bytes]:
+        """Return the encoded bytes for an icon such as "item_1000" or "42"."""
+        if self._map is not None:
+            entry = self._index.get(name)
+            if entry is None:
+                return None
+            offset, length = entry
+            return self._map[offset:offset + length]
+        try:
+            with open(os.path.join(self.icons_dir, f"{name}{ICON_EXTENSION}"), "rb") as icon_file:
+                return icon_file.read()
+        except OSError:
+            return None
+
+    def get_image(self, name: str) -> Optional[Image.Image]:
+        """Decode an icon to a PIL image."""
+        data = self.get_bytes(name)
+        if data is None:
+            return None
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            return image
+        except Exception as exc:
+            print(f"Could not decode icon {name}: {exc}")
+            return None
+
+    def get_photo(self, name: str) -> Optional[ImageTk.PhotoImage]:
+        """Return a cached PhotoImage for an icon, decoding it on first use."""
+        if name in self._photos:
+            self._photos.move_to_end(name)
+            return self._photos[name]
+        image = self.get_image(name)
+        photo = ImageTk.PhotoImage(image) if image is not None else None
+        self._photos[name] = photo
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        return photo
+
+    # Convenience wrappers for the two icon families in images/icons
+    def get_item_image(self, icon_id) -> Optional[Image.Image]:
+        return self.get_image(f"item_{icon_id}")
+
+    def get_spell_photo(self, icon_id) -> Optional[ImageTk.PhotoImage]:
+        return self.get_photo(str(icon_id))
+
+
+_shared_atlas: Optional[IconAtlas] = None
+
+
+def get_icon_atlas() -> IconAtlas:
+    """Return the process-wide atlas, rebuilding the atlas file first if it is out of date."""
+    global _shared_atlas
+    if _shared_atlas is None:
+        if os.path.isdir(ICONS_DIR) and atlas_is_stale():
+            try:
+                build_icon_atlas()
+            except OSError as exc:
+                print(f"Warning: could not build icon atlas: {exc}")
+        _shared_atlas = IconAtlas()
+    return _shared_atlas
+
+
+if __name__ == "__main__":
+    count = build_icon_atlas()
+    print(f"Packed {count} icons into {ATLAS_PATH}")
@@ -0,0 +1,98 @@
+"""
+Image Registry - decode shared image assets once per process
+Background images such as itemback.png and default.jpg are used by several
+tools. The registry decodes each file once and hands out shared PhotoImages,
+with resized variants cached by target size. The shared backgrounds stay
+decoded for the life of the process; other images, such as race and weapon
+previews, are kept in a bounded least-recently-used cache.
+"""
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageTk
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ITEM_BACKGROUND = os.path.join("images", "other", "itemback.png")
+DEFAULT_BACKGROUND = os.path.join("images", "other", "default.jpg")
+
+DEFAULT_PHOTO_CACHE_SIZE = 256
+DEFAULT_IMAGE_CACHE_SIZE = 32
+SHARED_IMAGES = (ITEM_BACKGROUND, DEFAULT_BACKGROUND)
+
+PhotoKey = Tuple[str, Optional[Tuple[int, int]]]
+
+
+class ImageRegistry:
+    """Process-wide cache of decoded images and their PhotoImages.
+
+    Returned images are shared; callers must not modify them in place.
+    """
+
+    def __init__(self, max_photos: int = DEFAULT_PHOTO_CACHE_SIZE,
+                 max_images: int = DEFAULT_IMAGE_CACHE_SIZE) -> None:
+        self.max_photos = max_photos
+        self.max_images = max_images
+        self._shared_paths = {self.resolve(path) for path in SHARED_IMAGES}
+        self._shared_images: Dict[str, Image.Image] = {}
+        self._images: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._photos: "OrderedDict[PhotoKey, ImageTk.PhotoImage]" = OrderedDict()
+
+    @staticmethod
+    def resolve(path: str) -> str:
+        """Resolve paths relative to the application directory."""
+        if os.path.isabs(path):
+            return os.path.normpath(path)
+        return os.path.normpath(os.path.join(BASE_DIR, path))
+
+    def get_image(self, path: str) -> Image.Image:
+        """Return the decoded image for path. Raises OSError if it cannot be read."""
+        full_path = self.resolve(path)
+        image = self._shared_images.get(full_path)
+        if image is not None:
+            return image
+        image = self._images.get(full_path)
+        if image is not None:
+            self._images.move_to_end(full_path)
+            return image
+
+        with Image.open(full_path) as source:
+            source.load()
+            image = source.copy()
+        if full_path in self._shared_paths:
+            self._shared_images[full_path] = image
+        else:
+            self._images[full_path] = image
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        return image
+
+    def get_photo(self, path: str, max_size: Optional[Tuple[int, int]] = None) -> ImageTk.PhotoImage:
+        """Return a shared PhotoImage, optionally shrunk to fit within max_size."""
+        full_path = self.resolve(path)
+        key = (full_path, tuple(max_size) if max_size else None)
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+            return photo
+
+        image = self.get_image(full_path)
+        if max_size and (image.width > max_size[0] or image.height > max_size[1]):
+            image = image.copy()
+            image.thumbnail(max_size, Image.LANCZOS)
+        photo = ImageTk.PhotoImage(image)
+        self._photos[key] = photo
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        return photo
+
+
+_shared_registry: Optional[ImageRegistry] = None
+
+
+def get_image_registry() -> ImageRegistry:
+    """Return the process-wide image registry."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = ImageRegistry()
+    return _shared_registry
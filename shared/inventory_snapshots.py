@@ -0,0 +1,266 @@
+"""
+Inventory Snapshots - point-in-time copies of character inventories
+Each snapshot stores (slot, item id, charges) rows packed as fixed-width
+integers and zlib-compressed. Contents are keyed by their SHA-1, so a
+character whose inventory has not changed since the last snapshot adds only
+a small snapshot row. Characters are captured in batches of one query each.
+Two snapshots, or a snapshot and live data, are compared with a merge on
+slot id.
+"""
+import hashlib
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from shared.database import BackgroundConnection
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVENTORY_SNAPSHOTS_PATH = os.path.join(BASE_DIR, "cache", "inventory_snapshots.db")
+SNAPSHOT_BATCH_SIZE = 500
+DEFAULT_SNAPSHOT_INTERVAL_MINUTES = 60
+
+# slot id, item id, charges
+SnapshotRow = Tuple[int, int, int]
+_ROW = struct.Struct("<iii")
+
+SNAPSHOT_CONTENTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS snapshot_contents (
+    content_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+SNAPSHOTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    character_id INTEGER NOT NULL,
+    character_name TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    label TEXT NOT NULL,
+    item_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL REFERENCES snapshot_contents(content_hash)
+);
+"""
+
+SNAPSHOTS_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS snapshots_character ON snapshots(server, character_id, taken_at);"
+)
+
+# Characters with an empty inventory still get a (NULL slot) row, so their snapshot is recorded
+LIVE_INVENTORY_SQL = """
+    SELECT cd.id AS character_id, cd.name, i.slot_id, i.item_id, i.charges
+    FROM character_data cd
+    LEFT JOIN inventory i ON i.character_id = cd.id AND i.item_id > 0
+    WHERE cd.id IN ({ids})
+    ORDER BY cd.id, i.slot_id
+"""
+
+
+@dataclass
+class SnapshotInfo:
+    snapshot_id: int
+    character_id: int
+    character_name: str
+    taken_at: float
+    label: str
+    item_count: int
+    content_hash: str
+
+
+@dataclass
+class SlotChange:
+    slot_id: int
+    # (item id, charges) before and after; None where the slot was empty
+    before: Optional[Tuple[int, int]]
+    after: Optional[Tuple[int, int]]
+
+    @property
+    def kind(self) -> str:
+        if self.before is None:
+            return "Added"
+        if self.after is None:
+            return "Removed"
+        if self.before[0] != self.after[0]:
+            return "Replaced"
+        return "Charges"
+
+
+def pack_rows(rows: Sequence[SnapshotRow]) -> bytes:
+    return zlib.compress(b"".join(_ROW.pack(*row) for row in rows))
+
+
+def unpack_rows(data: bytes) -> List[SnapshotRow]:
+    return list(_ROW.iter_unpack(zlib.decompress(data)))
+
+
+def content_hash(rows: Sequence[SnapshotRow]) -> str:
+    return hashlib.sha1(b"".join(_ROW.pack(*row) for row in rows)).hexdigest()
+
+
+def diff_rows(before: Sequence[SnapshotRow], after: Sequence[SnapshotRow]) -> List[SlotChange]:
+    """Merge two slot-sorted row lists and return the slots whose item or charges differ."""
+    changes = []
+    i = j = 0
+    while i < len(before) or j < len(after):
+        old = before[i] if i < len(before) else None
+        new = after[j] if j < len(after) else None
+        if new is None or (old is not None and old[0] < new[0]):
+            changes.append(SlotChange(old[0], (old[1], old[2]), None))
+            i += 1
+        elif old is None or new[0] < old[0]:
+            changes.append(SlotChange(new[0], None, (new[1], new[2])))
+            j += 1
+        else:
+            if old[1:] != new[1:]:
+                changes.append(SlotChange(old[0], (old[1], old[2]), (new[1], new[2])))
+            i += 1
+            j += 1
+    return changes
+
+
+def fetch_live_inventories(db_manager, character_ids: Sequence[int],
+                           batch_size: int = SNAPSHOT_BATCH_SIZE) -> Dict[int, Tuple[str, List[SnapshotRow]]]:
+    """Return {character id: (name, slot-sorted rows)} using one query per batch of characters.
+
+    db_manager is anything with execute_query: the shared DatabaseManager or
+    a BackgroundConnection. Ids that no longer exist are left out.
+    """
+    inventories: Dict[int, Tuple[str, List[SnapshotRow]]] = {}
+    for start in range(0, len(character_ids), batch_size):
+        batch = character_ids[start:start + batch_size]
+        rows = db_manager.execute_query(
+            LIVE_INVENTORY_SQL.format(ids=", ".join(["%s"] * len(batch))), tuple(batch)
+        )
+        for row in rows:
+            name, slots = inventories.setdefault(int(row["character_id"]), (row["name"], []))
+            if row["slot_id"] is not None:
+                slots.append((int(row["slot_id"]), int(row["item_id"]), int(row["charges"] or 0)))
+    return inventories
+
+
+class InventorySnapshotStore:
+    """Snapshots in local SQLite, with contents shared by hash. Use one instance per thread."""
+
+    def __init__(self, db_path: str = INVENTORY_SNAPSHOTS_PATH) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode = WAL;")
+        self._connection.execute("PRAGMA synchronous = NORMAL;")
+        self._connection.execute(SNAPSHOT_CONTENTS_TABLE_SQL)
+        self._connection.execute(SNAPSHOTS_TABLE_SQL)
+        self._connection.execute(SNAPSHOTS_INDEX_SQL)
+        self._connection.commit()
+
+    def add(self, server: str, inventories: Dict[int, Tuple[str, List[SnapshotRow]]],
+            label: str = "", taken_at: Optional[float] = None) -> int:
+        """Record one snapshot per character and return how many were written."""
+        taken_at = time.time() if taken_at is None else taken_at
+        for character_id, (name, rows) in inventories.items():
+            digest = content_hash(rows)
+            self._connection.execute(
+                "INSERT OR IGNORE INTO snapshot_contents(content_hash, data) VALUES(?, ?)",
+                (digest, pack_rows(rows)),
+            )
+            self._connection.execute(
+                "INSERT INTO snapshots(server, character_id, character_name, taken_at, label, item_count, "
+                "content_hash) VALUES(?, ?, ?, ?, ?, ?, ?)",
+                (server, character_id, name, taken_at, label, len(rows), digest),
+            )
+        self._connection.commit()
+        return len(inventories)
+
+    def for_character(self, server: str, character_id: int) -> List[SnapshotInfo]:
+        rows = self._connection.execute(
+            "SELECT snapshot_id, character_id, character_name, taken_at, label, item_count, content_hash "
+            "FROM snapshots WHERE server = ? AND character_id = ? ORDER BY taken_at DESC, snapshot_id DESC",
+            (server, int(character_id)),
+        ).fetchall()
+        return [SnapshotInfo(*row) for row in rows]
+
+    def rows(self, snapshot_id: int) -> List[SnapshotRow]:
+        row = self._connection.execute(
+            "SELECT c.data FROM snapshots s JOIN snapshot_contents c ON c.content_hash = s.content_hash "
+            "WHERE s.snapshot_id = ?",
+            (snapshot_id,),
+        ).fetchone()
+        return unpack_rows(row["data"]) if row else []
+
+    def delete(self, snapshot_ids: Iterable[int]) -> None:
+        """Delete snapshots and any contents no other snapshot shares."""
+        self._connection.executemany(
+            "DELETE FROM snapshots WHERE snapshot_id = ?", [(snapshot_id,) for snapshot_id in snapshot_ids]
+        )
+        self._connection.execute(
+            "DELETE FROM snapshot_contents WHERE content_hash NOT IN (SELECT content_hash FROM snapshots)"
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class SnapshotScheduler:
+    """Snapshot a fixed set of characters every interval on a background thread.
+
+    The worker opens its own BackgroundConnection and snapshot store. The
+    UI thread reads status instead of being called back, because Tk must
+    only be used from the thread that created it.
+    """
+
+    def __init__(self, settings: Dict, server: str, character_ids: Sequence[int], interval_seconds: float,
+                 db_path: str = INVENTORY_SNAPSHOTS_PATH,
+                 connect: Callable[[Dict], BackgroundConnection] = BackgroundConnection) -> None:
+        self.settings = settings
+        self.server = server
+        self.character_ids = list(character_ids)
+        self.interval_seconds = interval_seconds
+        self.db_path = db_path
+        self.connect = connect
+        self.status = "Scheduled"
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="inventory-snapshots", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        store = InventorySnapshotStore(self.db_path)
+        connection = None
+        try:
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    if connection is None or not connection.is_connected():
+                        connection = self.connect(self.settings)
+                    inventories = fetch_live_inventories(connection, self.character_ids)
+                    written = store.add(self.server, inventories, label="Scheduled")
+                    self.runs += 1
+                    self.status = (
+                        f"Run {self.runs}: {written} characters in {time.perf_counter() - started:.1f}s, "
+                        f"at {time.strftime('%H:%M')}"
+                    )
+                except Exception as exc:
+                    connection = None
+                    self.status = f"Snapshot failed at {time.strftime('%H:%M')}: {exc}"
+                self._stop.wait(self.interval_seconds)
+        finally:
+            if connection is not None:
+                connection.close()
+            store.close()
+            self.status = f"Stopped after {self.runs} runs"
@@ -0,0 +1,339 @@
+"""
+Item Card Renderer - compose item stat cards into a single image
+Shared by the Inventory, Loot and Tradeskill tools. The stat query, bitmask
+decoding and ITEM_STAT_DISPLAY_CONFIG layout live here, and recently viewed
+cards are kept in a bounded LRU so re-selecting an item does not hit the database.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+from dictionaries import SLOT_BITMASK_DISPLAY, ITEM_STAT_DISPLAY_CONFIG
+from lookup_data import (
+    class_lookup as CLASS_LOOKUP_SEED,
+    race_lookup as RACE_LOOKUP_SEED,
+)
+from shared.icon_atlas import get_icon_atlas
+from shared.image_registry import get_image_registry, ITEM_BACKGROUND
+
+ITEM_CARD_COLUMNS = [
+    "Name", "aagi", "ac", "accuracy", "acha", "adex", "aint", "asta", "astr", "attack", "augrestrict",
+    "augtype", "avoidance", "awis", "bagsize", "bagslots", "bagtype", "bagwr", "banedmgamt", "banedmgraceamt",
+    "banedmgbody", "banedmgrace", "classes", "color", "combateffects", "extradmgskill", "extradmgamt", "cr", "damage",
+    "damageshield", "deity", "delay", "dotshielding", "dr", "elemdmgtype", "elemdmgamt", "endur", "fr", "fvnodrop",
+    "haste", "hp", "regen", "icon", "itemclass", "itemtype", "lore", "loregroup", "magic", "mana", "manaregen",
+    "enduranceregen", "mr", "nodrop", "norent", "pr", "races", "range", "reclevel", "recskill", "reqlevel",
+    "shielding", "size", "skillmodtype", "skillmodvalue", "slots", "clickeffect", "spellshield", "strikethrough",
+    "stunresist", "weight", "attuneable", "svcorruption", "skillmodmax",
+    "heroic_str", "heroic_int", "heroic_wis", "heroic_agi", "heroic_dex",
+    "heroic_sta", "heroic_cha", "heroic_pr", "heroic_dr", "heroic_fr",
+    "heroic_cr", "heroic_mr", "heroic_svcorrup", "healamt", "spelldmg", "clairvoyance", "backstabdmg",
+]
+
+ITEM_CARD_QUERY = (
+    "SELECT " + ", ".join(f"`{column}`" for column in ITEM_CARD_COLUMNS) + " FROM items WHERE id = %s"
+)
+
+# Font files tried for a Tk font family; the DejaVu fallbacks ship with most Linux installs.
+FONT_FILES = {
+    ("arial", False): ["arial.ttf", "Arial.ttf", "DejaVuSans.ttf"],
+    ("arial", True): ["arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf"],
+}
+
+DEFAULT_CARD_CACHE_SIZE = 128
+
+
+def _has_value(value: Any) -> bool:
+    """Return True when a stat value is worth drawing (non-empty and non-zero)."""
+    if value in (None, "", 0, 0.0):
+        return False
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped == "":
+            return False
+        try:
+            return float(stripped) != 0
+        except ValueError:
+            return True
+    return True
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ItemCardRenderer:
+    """Render item stat cards with PIL and cache them by (server, item id).
+
+    The server identity is the data version: after the database connection is
+    pointed at another server, cards rendered from the old items table are
+    no longer served.
+    """
+
+    def __init__(self, db_manager, notes_db=None, max_entries: int = DEFAULT_CARD_CACHE_SIZE) -> None:
+        self.db_manager = db_manager
+        self.notes_db = notes_db
+        self.max_entries = max_entries
+        self._cards: "OrderedDict[Tuple[Optional[str], int], ImageTk.PhotoImage]" = OrderedDict()
+        self._fonts: Dict[Tuple, Any] = {}
+        self._background: Optional[Image.Image] = None
+        self.class_bitmask_display: Dict[int, str] = {}
+        self.race_bitmask_display: Dict[int, str] = {}
+        self.all_class_mask = 0
+        self.all_race_mask = 0
+        self.load_lookup_data()
+
+    # ------------------------------------------------------------------
+    # Lookup data
+    # ------------------------------------------------------------------
+    def load_lookup_data(self) -> None:
+        """Load class and race bitmask displays from notes.db with seed fallbacks."""
+
+        def _fetch(fetcher, seed):
+            rows = []
+            if self.notes_db:
+                try:
+                    rows = fetcher()
+                except Exception as exc:
+                    print(f"Warning: lookup fetch failed ({exc}); using seed data.")
+            if not rows:
+                rows = [{'id': sid, **data} for sid, data in seed.items()]
+            return rows
+
+        class_rows = _fetch(lambda: self.notes_db.get_class_bitmasks(), CLASS_LOOKUP_SEED)
+        self.class_bitmask_display = {
+            row['bit_value']: row.get('abbr') or row['name'] for row in class_rows
+        }
+        race_rows = _fetch(lambda: self.notes_db.get_race_bitmasks(), RACE_LOOKUP_SEED)
+        self.race_bitmask_display = {
+            row['bit_value']: row.get('abbr') or row['name'] for row in race_rows
+        }
+        self.all_class_mask = self._compute_all_mask(self.class_bitmask_display)
+        self.all_race_mask = self._compute_all_mask(self.race_bitmask_display)
+
+    @staticmethod
+    def _compute_all_mask(mapping: Dict[int, str]) -> int:
+        combined = 0
+        for bit_value in mapping:
+            bit_int = _to_int(bit_value)
+            if bit_int is None or bit_int <= 0 or bit_int == 65535:
+                continue
+            combined |= bit_int
+        return combined
+
+    # ------------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------------
+    def get_card(self, item_id) -> Optional[ImageTk.PhotoImage]:
+        """Return the rendered card for an item, rendering and caching it on a miss."""
+        item_id = _to_int(item_id)
+        if item_id is None:
+            return None
+
+        key = (self.db_manager.server_identity(), item_id)
+        photo = self._cards.get(key)
+        if photo is not None:
+            self._cards.move_to_end(key)
+            return photo
+
+        item_stats = self.fetch_item_stats(item_id)
+        if not item_stats:
+            return None
+
+        photo = ImageTk.PhotoImage(self.compose_card(item_stats))
+        self._cards[key] = photo
+        while len(self._cards) > self.max_entries:
+            self._cards.popitem(last=False)
+        return photo
+
+    def draw_card(self, canvas, item_id) -> bool:
+        """Replace the canvas contents with the card for item_id. Returns False if unavailable."""
+        photo = self.get_card(item_id)
+        if photo is None:
+            return False
+        canvas.delete("all")
+        canvas.create_image(0, 0, anchor="nw", image=photo)
+        # Keep a reference on the canvas to prevent garbage collection
+        canvas.item_photo = photo
+        return True
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+    def fetch_item_stats(self, item_id: int) -> Optional[Dict[str, Any]]:
+        row = self.db_manager.execute_query(ITEM_CARD_QUERY, (item_id,), fetch_all=False)
+        if not row:
+            return None
+        if isinstance(row, dict):
+            return dict(row)
+        return dict(zip(ITEM_CARD_COLUMNS, row))
+
+    def decode_item_stats(self, item_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace class, race and slot bitmasks with readable names."""
+        stats = dict(item_stats)
+
+        for key, mapping, all_mask in (
+            ("classes", self.class_bitmask_display, self.all_class_mask),
+            ("races", self.race_bitmask_display, self.all_race_mask),
+        ):
+            mask_value = _to_int(stats.get(key))
+            if mask_value is None:
+                continue
+            if mask_value == 65535 or (all_mask and (mask_value & all_mask) == all_mask):
+                stats[key] = "ALL"
+                continue
+            names = [
+                name for bit_value, name in mapping.items()
+                if bit_value != 65535 and mask_value & bit_value
+            ]
+            stats[key] = ", ".join(names) if names else str(mask_value)
+
+        slots_bitmask = _to_int(stats.get("slots"))
+        if slots_bitmask is not None:
+            slot_names = [
+                slot_name for bit_value, slot_name in SLOT_BITMASK_DISPLAY.items() if slots_bitmask & bit_value
+            ]
+            stats["slots"] = ", ".join(dict.fromkeys(slot_names))
+        return stats
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def _get_background(self) -> Image.Image:
+        if self._background is None:
+            try:
+                self._background = get_image_registry().get_image(ITEM_BACKGROUND).convert("RGBA")
+            except Exception as exc:
+                print(f"Could not load item background image: {exc}")
+                self._background = Image.new("RGBA", (415, 184), "#3c3c3c")
+        return self._background
+
+    def _get_font(self, font_spec: Tuple) -> Any:
+        """Resolve a Tk font tuple such as ("Arial", 9, "bold") to a PIL font."""
+        font = self._fonts.get(font_spec)
+        if font is not None:
+            return font
+
+        family = str(font_spec[0]).lower() if font_spec else "arial"
+        points = font_spec[1] if len(font_spec) > 1 else 9
+        bold = "bold" in font_spec[2:]
+        # Tk sizes are points; PIL sizes are pixels (96 DPI)
+        pixels = max(1, round(points * 4 / 3))
+        for filename in FONT_FILES.get((family, bold), FONT_FILES[("arial", bold)]):
+            try:
+                font = ImageFont.truetype(filename, pixels)
+                break
+            except OSError:
+                continue
+        if font is None:
+            font = ImageFont.load_default(size=pixels)
+        self._fonts[font_spec] = font
+        return font
+
+    def _load_icon(self, icon_id) -> Optional[Image.Image]:
+        icon = get_icon_atlas().get_item_image(icon_id)
+        if icon is None:
+            print(f"Could not load icon: item_{icon_id}")
+            return None
+        return icon.convert("RGBA")
+
+    def compose_card(self, item_stats: Dict[str, Any]) -> Image.Image:
+        """Draw the icon and stats for one item onto a copy of the item background."""
+        stats = self.decode_item_stats(item_stats)
+        config = ITEM_STAT_DISPLAY_CONFIG
+        card = self._get_background().copy()
+        draw = ImageDraw.Draw(card)
+
+        icon_id = stats.get("icon")
+        if icon_id:
+            icon = self._load_icon(icon_id)
+            if icon is not None:
+                icon_pos = config["icon_position"]
+                # Canvas images default to a centre anchor
+                offset = (icon_pos["x"] - icon.width // 2, icon_pos["y"] - icon.height // 2)
+                card.alpha_composite(icon, dest=offset)
+
+        # Header information
+        for stat_name, pos_config in config["header_positions"].items():
+            value = stats.get(stat_name)
+            if value in (None, ""):
+                continue
+            if pos_config.get("label") is None:
+                stat_text = f"{value}"
+            else:
+                stat_text = f"{pos_config['label']}: {value}"
+            draw.text(
+                (pos_config["x"], pos_config["y"]),
+                stat_text,
+                fill=pos_config["color"],
+                font=self._get_font(pos_config["font"]),
+                anchor="la",
+            )
+
+        # Property row
+        property_config = config["property_row"]
+        items_placed = 0
+        for prop_name, prop_config in property_config["properties"].items():
+            value = stats.get(prop_name)
+            if value is None:
+                continue
+            if "format" in prop_config:
+                value = prop_config["format"](value)
+            if not value:
+                continue
+            current_x = property_config["base_x"] + (items_placed * property_config["spacing"])
+            draw.text(
+                (current_x, property_config["y"]),
+                str(value),
+                fill=prop_config["color"],
+                font=self._get_font(prop_config["font"]),
+                anchor="la",
+            )
+            items_placed += 1
+
+        # Stat columns
+        stat_font = self._get_font(("Arial", 8))
+        heroic_font = self._get_font(("Arial", 9))
+        for column_config in config["stat_columns"]:
+            x = column_config["x"]
+            y = column_config["y"]
+            heroic_by_label = {
+                heroic_stat["label"]: heroic_stat["name"]
+                for heroic_stat in column_config.get("heroic_stats", [])
+            }
+            for stat in column_config["stats"]:
+                if not _has_value(stats.get(stat["name"])):
+                    continue
+                stat_text = f"{stat['label']}: {stats[stat['name']]}"
+                draw.text((x, y), stat_text, fill=stat["color"], font=stat_font, anchor="la")
+
+                heroic_name = heroic_by_label.get(stat["label"])
+                if heroic_name and _has_value(stats.get(heroic_name)):
+                    heroic_x = x + draw.textlength(stat_text, font=stat_font)
+                    draw.text(
+                        (heroic_x, y),
+                        f" ({stats[heroic_name]})",
+                        fill="gold",
+                        font=heroic_font,
+                        anchor="la",
+                    )
+                y += column_config["spacing"]
+
+        return card
+
+
+_shared_renderer: Optional[ItemCardRenderer] = None
+
+
+def get_item_card_renderer(db_manager, notes_db=None) -> ItemCardRenderer:
+    """Return the process-wide renderer so every tool shares one card cache."""
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = ItemCardRenderer(db_manager, notes_db)
+    return _shared_renderer
@@ -0,0 +1,175 @@
+"""
+Item Ownership - find every holder of one or more items
+Character inventories, shared banks and guild banks are scanned in one
+UNION ALL query. The server groups the rows per item and owner, and pages
+the result with a window-function total, so only one page of holders is
+sent back however common the item is. Pages are cached in memory and
+indexed by item id. An edit to an item drops every cached page that
+mentions it.
+"""
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+OWNERSHIP_PAGE_SIZE = 200
+MAX_CACHED_PAGES = 64
+
+# {ids} is replaced with one placeholder per item id in each branch
+OWNERSHIP_SQL = """
+    SELECT o.source, o.item_id, COALESCE(it.Name, 'Unknown Item') as item_name,
+           o.owner_id, o.owner_name, o.account_id, o.account_name,
+           o.stacks, o.quantity, o.slots, COUNT(*) OVER () as total_rows
+    FROM (
+        SELECT 'Inventory' as source, i.item_id, cd.id as owner_id, cd.name as owner_name,
+               cd.account_id, a.name as account_name,
+               COUNT(*) as stacks, SUM(GREATEST(i.charges, 1)) as quantity,
+               GROUP_CONCAT(i.slot_id ORDER BY i.slot_id SEPARATOR ', ') as slots
+        FROM inventory i
+        JOIN character_data cd ON cd.id = i.character_id
+        LEFT JOIN account a ON a.id = cd.account_id
+        WHERE i.item_id IN ({ids})
+        GROUP BY i.item_id, cd.id, cd.name, cd.account_id, a.name
+
+        UNION ALL
+
+        SELECT 'Shared Bank', sb.item_id, sb.account_id, a.name,
+               sb.account_id, a.name,
+               COUNT(*), SUM(GREATEST(sb.charges, 1)),
+               GROUP_CONCAT(sb.slot_id ORDER BY sb.slot_id SEPARATOR ', ')
+        FROM sharedbank sb
+        LEFT JOIN account a ON a.id = sb.account_id
+        WHERE sb.item_id IN ({ids})
+        GROUP BY sb.item_id, sb.account_id, a.name
+
+        UNION ALL
+
+        SELECT 'Guild Bank', gb.item_id, gb.guild_id, g.name,
+               NULL, NULL,
+               COUNT(*), SUM(GREATEST(gb.quantity, 1)),
+               GROUP_CONCAT(CONCAT(gb.area, ':', gb.slot) ORDER BY gb.area, gb.slot SEPARATOR ', ')
+        FROM guild_bank gb
+        LEFT JOIN guilds g ON g.id = gb.guild_id
+        WHERE gb.item_id IN ({ids})
+        GROUP BY gb.item_id, gb.guild_id, g.name
+    ) o
+    LEFT JOIN items it ON it.id = o.item_id
+    ORDER BY o.quantity DESC, o.item_id, o.source, o.owner_id
+    LIMIT %s OFFSET %s
+"""
+
+
+@dataclass
+class ItemHolder:
+    source: str
+    item_id: int
+    item_name: str
+    owner_id: int
+    owner_name: str
+    account_id: Optional[int]
+    account_name: Optional[str]
+    stacks: int
+    quantity: int
+    slots: str
+
+
+@dataclass
+class OwnershipPage:
+    holders: List[ItemHolder]
+    total: int
+    offset: int
+
+
+def parse_item_ids(text: str, label: str = "item IDs") -> List[int]:
+    """Parse "1001, 1002 1003" into sorted unique ids. Raises ValueError on anything else.
+
+    label names the ids in error messages, so account or zone lists can reuse it.
+    """
+    title = label[0].upper() + label[1:]
+    tokens = [token for token in re.split(r"[\s,;]+", text.strip()) if token]
+    if not tokens:
+        raise ValueError(f"Enter one or more {label}.")
+    try:
+        item_ids = sorted({int(token) for token in tokens})
+    except ValueError:
+        raise ValueError(f"{title} must be whole numbers separated by spaces or commas.")
+    if any(item_id <= 0 for item_id in item_ids):
+        raise ValueError(f"{title} must be positive.")
+    return item_ids
+
+
+def fetch_holders(db_manager, item_ids: Sequence[int], limit: int = OWNERSHIP_PAGE_SIZE,
+                  offset: int = 0) -> Optional[OwnershipPage]:
+    """Run the ownership query for one page, or return None if it failed."""
+    placeholders = ", ".join(["%s"] * len(item_ids))
+    params = tuple(item_ids) * 3 + (limit, offset)
+    rows = db_manager.execute_query(OWNERSHIP_SQL.format(ids=placeholders), params, none_on_error=True)
+    if rows is None:
+        return None
+    holders = [
+        ItemHolder(
+            source=row["source"],
+            item_id=int(row["item_id"]),
+            item_name=row["item_name"],
+            owner_id=int(row["owner_id"]),
+            owner_name=row["owner_name"] or f"#{row['owner_id']}",
+            account_id=row["account_id"],
+            account_name=row["account_name"],
+            stacks=int(row["stacks"]),
+            quantity=int(row["quantity"]),
+            slots=row["slots"] or "",
+        )
+        for row in rows
+    ]
+    total = int(rows[0]["total_rows"]) if rows else 0
+    return OwnershipPage(holders, total, offset)
+
+
+class ItemOwnershipCache:
+    """Least-recently-used ownership pages, invalidated by item id."""
+
+    def __init__(self, max_pages: int = MAX_CACHED_PAGES) -> None:
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[Tuple[FrozenSet[int], int, int], OwnershipPage]" = OrderedDict()
+        self._keys_by_item: Dict[int, Set[Tuple[FrozenSet[int], int, int]]] = {}
+
+    def get(self, db_manager, item_ids: Sequence[int], offset: int = 0,
+            limit: int = OWNERSHIP_PAGE_SIZE, refresh: bool = False) -> Optional[OwnershipPage]:
+        """Return one page of holders, from the cache unless refresh is set or an item was edited.
+
+        Returns None if the query failed; failures are not cached.
+        """
+        key = (frozenset(item_ids), offset, limit)
+        page = None if refresh else self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+            return page
+        page = fetch_holders(db_manager, sorted(key[0]), limit, offset)
+        if page is None:
+            return None
+        self._discard(key)
+        self._pages[key] = page
+        for item_id in key[0]:
+            self._keys_by_item.setdefault(item_id, set()).add(key)
+        while len(self._pages) > self.max_pages:
+            self._discard(next(iter(self._pages)))
+        return page
+
+    def _discard(self, key) -> None:
+        self._pages.pop(key, None)
+        for item_id in key[0]:
+            keys = self._keys_by_item.get(item_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_item[item_id]
+
+    def invalidate(self, item_ids) -> None:
+        """Drop cached pages for any of item_ids, e.g. after an inventory edit."""
+        for item_id in item_ids:
+            for key in list(self._keys_by_item.get(int(item_id), ())):
+                self._discard(key)
+
+    def clear(self) -> None:
+        self._pages.clear()
+        self._keys_by_item.clear()
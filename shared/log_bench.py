@@ -0,0 +1,340 @@
+"""
+Log Bench - synthetic eqlog corpus and parser throughput benchmark
+generate_log() writes a client log of any size with a realistic mix of says,
+tells, guild chat, /loc output and combat noise. run_benchmark() parses it
+with each parser mode in a fresh process and reports lines/sec, MB/sec and
+peak RSS. Everything runs headless; nothing here imports Tk.
+
+Usage:
+    python -m shared.log_bench generate cache/bench/eqlog_Bench_synthetic.txt --size 512M
+    python -m shared.log_bench run cache/bench/eqlog_Bench_synthetic.txt --save baseline.json
+    python -m shared.log_bench run cache/bench/eqlog_Bench_synthetic.txt --compare baseline.json
+
+--compare exits with status 1 when a mode's lines/sec falls more than
+--tolerance below the baseline, so it can gate parser changes.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from shared.log_parser import (
+    COMPRESSED_OPENERS,
+    LogParser,
+    LogParseWorker,
+    iter_log_lines,
+    open_log,
+    parse_file_parallel,
+)
+from shared.log_store import LogStore, format_timestamp
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS_PATH = os.path.join(BASE_DIR, "cache", "bench", "eqlog_Bench_synthetic.txt")
+DEFAULT_TOLERANCE = 0.10
+WRITE_BLOCK_BYTES = 1 << 20
+# 2026-10-19 12:00:00, on the same naive scale as parse_timestamp
+CORPUS_START_EPOCH = 1792411200
+
+NAMES = ("Aelia", "Borin", "Cyrra", "Dagny", "Eamon", "Fyra", "Gorrik", "Hesta", "Ilyan", "Joss")
+MOBS = ("a rat", "a decaying skeleton", "a fire beetle", "an orc pawn", "a gnoll scout", "Lord Nagafen")
+ZONES = ("The Plane of Knowledge", "East Commonlands", "Greater Faydark", "Nagafen's Lair", "The Nexus")
+KEYWORDS = ("spawn", "path", "grid", "door", "npc", "camp", "loot", "pull", "wp", "zone", "buff", "inc")
+WORDS = (
+    "the", "at", "near", "here", "north", "south", "by", "wall", "gate", "tower", "bridge", "ramp",
+    "left", "right", "up", "down", "again", "check", "fix", "this", "one", "next", "point", "corner",
+)
+
+LineBuilder = Callable[[random.Random], str]
+
+
+def _chat(rng: random.Random) -> str:
+    words = [rng.choice(KEYWORDS)] + [rng.choice(WORDS) for _ in range(rng.randint(2, 12))]
+    if rng.random() < 0.2:
+        words.append(f"{rng.uniform(-3000, 3000):.2f}, {rng.uniform(-3000, 3000):.2f}, {rng.uniform(-200, 200):.2f}")
+    return " ".join(words)
+
+
+def _coordinate(rng: random.Random) -> str:
+    return f"{rng.uniform(-3000, 3000):.2f}"
+
+
+# (weight, line builder) pairs, roughly the mix of a raiding or building session
+LINE_MIX: Tuple[Tuple[int, LineBuilder], ...] = (
+    (14, lambda rng: f"{rng.choice(NAMES)} says, '{_chat(rng)}'"),
+    (8, lambda rng: f"You say, '{_chat(rng)}'"),
+    (8, lambda rng: f"{rng.choice(NAMES)} tells you, '{_chat(rng)}'"),
+    (5, lambda rng: f"You told {rng.choice(NAMES)}, '{_chat(rng)}'"),
+    (6, lambda rng: f"{rng.choice(NAMES)} tells the guild, '{_chat(rng)}'"),
+    (3, lambda rng: f"{rng.choice(NAMES)} says out of character, '{_chat(rng)}'"),
+    (10, lambda rng: f"Your Location is {_coordinate(rng)}, {_coordinate(rng)}, {rng.uniform(-200, 200):.2f}"),
+    (4, lambda rng: (
+        f"Location for {rng.choice(NAMES)} | XYZ: {_coordinate(rng)}, {_coordinate(rng)}, "
+        f"{rng.uniform(-200, 200):.2f} Heading: {rng.uniform(0, 512):.1f}"
+    )),
+    (20, lambda rng: f"You hit {rng.choice(MOBS)} for {rng.randint(1, 400)} points of damage."),
+    (14, lambda rng: f"{rng.choice(MOBS).capitalize()} hits YOU for {rng.randint(1, 250)} points of damage."),
+    (4, lambda rng: f"You have entered {rng.choice(ZONES)}."),
+    (4, lambda rng: f"{rng.choice(MOBS).capitalize()} has been slain by {rng.choice(NAMES)}!"),
+)
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte count such as 4096, 64K, 512M or 2G."""
+    text = text.strip().upper().rstrip("B")
+    scale = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def generate_log(path: str, size_bytes: int, seed: int = 0) -> int:
+    """Write a synthetic log of about size_bytes (uncompressed) and return its line count.
+
+    A .gz or .bz2 path is compressed as it is written. Output is built in
+    blocks, so memory use does not grow with size_bytes.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    weights = [weight for weight, _builder in LINE_MIX]
+    builders = [builder for _weight, builder in LINE_MIX]
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(path)[1].lower(), open)
+
+    epoch = CORPUS_START_EPOCH
+    written = 0
+    lines = 0
+    with opener(path, "wb") as log_file:
+        while written < size_bytes:
+            block: List[str] = []
+            block_bytes = 0
+            for builder in rng.choices(builders, weights, k=4096):
+                epoch += rng.choice((0, 0, 1, 1, 2, 5))
+                line = f"[{format_timestamp(epoch)}] {builder(rng)}\n"
+                block.append(line)
+                block_bytes += len(line)
+                if block_bytes >= WRITE_BLOCK_BYTES or written + block_bytes >= size_bytes:
+                    break
+            log_file.write("".join(block).encode("utf-8"))
+            written += block_bytes
+            lines += len(block)
+    return lines
+
+
+# ----------------------------------------------------------------------
+# Parser modes
+# ----------------------------------------------------------------------
+def _mode_lines(path: str) -> int:
+    """Read and decode lines only: the I/O floor for the other modes."""
+    count = 0
+    for _line in iter_log_lines(path):
+        count += 1
+    return count
+
+
+def _mode_serial(path: str) -> int:
+    parser = LogParser()
+    entries = [parsed for start, _end, line in iter_log_lines(path) for parsed in [parser.parse_line(line, start)] if parsed]
+    return len(entries)
+
+
+def _mode_store(path: str) -> int:
+    """Serial parse into a LogStore, as the Logs tab keeps it."""
+    parser = LogParser()
+    store = LogStore(path)
+    store.extend(parsed for start, _end, line in iter_log_lines(path) for parsed in [parser.parse_line(line, start)] if parsed)
+    return len(store)
+
+
+def _mode_parallel(path: str) -> int:
+    store = LogStore(path)
+    for batch, _chunk_end, _keyword in parse_file_parallel(path, 0, os.path.getsize(path)):
+        store.extend(batch)
+    return len(store)
+
+
+def _run_worker(path: str, parallel: bool) -> int:
+    worker = LogParseWorker(path, use_cache=False, parallel=parallel)
+    store = LogStore(path)
+    worker.start()
+    while True:
+        kind, payload, _offset = worker.results.get()
+        if kind == "error":
+            raise OSError(payload)
+        store.extend(payload)
+        if kind in ("done", "cancelled"):
+            break
+    worker.join()
+    return len(store)
+
+
+# Mode name -> function(path) returning the number of entries kept. Add new
+# parser modes here to include them in the benchmark.
+MODES: Dict[str, Callable[[str], int]] = {
+    "lines": _mode_lines,
+    "serial": _mode_serial,
+    "store": _mode_store,
+    "parallel": _mode_parallel,
+    "worker": lambda path: _run_worker(path, parallel=False),
+    "worker-parallel": lambda path: _run_worker(path, parallel=True),
+}
+# Modes that need random access into an uncompressed file
+MMAP_MODES = ("parallel", "worker-parallel")
+
+
+def _peak_rss_bytes(who: int) -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_mode(mode: str, path: str) -> Dict[str, Optional[float]]:
+    """Run one mode in this process and return its timing and peak memory."""
+    started = time.perf_counter()
+    entries = MODES[mode](path)
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed": elapsed,
+        "entries": entries,
+        "peak_rss": _peak_rss_bytes(resource.RUSAGE_SELF) if resource else None,
+        "children_peak_rss": _peak_rss_bytes(resource.RUSAGE_CHILDREN) if resource else None,
+    }
+
+
+def count_lines(path: str) -> Tuple[int, int]:
+    """Return (lines, bytes) of the decompressed log."""
+    lines = 0
+    size = 0
+    with open_log(path) as log_file:
+        while True:
+            chunk = log_file.read(WRITE_BLOCK_BYTES)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+    return lines, size
+
+
+def run_benchmark(path: str, modes: List[str], repeat: int = 1) -> Dict[str, Dict[str, Optional[float]]]:
+    """Benchmark each mode in a fresh interpreter so peak RSS is per mode; keep the fastest run."""
+    lines, size = count_lines(path)
+    results: Dict[str, Dict[str, Optional[float]]] = {}
+    for mode in modes:
+        best = None
+        for _attempt in range(repeat):
+            output = subprocess.run(
+                [sys.executable, "-m", "shared.log_bench", "measure", mode, path],
+                cwd=BASE_DIR, check=True, capture_output=True, text=True,
+            ).stdout
+            measured = json.loads(output.strip().splitlines()[-1])
+            if best is None or measured["elapsed"] < best["elapsed"]:
+                best = measured
+        elapsed = best["elapsed"] or 1e-9
+        results[mode] = dict(
+            best,
+            lines_per_sec=lines / elapsed,
+            mb_per_sec=size / elapsed / (1 << 20),
+        )
+    return results
+
+
+def _format_rss(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value / (1 << 20):,.0f} MB"
+
+
+def print_report(path: str, results: Dict[str, Dict[str, Optional[float]]]) -> None:
+    lines, size = count_lines(path)
+    print(f"{path}: {lines:,} lines, {size / (1 << 20):,.1f} MB")
+    print(f"{'mode':<16}{'seconds':>9}{'lines/s':>13}{'MB/s':>9}{'entries':>12}{'peak RSS':>12}{'workers':>10}")
+    for mode, result in results.items():
+        workers = result["children_peak_rss"] if mode in MMAP_MODES else None
+        print(
+            f"{mode:<16}{result['elapsed']:>9.2f}{result['lines_per_sec']:>13,.0f}{result['mb_per_sec']:>9.1f}"
+            f"{result['entries']:>12,}{_format_rss(result['peak_rss']):>12}{_format_rss(workers):>10}"
+        )
+
+
+def compare_results(results: Dict[str, Dict[str, Optional[float]]], baseline: Dict[str, Dict[str, float]],
+                    tolerance: float) -> List[str]:
+    """Return a message for each mode whose lines/sec regressed beyond tolerance."""
+    regressions = []
+    for mode, result in results.items():
+        previous = baseline.get(mode)
+        if not previous:
+            continue
+        floor = previous["lines_per_sec"] * (1 - tolerance)
+        if result["lines_per_sec"] < floor:
+            regressions.append(
+                f"{mode}: {result['lines_per_sec']:,.0f} lines/s is below {floor:,.0f} "
+                f"(baseline {previous['lines_per_sec']:,.0f}, tolerance {tolerance:.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic eqlog corpus and parser benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a synthetic log")
+    generate.add_argument("path", nargs="?", default=DEFAULT_CORPUS_PATH)
+    generate.add_argument("--size", default="64M", help="uncompressed size, e.g. 512M or 2G")
+    generate.add_argument("--seed", type=int, default=0)
+
+    run = commands.add_parser("run", help="benchmark parser modes on a log")
+    run.add_argument("path", nargs="?", default=DEFAULT_CORPUS_PATH)
+    run.add_argument("--modes", default=",".join(MODES), help="comma-separated subset of: " + ", ".join(MODES))
+    run.add_argument("--repeat", type=int, default=1, help="runs per mode; the fastest is kept")
+    run.add_argument("--save", help="write results to this JSON file")
+    run.add_argument("--compare", help="fail if slower than the results in this JSON file")
+    run.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    measure = commands.add_parser("measure", help=argparse.SUPPRESS)
+    measure.add_argument("mode", choices=list(MODES))
+    measure.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        started = time.perf_counter()
+        lines = generate_log(args.path, parse_size(args.size), args.seed)
+        print(f"Wrote {lines:,} lines to {args.path} in {time.perf_counter() - started:.1f}s")
+        return 0
+
+    if args.command == "measure":
+        print(json.dumps(measure_mode(args.mode, args.path)))
+        return 0
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    if os.path.splitext(args.path)[1].lower() in COMPRESSED_OPENERS:
+        modes = [mode for mode in modes if mode not in MMAP_MODES]
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist; create it with the generate command")
+
+    results = run_benchmark(args.path, modes, args.repeat)
+    print_report(args.path, results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare_results(results, json.load(handle), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
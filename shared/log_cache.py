@@ -0,0 +1,303 @@
+"""
+Log Cache - persist parsed eqlog entries in a local SQLite index
+Each file is recorded with its size, mtime, the byte offset parsing reached and
+the parser state at that point. Re-opening an unchanged file reads the index;
+a file that has grown only needs the appended part parsed. Speakers, channels
+and messages are also indexed in an FTS5 table for full-text search.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from shared.log_parser import LogEntry
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_CACHE_PATH = os.path.join(BASE_DIR, "cache", "log_index.db")
+SCHEMA_VERSION = 3
+HEAD_BYTES = 4096
+# Search rows are keyed by file_id << SEARCH_OFFSET_BITS | byte offset
+SEARCH_OFFSET_BITS = 40
+SEARCH_PAGE_SIZE = 100
+
+LOG_FILES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS log_files (
+    file_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    parsed_offset INTEGER NOT NULL,
+    last_keyword TEXT,
+    head_length INTEGER NOT NULL,
+    head_hash TEXT NOT NULL
+);
+"""
+
+LOG_ENTRIES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS log_entries (
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    speaker TEXT NOT NULL,
+    message TEXT NOT NULL,
+    x TEXT,
+    y TEXT,
+    z TEXT,
+    heading TEXT,
+    PRIMARY KEY (file_id, offset)
+) WITHOUT ROWID;
+"""
+
+LOG_SEARCH_TABLE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS log_search USING fts5(
+    speaker,
+    channel,
+    message,
+    tokenize = 'unicode61'
+);
+"""
+
+
+@dataclass
+class CachedLogState:
+    file_id: int
+    parsed_offset: int
+    last_keyword: Optional[str]
+    # Size and mtime match the last parse, so nothing can have been appended
+    unchanged: bool
+
+
+@dataclass
+class SearchHit:
+    path: str
+    offset: int
+    timestamp: str
+    channel: str
+    speaker: str
+    message: str
+    snippet: str
+
+
+@dataclass
+class SearchPage:
+    hits: List[SearchHit]
+    total: int
+    elapsed: float
+
+
+def _search_rowid(file_id: int, offset: int) -> int:
+    return (file_id << SEARCH_OFFSET_BITS) | offset
+
+
+def _head_hash(path: str, length: int) -> str:
+    with open(path, "rb") as log_file:
+        return hashlib.sha1(log_file.read(length)).hexdigest()
+
+
+class LogIndexCache:
+    """SQLite index of parsed log entries. Use one instance per thread."""
+
+    def __init__(self, db_path: str = LOG_CACHE_PATH) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode = WAL;")
+        self._connection.execute("PRAGMA synchronous = NORMAL;")
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version;").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS log_search;")
+            self._connection.execute("DROP TABLE IF EXISTS log_entries;")
+            self._connection.execute("DROP TABLE IF EXISTS log_files;")
+        self._connection.execute(LOG_FILES_TABLE_SQL)
+        self._connection.execute(LOG_ENTRIES_TABLE_SQL)
+        self._connection.execute(LOG_SEARCH_TABLE_SQL)
+        self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        self._connection.commit()
+
+    # ------------------------------------------------------------------
+    # File state
+    # ------------------------------------------------------------------
+    def resume_state(self, path: str) -> Optional[CachedLogState]:
+        """Return where parsing of path can resume, or None to parse from the start.
+
+        An unchanged size and mtime is trusted as is. Otherwise the file must
+        not have shrunk below the parsed offset and its first bytes must still
+        match, so a rotated or replaced log is not mistaken for a grown one.
+        """
+        path = os.path.abspath(path)
+        row = self._connection.execute(
+            "SELECT file_id, size, mtime_ns, parsed_offset, last_keyword, head_length, head_hash "
+            "FROM log_files WHERE path = ?",
+            (path,),
+        ).fetchone()
+        if row is None:
+            return None
+        file_id, size, mtime_ns, parsed_offset, last_keyword, head_length, head_hash = row
+
+        stat = os.stat(path)
+        unchanged = stat.st_size == size and stat.st_mtime_ns == mtime_ns
+        if not unchanged:
+            if stat.st_size < parsed_offset or _head_hash(path, head_length) != head_hash:
+                self.forget(path)
+                return None
+
+        return CachedLogState(file_id, parsed_offset, last_keyword, unchanged)
+
+    def begin_file(self, path: str) -> int:
+        """Start a fresh index for path and return its file id."""
+        path = os.path.abspath(path)
+        self.forget(path)
+        cursor = self._connection.execute(
+            "INSERT INTO log_files(path, size, mtime_ns, parsed_offset, last_keyword, head_length, head_hash) "
+            "VALUES(?, 0, 0, 0, NULL, 0, ?)",
+            (path, hashlib.sha1(b"").hexdigest()),
+        )
+        self._connection.commit()
+        return cursor.lastrowid
+
+    def mark_parsed(self, file_id: int, path: str, parsed_offset: int, last_keyword: Optional[str],
+                    record_stat: bool = True) -> None:
+        """Record how far path has been parsed and commit the entries added since the last call.
+
+        With record_stat False the file's size and mtime are left as they were,
+        so resume_state does not treat a partly parsed archive as unchanged.
+        """
+        if not record_stat:
+            self._connection.execute(
+                "UPDATE log_files SET parsed_offset = ?, last_keyword = ? WHERE file_id = ?",
+                (parsed_offset, last_keyword, file_id),
+            )
+            self._connection.commit()
+            return
+        stat = os.stat(path)
+        head_length = min(stat.st_size, HEAD_BYTES)
+        self._connection.execute(
+            "UPDATE log_files SET size = ?, mtime_ns = ?, parsed_offset = ?, last_keyword = ?, "
+            "head_length = ?, head_hash = ? WHERE file_id = ?",
+            (stat.st_size, stat.st_mtime_ns, parsed_offset, last_keyword,
+             head_length, _head_hash(path, head_length), file_id),
+        )
+        self._connection.commit()
+
+    def forget(self, path: str) -> None:
+        path = os.path.abspath(path)
+        row = self._connection.execute("SELECT file_id FROM log_files WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            self._connection.execute("DELETE FROM log_entries WHERE file_id = ?", (row[0],))
+            self._connection.execute(
+                "DELETE FROM log_search WHERE rowid >= ? AND rowid < ?",
+                (_search_rowid(row[0], 0), _search_rowid(row[0] + 1, 0)),
+            )
+            self._connection.execute("DELETE FROM log_files WHERE file_id = ?", (row[0],))
+            self._connection.commit()
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+    def add_entries(self, file_id: int, parsed: Iterable[Tuple[str, LogEntry]]) -> None:
+        """Stage entries for file_id and their search rows; they are committed by mark_parsed."""
+        rows = []
+        search_rows = []
+        for keyword, entry in parsed:
+            x_val, y_val, z_val, h_val = entry.coordinates or (None, None, None, None)
+            rows.append((
+                file_id, entry.offset, keyword, entry.timestamp, entry.channel,
+                entry.speaker, entry.message, x_val, y_val, z_val, h_val,
+            ))
+            search_rows.append((_search_rowid(file_id, entry.offset), entry.speaker, entry.channel, entry.message))
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO log_entries"
+            "(file_id, offset, keyword, timestamp, channel, speaker, message, x, y, z, heading) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO log_search(rowid, speaker, channel, message) VALUES(?, ?, ?, ?)",
+            search_rows,
+        )
+
+    def iter_entries(self, file_id: int, batch_size: int = 5000) -> Iterator[List[Tuple[str, LogEntry]]]:
+        """Yield the cached (keyword, entry) pairs for file_id in file order, in batches."""
+        cursor = self._connection.execute(
+            "SELECT keyword, timestamp, channel, speaker, message, offset, x, y, z, heading "
+            "FROM log_entries WHERE file_id = ? ORDER BY offset",
+            (file_id,),
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [
+                (keyword, LogEntry(
+                    timestamp=timestamp,
+                    channel=channel,
+                    speaker=speaker,
+                    message=message,
+                    offset=offset,
+                    coordinates=(x_val, y_val, z_val, h_val) if x_val is not None else None,
+                ))
+                for keyword, timestamp, channel, speaker, message, offset, x_val, y_val, z_val, h_val in rows
+            ]
+
+    # ------------------------------------------------------------------
+    # Full-text search
+    # ------------------------------------------------------------------
+    def file_ids(self, paths: Sequence[str]) -> List[int]:
+        """Return the ids of the indexed files among paths."""
+        found = []
+        for path in paths:
+            row = self._connection.execute(
+                "SELECT file_id FROM log_files WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+            if row is not None:
+                found.append(row[0])
+        return found
+
+    def search(self, query: str, file_ids: Optional[Sequence[int]] = None,
+               limit: int = SEARCH_PAGE_SIZE, offset: int = 0) -> SearchPage:
+        """Run an FTS5 query and return one page of hits, best match first.
+
+        query uses FTS5 syntax: words, "quoted phrases", prefix*, AND/OR/NOT
+        and column filters such as speaker:name. file_ids limits the search to
+        those files; None searches every indexed file. Malformed queries raise
+        sqlite3.OperationalError.
+        """
+        started = time.perf_counter()
+        conditions = "log_search MATCH ?"
+        params: List = [query]
+        if file_ids is not None:
+            if not file_ids:
+                return SearchPage([], 0, 0.0)
+            # One rowid range per file keeps the scan inside the index
+            ranges = " OR ".join("(s.rowid >= ? AND s.rowid < ?)" for _ in file_ids)
+            conditions += f" AND ({ranges})"
+            for file_id in file_ids:
+                params.extend((_search_rowid(file_id, 0), _search_rowid(file_id + 1, 0)))
+
+        total = self._connection.execute(
+            f"SELECT COUNT(*) FROM log_search AS s WHERE {conditions}", params
+        ).fetchone()[0]
+        rows = self._connection.execute(
+            "SELECT f.path, e.offset, e.timestamp, e.channel, e.speaker, e.message, "
+            "snippet(log_search, 2, '[', ']', '...', 16) "
+            f"FROM log_search AS s "
+            f"JOIN log_entries AS e ON e.file_id = s.rowid >> {SEARCH_OFFSET_BITS} "
+            f"AND e.offset = s.rowid & {(1 << SEARCH_OFFSET_BITS) - 1} "
+            "JOIN log_files AS f ON f.file_id = e.file_id "
+            f"WHERE {conditions} ORDER BY s.rank LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        return SearchPage([SearchHit(*row) for row in rows], total, time.perf_counter() - started)
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    def close(self) -> None:
+        self._connection.close()
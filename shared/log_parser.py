@@ -0,0 +1,504 @@
+"""
+Log Parser - headless parsing of EverQuest client logs (eqlog_*.txt)
+Files are read in buffered binary chunks and parsed line by line, so memory
+is bounded by the number of matching entries rather than the file size.
+Archived logs (.gz, .bz2) are decompressed incrementally as they are read;
+their offsets count decompressed bytes.
+LogParseWorker runs the same stream on a background thread for the Logs tab.
+"""
+import bz2
+import calendar
+import gc
+import gzip
+import mmap
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+Coordinates = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+LOG_LINE_RE = re.compile(r"^\[(?P<timestamp>.*?)\]\s+(?P<content>.*)$")
+QUOTED_MESSAGE_RE = re.compile(r"^(?P<prefix>[^']*)'(?P<message>.*)'$")
+LOCATION_RE = re.compile(
+    r"Your Location is\s+(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)(?:,\s*(-?\d+(?:\.\d+)?))?",
+    re.IGNORECASE,
+)
+LOCATION_FOR_RE = re.compile(
+    r"Location for .*?\|\s*XYZ:\s*(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)(?:\s*Heading:\s*(-?\d+(?:\.\d+)?))?",
+    re.IGNORECASE,
+)
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_BATCH_SIZE = 2000
+PARALLEL_MIN_BYTES = 16 << 20
+PARALLEL_CHUNK_BYTES = 8 << 20
+BATCH_INTERVAL_SECONDS = 0.1
+LOG_FILE_PREFIX = "eqlog_"
+COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open}
+LOG_FILE_SUFFIXES = (".txt",) + tuple(COMPRESSED_OPENERS)
+
+
+@dataclass
+class LogEntry:
+    timestamp: str
+    channel: str
+    speaker: str
+    message: str
+    offset: int
+    coordinates: Optional[Coordinates]
+
+
+MONTHS = {
+    name: index for index, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1
+    )
+}
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_timestamp(timestamp: str) -> Optional[int]:
+    """Convert a log timestamp ("Mon Oct 19 12:34:56 2026") to seconds since the epoch.
+
+    Log times are local wall-clock times with no zone; they are treated as UTC
+    so values compare consistently without depending on the machine's zone.
+    """
+    parts = timestamp.split()
+    if len(parts) != 5:
+        return None
+    month = MONTHS.get(parts[1])
+    clock = parts[3].split(":")
+    if month is None or len(clock) != 3:
+        return None
+    try:
+        return calendar.timegm((int(parts[4]), month, int(parts[2]), int(clock[0]), int(clock[1]), int(clock[2])))
+    except ValueError:
+        return None
+
+
+def is_log_file_name(filename: str) -> bool:
+    """Whether filename looks like a client log, plain (eqlog_*.txt) or archived (.gz, .bz2)."""
+    lower_name = os.path.basename(filename).lower()
+    return lower_name.startswith(LOG_FILE_PREFIX) and lower_name.endswith(LOG_FILE_SUFFIXES)
+
+
+def is_compressed(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COMPRESSED_OPENERS
+
+
+def open_log(path: str) -> BinaryIO:
+    """Open a log for binary reading, decompressing archives as a stream."""
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(path)[1].lower(), open)
+    return opener(path, "rb")
+
+
+def log_data_size(path: str) -> int:
+    """Return the number of bytes offsets into path run up to, or 0 if unknown.
+
+    For gzip this is the size stored in the trailer (modulo 4 GiB and of the
+    last member only, so it is an estimate); bz2 does not record it.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".bz2":
+        return 0
+    if extension == ".gz":
+        with open(path, "rb") as archive:
+            archive.seek(-4, os.SEEK_END)
+            return int.from_bytes(archive.read(4), "little")
+    return os.path.getsize(path)
+
+
+def log_character_name(filename: str) -> str:
+    """Return the character name from an eqlog_<Name>_<server>.txt file name."""
+    stem = os.path.basename(filename)
+    stem = stem[len("eqlog_"):] if stem.lower().startswith("eqlog_") else stem
+    return stem.split("_", 1)[0].split(".", 1)[0]
+
+
+def parse_prefix(prefix: str) -> Tuple[str, str]:
+    """Split the text before a quoted message into (channel, speaker)."""
+    if not prefix:
+        return "", ""
+
+    parts = prefix.split(None, 1)
+    speaker = parts[0] if parts else ""
+    channel = prefix
+    return channel, speaker
+
+
+def extract_coordinates(text: str) -> Optional[Coordinates]:
+    """Take the first three (or four) numbers in text as X, Y, Z and heading."""
+    numbers = NUMBER_RE.findall(text)
+    if len(numbers) >= 3:
+        h_val = numbers[3] if len(numbers) >= 4 else None
+        return (numbers[0], numbers[1], numbers[2], h_val)
+    return None
+
+
+class LogParser:
+    """Line parser that groups quoted messages by their first word.
+
+    /loc output has no keyword of its own, so it is attached to the keyword of
+    the last quoted message; that state is carried between parse_line calls.
+    """
+
+    def __init__(self, last_keyword_for_loc: Optional[str] = None) -> None:
+        self.last_keyword_for_loc = last_keyword_for_loc
+
+    def parse_line(self, raw_line: str, offset: int = 0) -> Optional[Tuple[str, LogEntry]]:
+        """Return (keyword, entry) for a matching line, or None.
+
+        offset is the line's byte position in the file; entries keep it instead
+        of the raw text, which read_log_line can fetch again when needed.
+        """
+        line = raw_line.strip()
+        if not line:
+            return None
+
+        log_match = LOG_LINE_RE.match(line)
+        if not log_match:
+            return None
+
+        timestamp = log_match.group("timestamp")
+        content = log_match.group("content")
+
+        message_match = QUOTED_MESSAGE_RE.match(content)
+        if message_match:
+            prefix = message_match.group("prefix").strip()
+            prefix = prefix[:-1].strip() if prefix.endswith(",") else prefix
+            message = message_match.group("message").strip()
+            if not message:
+                return None
+
+            keyword = message.split()[0].lower()
+            self.last_keyword_for_loc = keyword
+
+            channel, speaker = parse_prefix(prefix)
+            entry = LogEntry(
+                timestamp=timestamp,
+                channel=channel,
+                speaker=speaker,
+                message=message,
+                offset=offset,
+                # Only the message: the timestamp's digits are not a location
+                coordinates=extract_coordinates(message),
+            )
+            return keyword, entry
+
+        # Handle /loc style output if we have a last keyword to attach it to
+        if not self.last_keyword_for_loc:
+            return None
+
+        loc_match = LOCATION_RE.search(content) or LOCATION_FOR_RE.search(content)
+        if loc_match:
+            coordinates = loc_match.groups()
+        else:
+            coordinates = None
+            system_message = content.lower()
+            if "location" in system_message or "heading" in system_message or "xyz" in system_message:
+                coordinates = extract_coordinates(content)
+
+        if not coordinates:
+            return None
+
+        entry = LogEntry(
+            timestamp=timestamp,
+            channel="System",
+            speaker="",
+            message=content,
+            offset=offset,
+            coordinates=coordinates,
+        )
+        return self.last_keyword_for_loc, entry
+
+
+def _split_lines(data: bytes, base_offset: int) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield (start, end, line bytes) for each newline-terminated line in data."""
+    start = 0
+    while True:
+        newline = data.find(b"\n", start)
+        if newline < 0:
+            return
+        yield base_offset + start, base_offset + newline + 1, data[start:newline]
+        start = newline + 1
+
+
+def iter_log_lines(path: str, start_offset: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   include_partial: bool = True) -> Iterator[Tuple[int, int, str]]:
+    """Yield (start offset, end offset, decoded line) for each line, reading fixed-size chunks.
+
+    The end offset is just past the newline, i.e. where the next read should
+    resume. A trailing line without a newline is only yielded when
+    include_partial is set, since a file being written may not have finished it.
+    Archives are decompressed one chunk at a time, never as a whole.
+    """
+    with open_log(path) as log_file:
+        log_file.seek(start_offset)
+        offset = start_offset
+        pending = b""
+        while True:
+            chunk = log_file.read(chunk_size)
+            if not chunk:
+                break
+            data = pending + chunk
+            data_offset = offset
+            for line_start, line_end, line in _split_lines(data, data_offset):
+                yield line_start, line_end, line.decode("utf-8", errors="ignore")
+                offset = line_end
+            pending = data[offset - data_offset:]
+        if pending and include_partial:
+            yield offset, offset + len(pending), pending.decode("utf-8", errors="ignore")
+
+
+# Stands in for the keyword carried over from the previous chunk. Parse results
+# are compared by identity, so no real keyword can be mistaken for it.
+_CARRIED_KEYWORD = "\x00carried"
+
+# (keywords, timestamps, channels, speakers, messages, offsets, coordinates)
+ChunkColumns = Tuple[list, list, list, list, list, list, list]
+
+
+@contextmanager
+def _gc_paused():
+    """Suspend cyclic garbage collection while building many small acyclic objects."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _parse_chunk(path: str, start: int, end: int) -> Tuple[ChunkColumns, int, Optional[str]]:
+    """Parse bytes [start, end) of a log in a worker process.
+
+    Returns (columns, leading, last_keyword). Entries come back as plain
+    column lists, which pickle far faster than LogEntry objects. The first
+    `leading` entries are /loc lines seen before the chunk's first quoted
+    message; their keyword is None because it depends on earlier chunks.
+    """
+    with open(path, "rb") as log_file:
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = mapped[start:end]
+
+    parser = LogParser(_CARRIED_KEYWORD)
+    columns: ChunkColumns = ([], [], [], [], [], [], [])
+    keywords, timestamps, channels, speakers, messages, offsets, coordinates = columns
+    leading = 0
+    with _gc_paused():
+        for line_start, _line_end, line in _split_lines(data, start):
+            parsed = parser.parse_line(line.decode("utf-8", errors="ignore"), line_start)
+            if parsed is None:
+                continue
+            keyword, entry = parsed
+            if keyword is _CARRIED_KEYWORD:
+                keyword = None
+                leading += 1
+            keywords.append(keyword)
+            timestamps.append(entry.timestamp)
+            channels.append(entry.channel)
+            speakers.append(entry.speaker)
+            messages.append(entry.message)
+            offsets.append(entry.offset)
+            coordinates.append(entry.coordinates)
+    last_keyword = parser.last_keyword_for_loc
+    return columns, leading, None if last_keyword is _CARRIED_KEYWORD else last_keyword
+
+
+def chunk_boundaries(path: str, start: int, end: int,
+                     chunk_bytes: int = PARALLEL_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Split [start, end) into ranges of about chunk_bytes that end on a newline."""
+    ranges = []
+    with open(path, "rb") as log_file:
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start
+            while position < end:
+                boundary = min(position + chunk_bytes, end)
+                if boundary < end:
+                    newline = mapped.find(b"\n", boundary, end)
+                    boundary = end if newline < 0 else newline + 1
+                ranges.append((position, boundary))
+                position = boundary
+    return ranges
+
+
+def parse_file_parallel(path: str, start: int, end: int, last_keyword: Optional[str] = None,
+                        workers: Optional[int] = None,
+                        chunk_bytes: int = PARALLEL_CHUNK_BYTES) -> Iterator[Tuple[List[Tuple[str, LogEntry]], int, Optional[str]]]:
+    """Parse [start, end) of a log across a process pool.
+
+    end should fall just after a newline. Yields (entries, chunk end offset,
+    last keyword) per chunk in file order. Leading /loc entries of a chunk
+    take the keyword carried from the chunks before it, so the result is the
+    same as a single LogParser reading the range from start with last_keyword.
+    """
+    ranges = chunk_boundaries(path, start, end, chunk_bytes)
+    pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+    try:
+        futures = [pool.submit(_parse_chunk, path, chunk_start, chunk_end) for chunk_start, chunk_end in ranges]
+        for (_chunk_start, chunk_end), future in zip(ranges, futures):
+            columns, leading, chunk_keyword = future.result()
+            keywords, timestamps, channels, speakers, messages, offsets, coordinates = columns
+            with _gc_paused():
+                batch = [
+                    (keyword or last_keyword, LogEntry(timestamp, channel, speaker, message, offset, coords))
+                    for keyword, timestamp, channel, speaker, message, offset, coords in zip(
+                        keywords, timestamps, channels, speakers, messages, offsets, coordinates
+                    )
+                ]
+            if not last_keyword:
+                # Nothing to attach the chunk's leading /loc lines to
+                del batch[:leading]
+            if chunk_keyword is not None:
+                last_keyword = chunk_keyword
+            yield batch, chunk_end, last_keyword
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def read_log_line(path: str, offset: int) -> str:
+    """Return the stripped line starting at a byte offset (decompressed, for archives)."""
+    with open_log(path) as log_file:
+        log_file.seek(offset)
+        return log_file.readline().decode("utf-8", errors="ignore").strip()
+
+
+class LogParseWorker(threading.Thread):
+    """Parse a log file on a background thread and publish batches through a queue.
+
+    Messages are (kind, entries, offset) tuples where kind is "batch", "done",
+    "cancelled" or "error" (entries is then the error text). offset is the
+    byte position parsing reached, so a later pass can resume from it.
+
+    With use_cache, entries already in the log index are replayed first and
+    only the rest of the file is parsed; new entries are written back.
+    """
+
+    def __init__(self, path: str, parser: Optional[LogParser] = None, include_partial: bool = True,
+                 use_cache: bool = True, parallel: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        super().__init__(daemon=True)
+        self.path = path
+        self.parser = parser or LogParser()
+        self.include_partial = include_partial
+        self.use_cache = use_cache
+        self.parallel = parallel
+        self.batch_size = batch_size
+        self.file_id: Optional[int] = None
+        self.results: "queue.Queue[Tuple[str, object, int]]" = queue.Queue()
+        self.cancel_event = threading.Event()
+        # Archives are never appended to, so their last line is complete
+        self.compressed = is_compressed(path)
+        try:
+            self.total_bytes = log_data_size(path)
+        except OSError:
+            self.total_bytes = 0
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def run(self) -> None:
+        cache = None
+        if self.use_cache:
+            from shared.log_cache import LogIndexCache
+            try:
+                cache = LogIndexCache()
+            except (OSError, sqlite3.Error) as exc:
+                print(f"Warning: log index unavailable: {exc}")
+
+        try:
+            self._run(cache)
+        except (OSError, sqlite3.Error) as err:
+            if cache is not None:
+                cache.rollback()
+            self.results.put(("error", str(err), 0))
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def _run(self, cache) -> None:
+        offset = 0
+        if cache is not None:
+            state = cache.resume_state(self.path)
+            if state is None:
+                self.file_id = cache.begin_file(self.path)
+            else:
+                self.file_id = state.file_id
+                offset = state.parsed_offset
+                self.parser.last_keyword_for_loc = state.last_keyword
+                for cached in cache.iter_entries(state.file_id, self.batch_size):
+                    if self.cancel_event.is_set():
+                        self.results.put(("cancelled", [], 0))
+                        return
+                    self.results.put(("batch", cached, offset))
+                if self.compressed and state.unchanged:
+                    # Archives are never appended to; reading on would decompress the whole
+                    # file again only to reach the parsed offset and find nothing new
+                    self.results.put(("done", [], offset))
+                    return
+
+        def flush(kind: str, batch: List[Tuple[str, LogEntry]]) -> None:
+            if cache is not None:
+                # Commit every batch with the offset it reached, so the write lock is held only
+                # briefly and other workers sharing the index are not starved until this file ends
+                cache.add_entries(self.file_id, batch)
+                # An archive is only recorded as unchanged once it has been read to the end
+                cache.mark_parsed(self.file_id, self.path, offset, self.parser.last_keyword_for_loc,
+                                  record_stat=kind == "done" or not self.compressed)
+            self.results.put((kind, batch, offset))
+
+        if self.parallel and not self.compressed and self.total_bytes - offset >= PARALLEL_MIN_BYTES:
+            with open(self.path, "rb") as log_file:
+                with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    complete_end = mapped.rfind(b"\n", offset) + 1
+            if complete_end > offset:
+                chunks = parse_file_parallel(self.path, offset, complete_end, self.parser.last_keyword_for_loc)
+                try:
+                    for batch, chunk_end, keyword in chunks:
+                        if self.cancel_event.is_set():
+                            flush("cancelled", [])
+                            return
+                        offset = chunk_end
+                        self.parser.last_keyword_for_loc = keyword
+                        flush("batch", batch)
+                finally:
+                    chunks.close()
+
+        batch: List[Tuple[str, LogEntry]] = []
+        last_flush = time.monotonic()
+        for start, end, line in iter_log_lines(self.path, offset, include_partial=self.compressed):
+            if self.cancel_event.is_set():
+                flush("cancelled", batch)
+                return
+            parsed = self.parser.parse_line(line, start)
+            offset = end
+            if parsed is not None:
+                batch.append(parsed)
+            now = time.monotonic()
+            if len(batch) >= self.batch_size or (batch and now - last_flush >= BATCH_INTERVAL_SECONDS):
+                flush("batch", batch)
+                batch = []
+                last_flush = now
+
+        # An unterminated last line is shown but neither cached nor counted as
+        # parsed, so the next pass reads it again once the client finishes it.
+        if self.include_partial and not self.compressed and offset < os.path.getsize(self.path):
+            keyword = self.parser.last_keyword_for_loc
+            if cache is not None:
+                cache.add_entries(self.file_id, batch)
+                cache.mark_parsed(self.file_id, self.path, offset, keyword)
+                cache = None
+            parsed = self.parser.parse_line(read_log_line(self.path, offset), offset)
+            if parsed is not None:
+                batch.append(parsed)
+            self.parser.last_keyword_for_loc = keyword
+        flush("done", batch)
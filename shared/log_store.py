@@ -0,0 +1,316 @@
+"""
+Log Store - columnar storage for parsed log entries
+Entries from one log file are kept as parallel arrays instead of one object
+per entry: keywords, channels and speakers are interned, timestamps are epoch
+seconds, coordinates are packed floats and messages share one UTF-8 buffer.
+Raw lines are not kept; read_log_line fetches them by offset.
+"""
+import heapq
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import islice, repeat
+from operator import floordiv
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from shared.log_parser import Coordinates, LogEntry, parse_timestamp
+
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Entry references pack (store index, row) into one int
+REF_SHIFT = 32
+ROW_MASK = (1 << REF_SHIFT) - 1
+
+
+@lru_cache(maxsize=1 << 16)
+def format_timestamp(epoch: int) -> str:
+    """Inverse of parse_timestamp, in the client's "Mon Oct 19 12:34:56 2026" form."""
+    days, seconds = divmod(epoch, 86400)
+    # 1970-01-01 was a Thursday
+    weekday = (days + 3) % 7
+    year, month, day = _civil_from_days(days)
+    hour, remainder = divmod(seconds, 3600)
+    minute, second = divmod(remainder, 60)
+    return (
+        f"{DAY_NAMES[weekday]} {MONTH_NAMES[month - 1]} {day:02d} "
+        f"{hour:02d}:{minute:02d}:{second:02d} {year}"
+    )
+
+
+def _civil_from_days(days: int) -> Tuple[int, int, int]:
+    """Convert days since 1970-01-01 to (year, month, day) in the proleptic Gregorian calendar."""
+    days += 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = month_index + 3 if month_index < 10 else month_index - 9
+    year = year_of_era + era * 400 + (1 if month <= 2 else 0)
+    return year, month, day
+
+
+def format_coordinate(value: float) -> str:
+    """Format a stored coordinate the way it is typed into the client (no trailing .0)."""
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def make_ref(store_index: int, row: int) -> int:
+    return (store_index << REF_SHIFT) | row
+
+
+def split_ref(ref: int) -> Tuple[int, int]:
+    return ref >> REF_SHIFT, ref & ROW_MASK
+
+
+class StringPool:
+    """Intern table mapping repeated strings to small integer ids."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self.values.append(value)
+            self.ids[value] = string_id
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.values[string_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class TextColumn:
+    """Variable-length strings packed as UTF-8 into a single buffer."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.ends = array("Q")
+
+    def append(self, text: str) -> None:
+        self.data += text.encode("utf-8")
+        self.ends.append(len(self.data))
+
+    def __getitem__(self, index: int) -> str:
+        return self.raw(index).decode("utf-8")
+
+    def raw(self, index: int) -> bytes:
+        start = self.ends[index - 1] if index else 0
+        return self.data[start:self.ends[index]]
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+
+class LogStore:
+    """Parsed entries of one log file, stored column by column and addressed by row number."""
+
+    def __init__(self, path: str = "") -> None:
+        self.path = path
+        self.strings = StringPool()
+        self.keyword_ids = array("I")
+        self.channel_ids = array("I")
+        self.speaker_ids = array("I")
+        self.epochs = array("q")
+        # Rows whose timestamp text does not round-trip through epochs
+        self.timestamp_text: Dict[int, str] = {}
+        self.messages = TextColumn()
+        # Lowercased "timestamp channel speaker message" per row for the entry filter
+        self.search_keys = TextColumn()
+        self.offsets = array("q")
+        # x, y, z, heading per row; NaN where a value is absent
+        self.coordinates = array("d")
+        self.keyword_rows: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def append(self, keyword: str, entry: LogEntry) -> int:
+        """Add an entry and return its row number."""
+        row = len(self.offsets)
+        keyword_id = self.strings.intern(keyword)
+        self.keyword_ids.append(keyword_id)
+        self.channel_ids.append(self.strings.intern(entry.channel))
+        self.speaker_ids.append(self.strings.intern(entry.speaker))
+
+        epoch = parse_timestamp(entry.timestamp)
+        if epoch is None:
+            # Keep file order for sorting by reusing the previous time
+            epoch = self.epochs[-1] if self.epochs else 0
+            self.timestamp_text[row] = entry.timestamp
+        elif format_timestamp(epoch) != entry.timestamp:
+            self.timestamp_text[row] = entry.timestamp
+        self.epochs.append(epoch)
+
+        self.messages.append(entry.message)
+        self.search_keys.append(
+            f"{entry.timestamp} {entry.channel} {entry.speaker} {entry.message}".lower()
+        )
+        self.offsets.append(entry.offset)
+        self.coordinates.extend(_pack_coordinates(entry.coordinates))
+
+        rows = self.keyword_rows.get(keyword)
+        if rows is None:
+            rows = self.keyword_rows[self.strings[keyword_id]] = array("I")
+        rows.append(row)
+        return row
+
+    def extend(self, parsed: Iterable[Tuple[str, LogEntry]]) -> range:
+        """Add (keyword, entry) pairs and return the range of new rows."""
+        start = len(self.offsets)
+        for keyword, entry in parsed:
+            self.append(keyword, entry)
+        return range(start, len(self.offsets))
+
+    # ------------------------------------------------------------------
+    # Row accessors
+    # ------------------------------------------------------------------
+    def keyword(self, row: int) -> str:
+        return self.strings[self.keyword_ids[row]]
+
+    def timestamp(self, row: int) -> str:
+        text = self.timestamp_text.get(row)
+        return text if text is not None else format_timestamp(self.epochs[row])
+
+    def channel(self, row: int) -> str:
+        return self.strings[self.channel_ids[row]]
+
+    def speaker(self, row: int) -> str:
+        return self.strings[self.speaker_ids[row]]
+
+    def message(self, row: int) -> str:
+        return self.messages[row]
+
+    def matches_text(self, row: int, needle: bytes) -> bool:
+        """Whether the row's search key contains needle (lowercased UTF-8)."""
+        return needle in self.search_keys.raw(row)
+
+    def string_ids_matching(self, text: str) -> set:
+        """Return the ids of interned strings whose lowercased value contains text.
+
+        The pool is small (keywords, channels and speakers), so testing
+        speaker_ids[row] against this set is far cheaper than lowercasing
+        every row's speaker.
+        """
+        return {string_id for string_id, value in enumerate(self.strings.values) if text in value.lower()}
+
+    def coordinates_at(self, row: int) -> Optional[Coordinates]:
+        """Return the row's (x, y, z, heading) as text, or None when it has none."""
+        base = row * 4
+        values = self.coordinates[base:base + 4]
+        if math.isnan(values[0]):
+            return None
+        return tuple(None if math.isnan(value) else format_coordinate(value) for value in values)
+
+    def entry(self, row: int) -> LogEntry:
+        """Materialise a row as a LogEntry."""
+        return LogEntry(
+            timestamp=self.timestamp(row),
+            channel=self.channel(row),
+            speaker=self.speaker(row),
+            message=self.message(row),
+            offset=self.offsets[row],
+            coordinates=self.coordinates_at(row),
+        )
+
+
+_NO_COORDINATES = (math.nan, math.nan, math.nan, math.nan)
+
+
+def _pack_coordinates(coordinates: Optional[Coordinates]) -> Sequence[float]:
+    if not coordinates:
+        return _NO_COORDINATES
+    try:
+        return tuple(math.nan if value is None else float(value) for value in coordinates)
+    except ValueError:
+        return _NO_COORDINATES
+
+
+def merge_keyword_rows(stores: Sequence[LogStore], keyword: str) -> array:
+    """K-way merge one keyword's rows from several stores into time order as entry references.
+
+    Each store's rows are already in file order. Ties keep store order.
+    """
+    def keyed(store_index: int, store: LogStore) -> Iterator[Tuple[int, int]]:
+        epochs = store.epochs
+        base = store_index << REF_SHIFT
+        for row in store.keyword_rows.get(keyword, ()):
+            yield epochs[row], base | row
+
+    runs = [keyed(index, store) for index, store in enumerate(stores) if keyword in store.keyword_rows]
+    if len(runs) == 1:
+        return array("Q", (ref for _epoch, ref in runs[0]))
+    return array("Q", (ref for _epoch, ref in heapq.merge(*runs, key=lambda item: item[0])))
+
+
+class TimeIndex:
+    """Entry references sorted by time, with a parallel epoch array for binary search."""
+
+    def __init__(self, refs: array, epochs: array) -> None:
+        self.refs = refs
+        self.epochs = epochs
+
+    @classmethod
+    def build(cls, stores: Sequence[LogStore], refs: Iterable[int]) -> "TimeIndex":
+        """Index refs by time. Already-ordered input (the usual case) is kept as is."""
+        refs = array("Q", refs)
+        epochs = array("q", (stores[ref >> REF_SHIFT].epochs[ref & ROW_MASK] for ref in refs))
+        if any(earlier > later for earlier, later in zip(epochs, islice(epochs, 1, None))):
+            # Clock changes can step wall-clock log times backwards; sort stably
+            order = sorted(range(len(refs)), key=epochs.__getitem__)
+            refs = array("Q", (refs[i] for i in order))
+            epochs = array("q", (epochs[i] for i in order))
+        return cls(refs, epochs)
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def extend(self, stores: Sequence[LogStore], refs: Iterable[int]) -> bool:
+        """Append refs that are no older than the newest indexed entry.
+
+        Returns False, leaving the index unchanged, when they would break time
+        order; the caller should rebuild instead.
+        """
+        refs = array("Q", refs)
+        epochs = array("q", (stores[ref >> REF_SHIFT].epochs[ref & ROW_MASK] for ref in refs))
+        joined = self.epochs[-1:] + epochs
+        if any(earlier > later for earlier, later in zip(joined, islice(joined, 1, None))):
+            return False
+        self.refs.extend(refs)
+        self.epochs.extend(epochs)
+        return True
+
+    def bounds(self, start: Optional[int] = None, end: Optional[int] = None) -> slice:
+        """Return the slice covering start <= epoch <= end; either bound may be None."""
+        low = 0 if start is None else bisect_left(self.epochs, start)
+        high = len(self.epochs) if end is None else bisect_right(self.epochs, end)
+        return slice(low, high)
+
+    def window(self, start: Optional[int] = None, end: Optional[int] = None) -> array:
+        return self.refs[self.bounds(start, end)]
+
+    def window_epochs(self, start: Optional[int] = None, end: Optional[int] = None) -> array:
+        return self.epochs[self.bounds(start, end)]
+
+    @property
+    def last_epoch(self) -> Optional[int]:
+        return self.epochs[-1] if self.epochs else None
+
+
+def histogram(epochs: Iterable[int], bucket_seconds: int) -> List[Tuple[int, int]]:
+    """Count entries per bucket (e.g. 60 for minutes) and return sorted (bucket start, count) pairs.
+
+    The bucketing and counting run inside map() and Counter, so the pass over
+    the epochs happens in C rather than a Python loop.
+    """
+    counts = Counter(map(floordiv, epochs, repeat(bucket_seconds)))
+    return [(bucket * bucket_seconds, count) for bucket, count in sorted(counts.items())]
@@ -0,0 +1,90 @@
+"""
+Lookup Service - in-memory zone, class, race and deity names
+The notes.db lookup tables are read once per process into dicts (falling back
+to the lookup_data seeds), so tools resolve ids to names while building rows
+instead of querying SQLite for every row.
+"""
+from typing import Callable, Dict, List, Optional
+
+from lookup_data import (
+    class_lookup as CLASS_LOOKUP_SEED,
+    deity_lookup as DEITY_LOOKUP_SEED,
+    race_lookup as RACE_LOOKUP_SEED,
+    zone_lookup as ZONE_LOOKUP_SEED,
+)
+
+
+def _rows_with_fallback(fetch_fn: Callable[[], List[Dict]], seed_rows: List[Dict], entity: str) -> List[Dict]:
+    try:
+        rows = fetch_fn()
+    except Exception as exc:
+        print(f"Warning: failed to load {entity} from notes.db ({exc}); falling back to seed data.")
+        rows = []
+    return rows or seed_rows
+
+
+class LookupService:
+    """Id to name maps for zones, classes, races and deities."""
+
+    def __init__(self, notes_db) -> None:
+        self.notes_db = notes_db
+        self.zones: Dict[int, Dict] = {}
+        self.class_rows: List[Dict] = []
+        self.race_rows: List[Dict] = []
+        self.deity_rows: List[Dict] = []
+        self.class_names: Dict[int, str] = {}
+        self.race_names: Dict[int, str] = {}
+        self.deity_names: Dict[int, str] = {}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)read every lookup table."""
+        zone_rows = _rows_with_fallback(
+            self.notes_db.get_all_zones,
+            [{'short_name': short_name, **data} for short_name, data in ZONE_LOOKUP_SEED.items()],
+            "zone lookup",
+        )
+        self.zones = {row['id']: row for row in zone_rows}
+
+        self.class_rows = _rows_with_fallback(
+            self.notes_db.get_class_bitmasks,
+            [{'id': class_id, **data} for class_id, data in CLASS_LOOKUP_SEED.items()],
+            "class lookup",
+        )
+        self.race_rows = _rows_with_fallback(
+            self.notes_db.get_race_bitmasks,
+            [{'id': race_id, **data} for race_id, data in RACE_LOOKUP_SEED.items()],
+            "race lookup",
+        )
+        self.deity_rows = _rows_with_fallback(
+            self.notes_db.get_deity_bitmasks,
+            [{'id': deity_id, **data} for deity_id, data in DEITY_LOOKUP_SEED.items()],
+            "deity lookup",
+        )
+        self.class_names = {row['id']: row['name'] for row in self.class_rows}
+        self.race_names = {row['id']: row['name'] for row in self.race_rows}
+        self.deity_names = {row['id']: row['name'] for row in self.deity_rows}
+
+    def zone_name(self, zone_id) -> str:
+        zone = self.zones.get(zone_id)
+        return zone['long_name'] if zone else f"Zone {zone_id}"
+
+    def class_name(self, class_id) -> str:
+        return self.class_names.get(class_id, f"Unknown ({class_id})")
+
+    def race_name(self, race_id) -> str:
+        return self.race_names.get(race_id, f"Unknown ({race_id})")
+
+    def deity_name(self, deity_id) -> str:
+        return self.deity_names.get(deity_id, f"Unknown ({deity_id})")
+
+
+_shared_services: Dict[str, LookupService] = {}
+
+
+def get_lookup_service(notes_db) -> LookupService:
+    """Return the process-wide lookup service for notes_db's database file."""
+    service: Optional[LookupService] = _shared_services.get(notes_db.db_path)
+    if service is None:
+        service = _shared_services[notes_db.db_path] = LookupService(notes_db)
+    return service
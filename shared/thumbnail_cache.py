@@ -0,0 +1,100 @@
+"""
+Thumbnail Cache - decode image thumbnails on a worker pool and keep them on disk
+Thumbnails are stored as PNGs keyed by source path, mtime and size, so a
+changed source image gets a fresh thumbnail. Decoding runs on worker threads;
+the Tk thread collects finished thumbnails with drain().
+"""
+import hashlib
+import os
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THUMBNAIL_CACHE_DIR = os.path.join(BASE_DIR, "cache", "thumbnails")
+DEFAULT_THUMBNAIL_SIZE = (96, 96)
+
+
+class ThumbnailCache:
+    """Produce thumbnails in the background, reusing the on-disk copy when the source is unchanged."""
+
+    def __init__(self, cache_dir: str = THUMBNAIL_CACHE_DIR,
+                 size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE,
+                 workers: Optional[int] = None) -> None:
+        self.cache_dir = cache_dir
+        self.size = size
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="thumbnail",
+        )
+        self._results: "queue.Queue[Tuple[str, Optional[Image.Image]]]" = queue.Queue()
+        self._pending: Dict[str, Future] = {}
+
+    def cache_path(self, path: str, mtime_ns: int) -> str:
+        key = f"{os.path.abspath(path)}|{mtime_ns}|{self.size[0]}x{self.size[1]}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.png")
+
+    def load(self, path: str) -> Image.Image:
+        """Return the thumbnail for path, decoding and caching it if needed. Runs on any thread."""
+        cached_path = self.cache_path(path, os.stat(path).st_mtime_ns)
+        if os.path.exists(cached_path):
+            try:
+                with Image.open(cached_path) as cached:
+                    cached.load()
+                    return cached.copy()
+            except OSError:
+                pass
+
+        with Image.open(path) as source:
+            source.draft("RGB", self.size)
+            thumbnail = source.convert("RGB")
+        thumbnail.thumbnail(self.size, Image.LANCZOS)
+
+        try:
+            os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+            tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+            thumbnail.save(tmp_path, format="PNG")
+            os.replace(tmp_path, cached_path)
+        except OSError as exc:
+            print(f"Warning: could not write thumbnail cache: {exc}")
+        return thumbnail
+
+    def request(self, path: str) -> None:
+        """Queue a thumbnail for background decoding; duplicate requests are ignored."""
+        if path in self._pending:
+            return
+        self._pending[path] = self._executor.submit(self._work, path)
+
+    def retain(self, paths: Iterable[str]) -> None:
+        """Cancel queued requests that are no longer wanted (e.g. scrolled out of view)."""
+        keep = set(paths)
+        for path in [p for p in self._pending if p not in keep]:
+            if self._pending[path].cancel():
+                del self._pending[path]
+
+    def drain(self) -> List[Tuple[str, Optional[Image.Image]]]:
+        """Return thumbnails finished since the last call. Call from the Tk thread."""
+        finished = []
+        while True:
+            try:
+                path, image = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.pop(path, None)
+            finished.append((path, image))
+        return finished
+
+    def _work(self, path: str) -> None:
+        try:
+            image = self.load(path)
+        except Exception as exc:
+            print(f"Could not build thumbnail for {path}: {exc}")
+            image = None
+        self._results.put((path, image))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
@@ -3,20 +3,42 @@ from tkinter import ttk, messagebox
 import sys
 import os
 from datetime import datetime
-from PIL import Image, ImageTk
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, List
-
 from shared.theme import set_dark_theme
 from shared.notes_db import NotesDBManager
-from dictionaries import (SLOT_BITMASK_DISPLAY, ITEM_STAT_DISPLAY_CONFIG)
-from lookup_data import (
-    class_lookup as CLASS_LOOKUP_SEED,
-    race_lookup as RACE_LOOKUP_SEED,
-    deity_lookup as DEITY_LOOKUP_SEED,
+from shared.image_registry import get_image_registry, ITEM_BACKGROUND
+from shared.item_card import get_item_card_renderer
+from shared.lookup_service import get_lookup_service
+from shared.character_bundle import CharacterPrefetcher, fetch_character_bundle
+from shared.item_ownership import OWNERSHIP_PAGE_SIZE, ItemOwnershipCache, parse_item_ids
+from shared.bulk_inventory import (
+    ACTION_DELETE,
+    ACTION_REPLACE,
+    ACTION_SET_CHARGES,
+    BulkAction,
+    BulkJobSpec,
+    BulkJobStore,
+    BulkScope,
+    preview as preview_bulk_job,
+    run_chunk,
+)
+from shared.economy_report import EconomyReportStore, run_report
+from shared.inventory_snapshots import (
+    DEFAULT_SNAPSHOT_INTERVAL_MINUTES,
+    InventorySnapshotStore,
+    SnapshotScheduler,
+    diff_rows,
+    fetch_live_inventories,
+)
+from shared.character_summary import (
+    FIRST_PAGE,
+    PLAYER_PAGE_SIZE,
+    CharacterSummaryCache,
+    fetch_live_page,
+    page_key,
 )
 
 # Slot ID to name mapping for inventory display
@@ -28,6 +50,9 @@ SLOT_ID_TO_NAME = {
     18: "Legs", 19: "Feet", 20: "Waist", 21: "Powersource", 9999: "Cursor"
 }
 
+# Width in characters of the longest bar in report histograms
+REPORT_BAR_WIDTH = 40
+
 class InventoryManagerTool:
     """Inventory Manager Tool - modular version for tabbed interface"""
     
@@ -40,6 +65,7 @@ class InventoryManagerTool:
             raise ValueError("InventoryManagerTool requires a NotesDBManager instance")
 
         self.notes_db: NotesDBManager = notes_db_manager
+        self.lookups = get_lookup_service(notes_db_manager)
         # Lookup caches
         self.class_id_to_name = {}
         self.class_name_to_id = {}
@@ -50,10 +76,43 @@ class InventoryManagerTool:
         self.deity_id_to_name = {}
         self.deity_name_to_id = {}
         self.load_lookup_data()
+        self.item_cards = get_item_card_renderer(db_manager, notes_db_manager)
         
         # Sorting variables
         self.sort_column = None
         self.sort_reverse = False
+
+        # Player list paging; the summary cache is opened on first use
+        self.summary_cache = None
+        self.player_page_after = FIRST_PAGE
+        self.player_count = 0
+        self.players_exhausted = False
+
+        # Neighbouring characters are loaded ahead on a background connection
+        self.prefetcher = CharacterPrefetcher(db_manager)
+
+        # Item ownership search
+        self.ownership_cache = ItemOwnershipCache()
+        self.ownership_item_ids = []
+        self.ownership_offset = 0
+
+        # Bulk inventory operations
+        self.bulk_window = None
+        self.bulk_store = None
+        self.bulk_job = None
+        self.bulk_paused = False
+        self.bulk_unfinished = []
+
+        # Economy report
+        self.economy_window = None
+        self.economy_store = None
+
+        # Inventory snapshots of the selected character, and the scheduled snapshot run
+        self.snapshot_store = None
+        self.snapshot_char_id = None
+        self.snapshot_infos = {}
+        self.snapshot_scheduler = None
+        self.snapshot_scheduler_runs = 0
         
         # Configure parent frame grid
         self.parent.grid_rowconfigure(0, weight=1)
@@ -70,24 +129,9 @@ class InventoryManagerTool:
         self.load_players()
 
     def load_lookup_data(self):
-        """Load class, race, and deity lookup data from notes.db with seed fallbacks."""
-
-        def with_fallback(fetch_fn, seed_map: Dict[int, Dict[str, str]], entity: str) -> List[Dict]:
-            try:
-                rows = fetch_fn()
-            except Exception as exc:
-                print(f"Warning: failed to load {entity} from notes.db ({exc}); falling back to seed data.")
-                rows = []
-
-            if not rows:
-                rows = [
-                    {'id': seed_id, **data}
-                    for seed_id, data in seed_map.items()
-                ]
-            return rows
-
-        class_rows = with_fallback(self.notes_db.get_class_bitmasks, CLASS_LOOKUP_SEED, "class lookup")
-        self.class_id_to_name = {row['id']: row['name'] for row in class_rows}
+        """Build the class, race, and deity maps from the shared lookup service."""
+        class_rows = self.lookups.class_rows
+        self.class_id_to_name = dict(self.lookups.class_names)
         self.class_name_to_id = {name: class_id for class_id, name in self.class_id_to_name.items()}
         self.class_bitmask_display = {
             row['bit_value']: row.get('abbr') or row['name']
@@ -95,8 +139,8 @@ class InventoryManagerTool:
         }
         self.class_bitmask_display[65535] = "ALL"
 
-        race_rows = with_fallback(self.notes_db.get_race_bitmasks, RACE_LOOKUP_SEED, "race lookup")
-        self.race_id_to_name = {row['id']: row['name'] for row in race_rows}
+        race_rows = self.lookups.race_rows
+        self.race_id_to_name = dict(self.lookups.race_names)
         self.race_name_to_id = {name: race_id for race_id, name in self.race_id_to_name.items()}
         self.race_bitmask_display = {
             row['bit_value']: row.get('abbr') or row['name']
@@ -104,10 +148,15 @@ class InventoryManagerTool:
         }
         self.race_bitmask_display[65535] = "ALL"
 
-        deity_rows = with_fallback(self.notes_db.get_deity_bitmasks, DEITY_LOOKUP_SEED, "deity lookup")
-        self.deity_id_to_name = {row['id']: row['name'] for row in deity_rows}
+        self.deity_id_to_name = dict(self.lookups.deity_names)
         self.deity_name_to_id = {name: deity_id for deity_id, name in self.deity_id_to_name.items()}
     
+    def close(self):
+        """Stop background work and close its connections; the tool restarts it on demand"""
+        self.prefetcher.close()
+        if self.snapshot_scheduler is not None:
+            self.snapshot_scheduler.stop()
+
     def create_ui(self):
         """Create the complete Inventory Manager UI"""
         # Configure main frame grid
@@ -185,6 +234,24 @@ class InventoryManagerTool:
 
         # Add player tree to grid
         self.player_tree.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+
+        # Paging and summary cache controls
+        page_frame = ttk.Frame(self.left_panel)
+        page_frame.grid(row=3, column=0, sticky="ew", padx=5, pady=(0, 5))
+        page_frame.grid_columnconfigure(4, weight=1)
+
+        self.load_more_button = ttk.Button(page_frame, text="Load More", command=self.load_more_players)
+        self.load_more_button.grid(row=0, column=0, padx=5)
+
+        self.use_summary_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            page_frame, text="Use summary cache", variable=self.use_summary_cache_var, command=self.load_players
+        ).grid(row=0, column=1, padx=5)
+        ttk.Button(page_frame, text="Refresh Cache", command=self.refresh_summary_cache).grid(row=0, column=2, padx=5)
+        ttk.Button(page_frame, text="Economy Report", command=self.show_economy_report).grid(row=0, column=3, padx=5)
+
+        self.player_status_var = tk.StringVar()
+        ttk.Label(page_frame, textvariable=self.player_status_var).grid(row=0, column=4, sticky="w", padx=5)
     
     def create_middle_panel(self):
         # Middle Panel - Inventory
@@ -255,6 +322,110 @@ class InventoryManagerTool:
 
         # Add bagged tree to grid
         self.bagged_tree.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+
+        # Item owners tab - who holds these items across inventories, shared banks and guild banks
+        owners_frame = ttk.Frame(self.inventory_notebook)
+        self.inventory_notebook.add(owners_frame, text="Item Owners")
+        owners_frame.grid_rowconfigure(1, weight=1)
+        owners_frame.grid_columnconfigure(0, weight=1)
+
+        owners_search = ttk.Frame(owners_frame)
+        owners_search.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        owners_search.grid_columnconfigure(1, weight=1)
+
+        ttk.Label(owners_search, text="Item IDs:").grid(row=0, column=0, padx=5)
+        self.ownership_ids_var = tk.StringVar()
+        ownership_entry = ttk.Entry(owners_search, textvariable=self.ownership_ids_var)
+        ownership_entry.grid(row=0, column=1, sticky="ew", padx=5)
+        ownership_entry.bind("<Return>", lambda event: self.search_item_owners())
+        ttk.Button(owners_search, text="Find Owners", command=self.search_item_owners).grid(row=0, column=2, padx=5)
+        ttk.Button(
+            owners_search, text="Refresh", command=lambda: self.show_item_owners(self.ownership_offset, refresh=True)
+        ).grid(row=0, column=3, padx=5)
+        ttk.Button(
+            owners_search, text="Bulk Operations", command=self.show_bulk_operations, style="InventoryDelete.TButton"
+        ).grid(row=0, column=4, padx=5)
+
+        owners_columns = ["Item ID", "Item Name", "Source", "Owner", "Account", "Stacks", "Count", "Slots"]
+        self.owners_tree = ttk.Treeview(owners_frame, columns=owners_columns, show="headings", selectmode="browse")
+        owner_widths = {"Item ID": 60, "Item Name": 160, "Source": 80, "Owner": 110, "Account": 100,
+                        "Stacks": 50, "Count": 50, "Slots": 140}
+        for col in owners_columns:
+            self.owners_tree.heading(col, text=col)
+            self.owners_tree.column(col, width=owner_widths.get(col, 70))
+        self.owners_tree.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+
+        owners_paging = ttk.Frame(owners_frame)
+        owners_paging.grid(row=2, column=0, sticky="ew", padx=5, pady=(0, 5))
+        owners_paging.grid_columnconfigure(2, weight=1)
+        self.owners_prev_button = ttk.Button(
+            owners_paging, text="Previous", state="disabled",
+            command=lambda: self.show_item_owners(self.ownership_offset - OWNERSHIP_PAGE_SIZE)
+        )
+        self.owners_prev_button.grid(row=0, column=0, padx=5)
+        self.owners_next_button = ttk.Button(
+            owners_paging, text="Next", state="disabled",
+            command=lambda: self.show_item_owners(self.ownership_offset + OWNERSHIP_PAGE_SIZE)
+        )
+        self.owners_next_button.grid(row=0, column=1, padx=5)
+        self.ownership_status_var = tk.StringVar()
+        ttk.Label(owners_paging, textvariable=self.ownership_status_var).grid(row=0, column=2, sticky="w", padx=5)
+
+        # Snapshots tab - saved copies of the selected character's inventory and what changed between them
+        snapshots_frame = ttk.Frame(self.inventory_notebook)
+        self.inventory_notebook.add(snapshots_frame, text="Snapshots")
+        snapshots_frame.grid_rowconfigure(1, weight=1)
+        snapshots_frame.grid_rowconfigure(2, weight=2)
+        snapshots_frame.grid_columnconfigure(0, weight=1)
+
+        snapshot_actions = ttk.Frame(snapshots_frame)
+        snapshot_actions.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        snapshot_actions.grid_columnconfigure(4, weight=1)
+        ttk.Button(snapshot_actions, text="Take Snapshot", command=self.take_snapshot).grid(row=0, column=0, padx=5)
+        ttk.Button(snapshot_actions, text="Compare Selected", command=self.compare_snapshots).grid(row=0, column=1, padx=5)
+        ttk.Button(
+            snapshot_actions, text="Compare with Live", command=self.compare_snapshot_with_live
+        ).grid(row=0, column=2, padx=5)
+        ttk.Button(snapshot_actions, text="Delete", command=self.delete_snapshots).grid(row=0, column=3, padx=5)
+        self.snapshot_status_var = tk.StringVar(value="Select a character.")
+        ttk.Label(snapshot_actions, textvariable=self.snapshot_status_var).grid(row=0, column=4, sticky="w", padx=5)
+
+        snapshot_columns = ["ID", "Taken", "Label", "Items", "Contents"]
+        self.snapshots_tree = ttk.Treeview(snapshots_frame, columns=snapshot_columns, show="headings",
+                                           selectmode="extended", height=5)
+        snapshot_widths = {"ID": 50, "Taken": 130, "Label": 100, "Items": 50, "Contents": 90}
+        for col in snapshot_columns:
+            self.snapshots_tree.heading(col, text=col)
+            self.snapshots_tree.column(col, width=snapshot_widths[col])
+        self.snapshots_tree.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+
+        diff_columns = ["Slot", "Change", "Before", "After"]
+        self.snapshot_diff_tree = ttk.Treeview(snapshots_frame, columns=diff_columns, show="headings",
+                                               selectmode="browse")
+        diff_widths = {"Slot": 90, "Change": 70, "Before": 190, "After": 190}
+        for col in diff_columns:
+            self.snapshot_diff_tree.heading(col, text=col)
+            self.snapshot_diff_tree.column(col, width=diff_widths[col])
+        self.snapshot_diff_tree.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
+
+        schedule_frame = ttk.Frame(snapshots_frame)
+        schedule_frame.grid(row=3, column=0, sticky="ew", padx=5, pady=(0, 5))
+        schedule_frame.grid_columnconfigure(1, weight=1)
+        ttk.Label(schedule_frame, text="Character IDs:").grid(row=0, column=0, padx=5)
+        self.schedule_ids_var = tk.StringVar()
+        ttk.Entry(schedule_frame, textvariable=self.schedule_ids_var).grid(row=0, column=1, sticky="ew", padx=5)
+        ttk.Button(
+            schedule_frame, text="Use Loaded Players", command=self.use_loaded_players_for_schedule
+        ).grid(row=0, column=2, padx=5)
+        ttk.Label(schedule_frame, text="Every (min):").grid(row=0, column=3, padx=5)
+        self.schedule_interval_var = tk.StringVar(value=str(DEFAULT_SNAPSHOT_INTERVAL_MINUTES))
+        ttk.Entry(schedule_frame, textvariable=self.schedule_interval_var, width=6).grid(row=0, column=4, padx=5)
+        self.schedule_button = ttk.Button(schedule_frame, text="Start Schedule", command=self.toggle_snapshot_schedule)
+        self.schedule_button.grid(row=0, column=5, padx=5)
+        self.schedule_status_var = tk.StringVar(value="No scheduled snapshots.")
+        ttk.Label(schedule_frame, textvariable=self.schedule_status_var).grid(
+            row=1, column=0, columnspan=6, sticky="w", padx=5
+        )
     
     def create_right_panel(self):
         # Right Panel - Character Details
@@ -326,8 +497,7 @@ class InventoryManagerTool:
 
         # Canvas for item display with background image
         try:
-            backingimage = Image.open("images/other/itemback.png")
-            self.bg_image = ImageTk.PhotoImage(backingimage)
+            self.bg_image = get_image_registry().get_photo(ITEM_BACKGROUND)
             
             self.canvas = tk.Canvas(item_details_frame, width=self.bg_image.width(), height=self.bg_image.height(), highlightthickness=0)
             self.canvas.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
@@ -368,130 +538,75 @@ class InventoryManagerTool:
         self.search_var.trace("w", self.filter_players)
     
     def load_players(self):
-        """Load players into the treeview"""
-        # Clear existing items
-        for item in self.player_tree.get_children():
-            self.player_tree.delete(item)
-        
-        # Fetch players from character_data - exclude level 0, deleted chars, and empty inventories
-        query = """
-            SELECT DISTINCT cd.id, cd.name, cd.level,
-                   CASE cd.class
-                       WHEN 1 THEN 'Warrior' WHEN 2 THEN 'Cleric' WHEN 3 THEN 'Paladin' WHEN 4 THEN 'Ranger'
-                       WHEN 5 THEN 'Shadow Knight' WHEN 6 THEN 'Druid' WHEN 7 THEN 'Monk' WHEN 8 THEN 'Bard'
-                       WHEN 9 THEN 'Rogue' WHEN 10 THEN 'Shaman' WHEN 11 THEN 'Necromancer' WHEN 12 THEN 'Wizard'
-                       WHEN 13 THEN 'Magician' WHEN 14 THEN 'Enchanter' WHEN 15 THEN 'Beastlord' WHEN 16 THEN 'Berserker'
-                       ELSE CONCAT('Unknown (', cd.class, ')') END as class,
-                   CASE cd.race
-                       WHEN 1 THEN 'Human' WHEN 2 THEN 'Barbarian' WHEN 3 THEN 'Erudite' WHEN 4 THEN 'Wood Elf'
-                       WHEN 5 THEN 'High Elf' WHEN 6 THEN 'Dark Elf' WHEN 7 THEN 'Half Elf' WHEN 8 THEN 'Dwarf'
-                       WHEN 9 THEN 'Troll' WHEN 10 THEN 'Ogre' WHEN 11 THEN 'Halfling' WHEN 12 THEN 'Gnome'
-                       WHEN 128 THEN 'Iksar' WHEN 130 THEN 'Vah Shir' WHEN 330 THEN 'Froglok'
-                       ELSE CONCAT('Unknown (', cd.race, ')') END as race,
-                   cd.zone_id, cd.time_played, cd.aa_points_spent, cd.aa_points,
-                   COALESCE(cc.platinum, 0) as platinum,
-                   COALESCE(cc.platinum_bank, 0) as platinum_bank,
-                   COALESCE(cc.platinum_cursor, 0) as platinum_cursor,
-                   COUNT(DISTINCT sb.item_id) as shared_items_count
-            FROM character_data cd
-            INNER JOIN inventory i ON cd.id = i.character_id
-            LEFT JOIN character_currency cc ON cd.id = cc.id
-            LEFT JOIN sharedbank sb ON cd.account_id = sb.account_id AND sb.item_id > 0
-            WHERE cd.level > 0
-                AND cd.name NOT LIKE '%%-deleted%%'
-                AND i.item_id > 0
-            GROUP BY cd.id, cd.name, cd.level, cd.class, cd.race, cd.zone_id, cd.time_played,
-                     cd.aa_points_spent, cd.aa_points, cc.platinum, cc.platinum_bank, cc.platinum_cursor
-            ORDER BY cd.name
-        """
-        players = self.db_manager.execute_query(query)
-        
-        # Insert players into treeview
+        """Load the first page of players, bringing the summary cache up to date first"""
+        if self.use_summary_cache_var.get():
+            self.refresh_summary_cache(reload=False)
+        self.filter_players()
+
+    def get_summary_cache(self):
+        if self.summary_cache is None:
+            self.summary_cache = CharacterSummaryCache()
+        return self.summary_cache
+
+    def refresh_summary_cache(self, reload=True):
+        """Pull characters that logged in since the last refresh into the summary cache"""
+        changed = self.get_summary_cache().refresh(self.db_manager)
+        if changed is None:
+            self.player_status_var.set("Summary cache refresh failed")
+        elif changed:
+            print(f"Refreshed {changed} character summaries")
+        if reload:
+            self.filter_players()
+
+    def refresh_player_summaries(self, char_ids):
+        """Re-read characters this tool changed, since edits do not move last_login"""
+        if self.summary_cache is not None:
+            self.summary_cache.refresh_characters(self.db_manager, char_ids)
+
+    def fetch_player_page(self):
+        search_term = self.search_var.get().lower()
+        if self.use_summary_cache_var.get():
+            return self.get_summary_cache().page(search_term, self.player_page_after)
+        return fetch_live_page(self.db_manager, search_term, self.player_page_after)
+
+    def load_more_players(self):
+        """Append the next page of players (keyset pagination on name, id)"""
+        if self.players_exhausted:
+            return
+        players = self.fetch_player_page()
         for player in players:
-            # Convert dictionary to tuple of values ordered by columns
-            if isinstance(player, dict):
-                # Get zone name from zone_id
-                zone_id = player.get('zone_id')
-                zone_info = self.notes_db.get_zone_by_id(zone_id)
-                zone_name = zone_info['long_name'] if zone_info else f"Zone {zone_id}"
-
-                # Extract values in the same order as the treeview columns
-                player_values = [
-                    player.get('id'), player.get('name'), player.get('level'), player.get('class'), player.get('race'),
-                    zone_name, player.get('time_played'), player.get('aa_points_spent'), player.get('aa_points'),
-                    player.get('platinum'), player.get('platinum_bank'), player.get('platinum_cursor'),
-                    player.get('shared_items_count', 0)
-                ]
-                self.player_tree.insert("", tk.END, values=player_values)
-            else:
-                self.player_tree.insert("", tk.END, values=player)
-        
-        # Update status (we'll add a status bar later if needed)
-        print(f"Loaded {len(players)} players")
-    
+            self.player_tree.insert("", tk.END, values=self.player_row_values(player))
+        if players:
+            self.player_page_after = page_key(players[-1])
+        self.player_count += len(players)
+        self.players_exhausted = len(players) < PLAYER_PAGE_SIZE
+        self.load_more_button.configure(state="disabled" if self.players_exhausted else "normal")
+        self.player_status_var.set(
+            f"{self.player_count} players" + ("" if self.players_exhausted else " (more available)")
+        )
+
+    def player_row_values(self, player):
+        """Return a player row's values in column order, naming class, race and zone from the lookup service."""
+        if not isinstance(player, dict):
+            return player
+        lookups = self.lookups
+        return [
+            player.get('id'), player.get('name'), player.get('level'),
+            lookups.class_name(player.get('class')), lookups.race_name(player.get('race')),
+            lookups.zone_name(player.get('zone_id')), player.get('time_played'),
+            player.get('aa_points_spent'), player.get('aa_points'),
+            player.get('platinum'), player.get('platinum_bank'), player.get('platinum_cursor'),
+            player.get('shared_items_count', 0)
+        ]
+
     def filter_players(self, *args):
-        """Filter players based on search"""
-        search_term = self.search_var.get().lower()
-        
-        # Clear existing items
+        """Filter players based on search, restarting from the first page"""
         for item in self.player_tree.get_children():
             self.player_tree.delete(item)
-        
-        # Fetch players from character_data - exclude level 0, deleted chars, and empty inventories
-        query = """
-            SELECT DISTINCT cd.id, cd.name, cd.level,
-                   CASE cd.class
-                       WHEN 1 THEN 'Warrior' WHEN 2 THEN 'Cleric' WHEN 3 THEN 'Paladin' WHEN 4 THEN 'Ranger'
-                       WHEN 5 THEN 'Shadow Knight' WHEN 6 THEN 'Druid' WHEN 7 THEN 'Monk' WHEN 8 THEN 'Bard'
-                       WHEN 9 THEN 'Rogue' WHEN 10 THEN 'Shaman' WHEN 11 THEN 'Necromancer' WHEN 12 THEN 'Wizard'
-                       WHEN 13 THEN 'Magician' WHEN 14 THEN 'Enchanter' WHEN 15 THEN 'Beastlord' WHEN 16 THEN 'Berserker'
-                       ELSE CONCAT('Unknown (', cd.class, ')') END as class,
-                   CASE cd.race
-                       WHEN 1 THEN 'Human' WHEN 2 THEN 'Barbarian' WHEN 3 THEN 'Erudite' WHEN 4 THEN 'Wood Elf'
-                       WHEN 5 THEN 'High Elf' WHEN 6 THEN 'Dark Elf' WHEN 7 THEN 'Half Elf' WHEN 8 THEN 'Dwarf'
-                       WHEN 9 THEN 'Troll' WHEN 10 THEN 'Ogre' WHEN 11 THEN 'Halfling' WHEN 12 THEN 'Gnome'
-                       WHEN 128 THEN 'Iksar' WHEN 130 THEN 'Vah Shir' WHEN 330 THEN 'Froglok'
-                       ELSE CONCAT('Unknown (', cd.race, ')') END as race,
-                   cd.zone_id, cd.time_played, cd.aa_points_spent, cd.aa_points,
-                   COALESCE(cc.platinum, 0) as platinum,
-                   COALESCE(cc.platinum_bank, 0) as platinum_bank,
-                   COALESCE(cc.platinum_cursor, 0) as platinum_cursor,
-                   COUNT(DISTINCT sb.item_id) as shared_items_count
-            FROM character_data cd
-            INNER JOIN inventory i ON cd.id = i.character_id
-            LEFT JOIN character_currency cc ON cd.id = cc.id
-            LEFT JOIN sharedbank sb ON cd.account_id = sb.account_id AND sb.item_id > 0
-            WHERE cd.level > 0
-                AND cd.name NOT LIKE '%%-deleted%%'
-                AND i.item_id > 0
-                AND LOWER(cd.name) LIKE %s
-            GROUP BY cd.id, cd.name, cd.level, cd.class, cd.race, cd.zone_id, cd.time_played,
-                     cd.aa_points_spent, cd.aa_points, cc.platinum, cc.platinum_bank, cc.platinum_cursor
-            ORDER BY cd.name
-        """
-        players = self.db_manager.execute_query(query, (f"%{search_term}%",))
-        
-        # Insert filtered players into treeview
-        for player in players:
-            # Convert dictionary to tuple of values ordered by columns
-            if isinstance(player, dict):
-                # Get zone name from zone_id
-                zone_id = player.get('zone_id')
-                zone_info = self.notes_db.get_zone_by_id(zone_id)
-                zone_name = zone_info['long_name'] if zone_info else f"Zone {zone_id}"
-
-                # Extract values in the same order as the treeview columns
-                player_values = [
-                    player.get('id'), player.get('name'), player.get('level'), player.get('class'), player.get('race'),
-                    zone_name, player.get('time_played'), player.get('aa_points_spent'), player.get('aa_points'),
-                    player.get('platinum'), player.get('platinum_bank'), player.get('platinum_cursor'),
-                    player.get('shared_items_count', 0)
-                ]
-                self.player_tree.insert("", tk.END, values=player_values)
-            else:
-                self.player_tree.insert("", tk.END, values=player)
-        
-        print(f"Found {len(players)} players matching '{search_term}'")
+        self.player_page_after = FIRST_PAGE
+        self.player_count = 0
+        self.players_exhausted = False
+        self.load_more_players()
     
     def edit_cell(self, event):
         """Handle double-click to edit cell"""
@@ -657,7 +772,10 @@ class InventoryManagerTool:
             # Execute update query
             query = f"UPDATE {table} SET {db_column} = %s WHERE {where_column} = %s"
             result = self.db_manager.execute_update(query, (value, char_id))
-            
+            if result:
+                self.refresh_player_summaries([char_id])
+                self.prefetcher.invalidate([char_id])
+
             return result is not None
             
         except Exception as e:
@@ -701,215 +819,774 @@ class InventoryManagerTool:
                 self.player_tree.heading(column, text=column)
     
     def load_inventory(self, event=None):
-        """Load inventory for selected player"""
+        """Load inventory, details and buffs for the selected player in one round trip"""
         selected_item = self.player_tree.selection()
         if not selected_item:
             return
         
         # Get character ID
         char_id = self.player_tree.item(selected_item, "values")[0]
-        
-        # Clear existing items
-        for item in self.worn_tree.get_children():
-            self.worn_tree.delete(item)
-        for item in self.bagged_tree.get_children():
-            self.bagged_tree.delete(item)
-        
-        # Fetch inventory for character (only slots with actual items)
-        query = """
-            SELECT i.slot_id, i.item_id, COALESCE(it.Name, 'Unknown Item') as item_name, i.charges
-            FROM inventory i
-            LEFT JOIN items it ON i.item_id = it.id
-            WHERE i.character_id = %s AND i.item_id > 0
-            ORDER BY i.slot_id
-        """
-        inventory = self.db_manager.execute_query(query, (char_id,))
-        
-        # DEBUG: Print what we're getting from the database
-        print(f"DEBUG: Query returned {len(inventory)} items for character {char_id}")
-        if inventory:
-            print(f"DEBUG: First item data: {inventory[0]}")
-            print(f"DEBUG: First item type: {type(inventory[0])}")
-            if isinstance(inventory[0], dict):
-                print(f"DEBUG: Dictionary keys: {list(inventory[0].keys())}")
-        
-        # Insert items into appropriate treeview
+
+        bundle = self.prefetcher.get(char_id)
+        if bundle is None:
+            bundle = fetch_character_bundle(self.db_manager, char_id)
+            if bundle is None:
+                return
+            self.prefetcher.put(bundle)
+        self.show_character_bundle(bundle)
+        self.snapshot_char_id = int(char_id)
+        self.refresh_snapshot_list()
+        self.prefetch_neighbours(selected_item[0])
+
+    def prefetch_neighbours(self, item):
+        """Queue the characters above and below item in the player list for prefetching"""
+        neighbours = [self.player_tree.next(item), self.player_tree.prev(item)]
+        self.prefetcher.prefetch(
+            self.player_tree.set(neighbour, "ID") for neighbour in neighbours if neighbour
+        )
+
+    def show_character_bundle(self, bundle):
+        """Fill the worn, bagged, details and buffs panels from one CharacterBundle"""
+        self.show_inventory(bundle.inventory)
+        self.show_character_details(bundle.details)
+        self.show_character_buffs(bundle.buffs)
+
+    def show_inventory(self, inventory):
+        """Split inventory rows between the worn and bagged trees"""
+        self.worn_tree.delete(*self.worn_tree.get_children())
+        self.bagged_tree.delete(*self.bagged_tree.get_children())
+
         for item in inventory:
-            # Convert dictionary to tuple of values ordered by columns
-            if isinstance(item, dict):
-                slot_id = item.get('slot_id')
-                slot_name = SLOT_ID_TO_NAME.get(slot_id, f"Slot {slot_id}")
-                
-                # Extract values in the same order as the treeview columns: ["Slot", "Item ID", "Item Name", "Charges"]
-                item_values = [
-                    slot_name, item.get('item_id'), item.get('item_name'), item.get('charges', 0)
-                ]
-                print(f"DEBUG: Inserting into treeview: {item_values}")
-            else:
-                slot_id = item[0]
-                slot_name = SLOT_ID_TO_NAME.get(slot_id, f"Slot {slot_id}")
-                item_values = [slot_name, item[1], item[2], item[3] if len(item) > 3 else 0]
-                print(f"DEBUG: Inserting tuple into treeview: {item_values}")
-            
+            slot_id = item.get('slot_id')
+            slot_name = SLOT_ID_TO_NAME.get(slot_id, f"Slot {slot_id}")
+
+            # Values in the same order as the treeview columns: ["Slot", "Item ID", "Item Name", "Charges"]
+            item_values = [
+                slot_name, item.get('item_id'), item.get('item_name'), item.get('charges', 0)
+            ]
+
             # Worn equipment slots (0-21)
             if 0 <= slot_id <= 21:
                 self.worn_tree.insert("", tk.END, values=item_values)
             # Bagged items (22+)
             else:
                 self.bagged_tree.insert("", tk.END, values=item_values)
-        
-        # Load character details
-        self.load_character_details(char_id)
-        
-        print(f"Loaded inventory for character ID {char_id}")
-    
-    def load_character_details(self, char_id):
-        """Load character details"""
-        # Fetch character data
-        query = """
-            SELECT name, level, class, race, deity, last_login, time_played, 
-                   cur_hp, mana, endurance, str, sta, cha, dex, `int`, agi, wis
-            FROM character_data
-            WHERE id = %s
-        """
-        char_data = self.db_manager.execute_query(query, (char_id,), fetch_all=False)
-        
-        if char_data:
-            # Handle both dictionary and tuple results
-            if isinstance(char_data, dict):
-                # Character data is already a dictionary
-                char_data_dict = {
-                    "Name": char_data.get('name'),
-                    "Level": char_data.get('level'),
-                    "Class": char_data.get('class'),
-                    "Race": char_data.get('race'),
-                    "Deity": char_data.get('deity'),
-                    "Last Login": char_data.get('last_login'),
-                    "Time Played": char_data.get('time_played'),
-                    "HP": char_data.get('cur_hp'),
-                    "Mana": char_data.get('mana'),
-                    "Endurance": char_data.get('endurance'),
-                    "STR": char_data.get('str'),
-                    "STA": char_data.get('sta'),
-                    "CHA": char_data.get('cha'),
-                    "DEX": char_data.get('dex'),
-                    "INT": char_data.get('int'),
-                    "AGI": char_data.get('agi'),
-                    "WIS": char_data.get('wis')
-                }
-            else:
-                # Character data is a tuple
-                char_data_dict = {
-                    "Name": char_data[0],
-                    "Level": char_data[1],
-                    "Class": char_data[2],
-                    "Race": char_data[3],
-                    "Deity": char_data[4],
-                    "Last Login": char_data[5],
-                    "Time Played": char_data[6],
-                    "HP": char_data[7],
-                    "Mana": char_data[8],
-                    "Endurance": char_data[9],
-                    "STR": char_data[10],
-                    "STA": char_data[11],
-                    "CHA": char_data[12],
-                    "DEX": char_data[13],
-                    "INT": char_data[14],
-                    "AGI": char_data[15],
-                    "WIS": char_data[16]
-                }
+
+    def show_character_details(self, char_data):
+        """Fill the character info labels"""
+        if not char_data:
+            return
+
+        char_data_dict = {
+            "Name": char_data.get('name'),
+            "Level": char_data.get('level'),
+            "Class": char_data.get('class'),
+            "Race": char_data.get('race'),
+            "Deity": char_data.get('deity'),
+            "Last Login": char_data.get('last_login'),
+            "Time Played": char_data.get('time_played'),
+            "HP": char_data.get('cur_hp'),
+            "Mana": char_data.get('mana'),
+            "Endurance": char_data.get('endurance'),
+            "STR": char_data.get('str'),
+            "STA": char_data.get('sta'),
+            "CHA": char_data.get('cha'),
+            "DEX": char_data.get('dex'),
+            "INT": char_data.get('int'),
+            "AGI": char_data.get('agi'),
+            "WIS": char_data.get('wis')
+        }
             
-            # Update character info labels
-            for field in self.char_info_labels.keys():
-                if field == "Guild":
-                    # Fetch guild information from guild_members and guilds tables
-                    guild_query = """
-                        SELECT g.name, gm.rank
-                        FROM guild_members gm
-                        JOIN guilds g ON gm.guild_id = g.id
-                        WHERE gm.char_id = %s
-                    """
-                    guild_result = self.db_manager.execute_query(guild_query, (char_id,), fetch_all=False)
-                    
-                    if guild_result:
-                        if isinstance(guild_result, dict):
-                            guild_name = guild_result.get('name')
-                            guild_rank = guild_result.get('rank')
-                        else:
-                            guild_name, guild_rank = guild_result
-                        value = f"{guild_name} (Rank: {guild_rank})"
-                    else:
-                        value = "None"
+        # Update character info labels
+        for field in self.char_info_labels.keys():
+            if field == "Guild":
+                guild_name = char_data.get('guild_name')
+                if guild_name:
+                    value = f"{guild_name} (Rank: {char_data.get('guild_rank')})"
                 else:
-                    value = char_data_dict.get(field, "Unknown")
-                    
-                    # Apply formatting for specific fields
-                    if field == "Class":
-                        # Convert class ID to name
-                        if isinstance(value, int):
-                            value = self.class_id_to_name.get(value, f"Unknown ({value})")
-                    elif field == "Race":
-                        # Convert race ID to name
-                        if isinstance(value, int):
-                            value = self.race_id_to_name.get(value, f"Unknown ({value})")
-                    elif field == "Deity":
-                        # Convert deity ID to name
-                        if isinstance(value, int):
-                            value = self.deity_id_to_name.get(value, f"Unknown ({value})")
-                    elif field == "Last Login":
-                        # Format Unix timestamp to readable date/time
-                        if value and value != "Unknown" and isinstance(value, int):
-                            try:
-                                dt = datetime.fromtimestamp(value)
-                                value = dt.strftime("%Y-%m-%d %H:%M")
-                            except (ValueError, OSError):
-                                value = "Unknown"
-                        else:
-                            value = "Unknown"
-                    elif field == "Time Played":
-                        # Format time played (in seconds)
-                        if value and value != "Unknown":
-                            hours = value // 3600
-                            minutes = (value % 3600) // 60
-                            value = f"{hours}h {minutes}m"
-                        else:
+                    value = "None"
+            else:
+                value = char_data_dict.get(field, "Unknown")
+
+                # Apply formatting for specific fields
+                if field == "Class":
+                    # Convert class ID to name
+                    if isinstance(value, int):
+                        value = self.class_id_to_name.get(value, f"Unknown ({value})")
+                elif field == "Race":
+                    # Convert race ID to name
+                    if isinstance(value, int):
+                        value = self.race_id_to_name.get(value, f"Unknown ({value})")
+                elif field == "Deity":
+                    # Convert deity ID to name
+                    if isinstance(value, int):
+                        value = self.deity_id_to_name.get(value, f"Unknown ({value})")
+                elif field == "Last Login":
+                    # Format Unix timestamp to readable date/time
+                    if value and value != "Unknown" and isinstance(value, int):
+                        try:
+                            dt = datetime.fromtimestamp(value)
+                            value = dt.strftime("%Y-%m-%d %H:%M")
+                        except (ValueError, OSError):
                             value = "Unknown"
-                
-                self.char_info_labels[field].config(text=str(value))
-        
-        # Load character buffs
-        self.load_character_buffs(char_id)
+                    else:
+                        value = "Unknown"
+                elif field == "Time Played":
+                    # Format time played (in seconds)
+                    if value and value != "Unknown":
+                        hours = value // 3600
+                        minutes = (value % 3600) // 60
+                        value = f"{hours}h {minutes}m"
+                    else:
+                        value = "Unknown"
+            
+            self.char_info_labels[field].config(text=str(value))
     
-    def load_character_buffs(self, char_id):
-        """Load character buffs"""
-        # Clear existing items
-        for item in self.buffs_tree.get_children():
-            self.buffs_tree.delete(item)
-        
-        # Fetch character buffs
-        query = """
-            SELECT cb.spell_id, sn.name
-            FROM character_buffs cb
-            LEFT JOIN spells_new sn ON cb.spell_id = sn.id
-            WHERE cb.character_id = %s
-            ORDER BY sn.name
-        """
-        buffs = self.db_manager.execute_query(query, (char_id,))
-        
-        # Insert buffs into treeview
+    def show_character_buffs(self, buffs):
+        """Fill the buffs tree"""
+        self.buffs_tree.delete(*self.buffs_tree.get_children())
+
+        # Values in the same order as the treeview columns: ["Spell ID", "Spell Name"]
         for buff in buffs:
-            # Convert dictionary to tuple of values ordered by columns
-            if isinstance(buff, dict):
-                # Extract values in the same order as the treeview columns: ["Spell ID", "Spell Name"]
-                buff_values = [
-                    buff.get('spell_id'), buff.get('name')
-                ]
-                self.buffs_tree.insert("", tk.END, values=buff_values)
-            else:
-                self.buffs_tree.insert("", tk.END, values=buff)
+            self.buffs_tree.insert("", tk.END, values=[buff.get('spell_id'), buff.get('name')])
     
+    def search_item_owners(self):
+        """Find every holder of the entered item IDs"""
+        try:
+            self.ownership_item_ids = parse_item_ids(self.ownership_ids_var.get())
+        except ValueError as e:
+            messagebox.showerror("Invalid Item IDs", str(e))
+            return
+        self.show_item_owners(0)
+
+    def show_item_owners(self, offset, refresh=False):
+        """Show one page of holders for the current item IDs"""
+        if not self.ownership_item_ids:
+            return
+        page = self.ownership_cache.get(
+            self.db_manager, self.ownership_item_ids, max(offset, 0), refresh=refresh
+        )
+        if page is None:
+            self.owners_tree.delete(*self.owners_tree.get_children())
+            self.owners_prev_button.configure(state="disabled")
+            self.owners_next_button.configure(state="disabled")
+            self.ownership_status_var.set("The ownership query failed; press Refresh to retry.")
+            return
+        self.ownership_offset = page.offset
+
+        self.owners_tree.delete(*self.owners_tree.get_children())
+        for holder in page.holders:
+            account = holder.account_name or ("" if holder.account_id is None else f"#{holder.account_id}")
+            self.owners_tree.insert("", tk.END, values=[
+                holder.item_id, holder.item_name, holder.source, holder.owner_name, account,
+                holder.stacks, holder.quantity, holder.slots
+            ])
+
+        shown_end = page.offset + len(page.holders)
+        if page.total:
+            self.ownership_status_var.set(f"{page.offset + 1}-{shown_end} of {page.total} holders")
+        else:
+            self.ownership_status_var.set("No holders found")
+        self.owners_prev_button.configure(state="normal" if page.offset > 0 else "disabled")
+        self.owners_next_button.configure(state="normal" if shown_end < page.total else "disabled")
+
+    # ------------------------------------------------------------------
+    # Bulk inventory operations
+    # ------------------------------------------------------------------
+    def show_bulk_operations(self):
+        """Open the bulk delete / replace / set charges dialog"""
+        try:
+            if self.bulk_window is not None and self.bulk_window.winfo_exists():
+                self.bulk_window.lift()
+                return
+        except tk.TclError:
+            pass
+
+        window = tk.Toplevel(self.main_frame)
+        window.title("Bulk Inventory Operations")
+        window.geometry("560x520")
+        window.grid_columnconfigure(0, weight=1)
+        self.bulk_window = window
+
+        items_frame = ttk.Frame(window, padding="5")
+        items_frame.grid(row=0, column=0, sticky="ew")
+        items_frame.grid_columnconfigure(1, weight=1)
+        ttk.Label(items_frame, text="Item IDs:").grid(row=0, column=0, sticky="w", padx=5)
+        self.bulk_items_var = tk.StringVar(value=self.ownership_ids_var.get())
+        ttk.Entry(items_frame, textvariable=self.bulk_items_var).grid(row=0, column=1, sticky="ew", padx=5)
+
+        scope_frame = ttk.LabelFrame(window, text="Scope (leave blank for all characters)", padding="5")
+        scope_frame.grid(row=1, column=0, sticky="ew", padx=5, pady=5)
+        scope_frame.grid_columnconfigure(1, weight=1)
+        self.bulk_accounts_var = tk.StringVar()
+        self.bulk_min_level_var = tk.StringVar()
+        self.bulk_max_level_var = tk.StringVar()
+        self.bulk_zones_var = tk.StringVar()
+        ttk.Label(scope_frame, text="Account IDs:").grid(row=0, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(scope_frame, textvariable=self.bulk_accounts_var).grid(
+            row=0, column=1, columnspan=3, sticky="ew", padx=5, pady=2
+        )
+        ttk.Label(scope_frame, text="Level from:").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(scope_frame, textvariable=self.bulk_min_level_var, width=6).grid(
+            row=1, column=1, sticky="w", padx=5, pady=2
+        )
+        ttk.Label(scope_frame, text="to:").grid(row=1, column=2, sticky="w", padx=5, pady=2)
+        ttk.Entry(scope_frame, textvariable=self.bulk_max_level_var, width=6).grid(
+            row=1, column=3, sticky="w", padx=5, pady=2
+        )
+        ttk.Label(scope_frame, text="Zone IDs:").grid(row=2, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(scope_frame, textvariable=self.bulk_zones_var).grid(
+            row=2, column=1, columnspan=3, sticky="ew", padx=5, pady=2
+        )
+
+        action_frame = ttk.LabelFrame(window, text="Action", padding="5")
+        action_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
+        self.bulk_action_var = tk.StringVar(value=ACTION_DELETE)
+        self.bulk_replacement_var = tk.StringVar()
+        self.bulk_charges_var = tk.StringVar()
+        ttk.Radiobutton(action_frame, text="Delete", value=ACTION_DELETE, variable=self.bulk_action_var).grid(
+            row=0, column=0, sticky="w", padx=5, pady=2
+        )
+        ttk.Radiobutton(
+            action_frame, text="Replace with item ID:", value=ACTION_REPLACE, variable=self.bulk_action_var
+        ).grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(action_frame, textvariable=self.bulk_replacement_var, width=10).grid(
+            row=1, column=1, sticky="w", padx=5, pady=2
+        )
+        ttk.Radiobutton(
+            action_frame, text="Set charges to:", value=ACTION_SET_CHARGES, variable=self.bulk_action_var
+        ).grid(row=2, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(action_frame, textvariable=self.bulk_charges_var, width=10).grid(
+            row=2, column=1, sticky="w", padx=5, pady=2
+        )
+
+        button_row = ttk.Frame(window, padding="5")
+        button_row.grid(row=3, column=0, sticky="ew")
+        ttk.Button(button_row, text="Preview", command=self.preview_bulk_operation).grid(row=0, column=0, padx=5)
+        self.bulk_apply_button = ttk.Button(
+            button_row, text="Apply", command=self.apply_bulk_operation, style="InventoryDelete.TButton"
+        )
+        self.bulk_apply_button.grid(row=0, column=1, padx=5)
+        ttk.Button(button_row, text="Pause", command=self.pause_bulk_job).grid(row=0, column=2, padx=5)
+
+        resume_row = ttk.Frame(window, padding="5")
+        resume_row.grid(row=4, column=0, sticky="ew")
+        resume_row.grid_columnconfigure(1, weight=1)
+        ttk.Label(resume_row, text="Unfinished:").grid(row=0, column=0, sticky="w", padx=5)
+        self.bulk_resume_var = tk.StringVar()
+        self.bulk_resume_combo = ttk.Combobox(resume_row, textvariable=self.bulk_resume_var, state="readonly")
+        self.bulk_resume_combo.grid(row=0, column=1, sticky="ew", padx=5)
+        self.bulk_resume_button = ttk.Button(resume_row, text="Resume", command=self.resume_bulk_job)
+        self.bulk_resume_button.grid(row=0, column=2, padx=5)
+        ttk.Button(resume_row, text="Discard", command=self.discard_bulk_job).grid(row=0, column=3, padx=5)
+
+        self.bulk_progress = ttk.Progressbar(window, mode="determinate", maximum=1)
+        self.bulk_progress.grid(row=5, column=0, sticky="ew", padx=10, pady=5)
+        self.bulk_status_var = tk.StringVar(value="Preview a job to see what it would change.")
+        ttk.Label(window, textvariable=self.bulk_status_var, justify="left", wraplength=520).grid(
+            row=6, column=0, sticky="nw", padx=10, pady=5
+        )
+
+        self.set_bulk_running(self.bulk_job is not None)
+        self.refresh_bulk_unfinished()
+
+    def set_bulk_running(self, running):
+        """Disable Apply and Resume while a job is running or waiting for its next step"""
+        state = "disabled" if running else "normal"
+        try:
+            self.bulk_apply_button.configure(state=state)
+            self.bulk_resume_button.configure(state=state)
+        except tk.TclError:
+            pass
+
+    def get_bulk_store(self):
+        if self.bulk_store is None:
+            self.bulk_store = BulkJobStore()
+        return self.bulk_store
+
+    def build_bulk_spec(self):
+        """Build a BulkJobSpec from the dialog. Raises ValueError with a message for the user."""
+        def optional_ids(text, label):
+            return parse_item_ids(text, label) if text.strip() else []
+
+        def optional_level(text, label):
+            if not text.strip():
+                return None
+            try:
+                return int(text)
+            except ValueError:
+                raise ValueError(f"{label} must be a whole number.")
+
+        def required_number(text, label):
+            try:
+                return int(text)
+            except ValueError:
+                raise ValueError(f"{label} must be a whole number.")
+
+        kind = self.bulk_action_var.get()
+        action = BulkAction(kind)
+        if kind == ACTION_REPLACE:
+            action.replacement_item_id = required_number(self.bulk_replacement_var.get(), "Replacement item ID")
+        elif kind == ACTION_SET_CHARGES:
+            action.charges = required_number(self.bulk_charges_var.get(), "Charges")
+        scope = BulkScope(
+            account_ids=optional_ids(self.bulk_accounts_var.get(), "account IDs"),
+            min_level=optional_level(self.bulk_min_level_var.get(), "Minimum level"),
+            max_level=optional_level(self.bulk_max_level_var.get(), "Maximum level"),
+            zone_ids=optional_ids(self.bulk_zones_var.get(), "zone IDs"),
+        )
+        return BulkJobSpec(parse_item_ids(self.bulk_items_var.get()), scope, action)
+
+    def describe_bulk_preview(self, spec, preview):
+        lines = [spec.describe()]
+        for item_id in spec.item_ids:
+            rows, characters = preview.per_item.get(item_id, (0, 0))
+            lines.append(f"Item {item_id}: {rows} inventory rows on {characters} characters")
+        lines.append(f"Total: {preview.rows} rows on {preview.characters} characters")
+        if preview.replacement_name:
+            lines.append(f"Replacement: {preview.replacement_name}")
+        return "\n".join(lines)
+
+    def preview_bulk_operation(self):
+        """Count what the job would change without changing anything"""
+        try:
+            spec = self.build_bulk_spec()
+            preview = preview_bulk_job(self.db_manager, spec)
+        except ValueError as e:
+            messagebox.showerror("Bulk Operation", str(e), parent=self.bulk_window)
+            return None
+        self.bulk_status_var.set(self.describe_bulk_preview(spec, preview))
+        return spec, preview
+
+    def apply_bulk_operation(self):
+        """Preview, confirm, then run the job chunk by chunk"""
+        if self.bulk_job is not None:
+            messagebox.showinfo("Bulk Operation", "A bulk job is already running.", parent=self.bulk_window)
+            return
+        previewed = self.preview_bulk_operation()
+        if previewed is None:
+            return
+        spec, preview = previewed
+        if not preview.rows:
+            messagebox.showinfo("Bulk Operation", "Nothing matches this job.", parent=self.bulk_window)
+            return
+        if not messagebox.askyesno(
+            "Confirm Bulk Operation",
+            f"{self.describe_bulk_preview(spec, preview)}\n\nThis cannot be undone. Continue?",
+            parent=self.bulk_window,
+        ):
+            return
+        server = self.db_manager.server_identity()
+        if server is None:
+            return
+        self.start_bulk_job(self.get_bulk_store().create(server, spec, preview.characters))
+
+    def start_bulk_job(self, job):
+        self.bulk_job = job
+        self.bulk_paused = False
+        self.set_bulk_running(True)
+        self.bulk_progress.configure(maximum=max(job.characters_total, 1), value=job.characters_done)
+        self.bulk_window.after(1, self._bulk_step)
+
+    def _bulk_step(self):
+        """Run one chunk, refresh what it touched, and schedule the next"""
+        job = self.bulk_job
+        if job is None:
+            return
+        if self.bulk_paused:
+            self.bulk_status_var.set(f"Paused after {job.characters_done} characters. Resume to continue.")
+            self.bulk_job = None
+            self.set_bulk_running(False)
+            self.refresh_bulk_unfinished()
+            return
+
+        character_ids = run_chunk(self.db_manager, self.get_bulk_store(), job)
+        if character_ids is None:
+            self.bulk_status_var.set(
+                f"A chunk failed after {job.characters_done} characters; nothing in it was changed. "
+                "Resume to retry."
+            )
+            self.bulk_job = None
+            self.set_bulk_running(False)
+            self.refresh_bulk_unfinished()
+            return
+
+        if character_ids:
+            self.refresh_player_summaries(character_ids)
+            self.prefetcher.invalidate(character_ids)
+        touched_items = list(job.spec.item_ids)
+        if job.spec.action.replacement_item_id:
+            touched_items.append(job.spec.action.replacement_item_id)
+        self.ownership_cache.invalidate(touched_items)
+
+        try:
+            self.bulk_progress.configure(
+                maximum=max(job.characters_total, job.characters_done, 1), value=job.characters_done
+            )
+        except tk.TclError:
+            pass
+        if character_ids:
+            self.bulk_status_var.set(
+                f"{job.spec.describe()}\n{job.characters_done} of ~{job.characters_total} characters, "
+                f"{job.rows_done} inventory rows changed"
+            )
+            self.main_frame.after(10, self._bulk_step)
+            return
+
+        self.bulk_status_var.set(
+            f"Done. {job.spec.describe()}\n{job.characters_done} characters, {job.rows_done} inventory rows changed"
+        )
+        self.bulk_job = None
+        self.set_bulk_running(False)
+        self.refresh_bulk_unfinished()
+        if self.player_tree.selection():
+            self.load_inventory()
+
+    def pause_bulk_job(self):
+        if self.bulk_job is not None:
+            self.bulk_paused = True
+
+    def refresh_bulk_unfinished(self):
+        """List jobs against this server that were paused, failed or interrupted"""
+        server = self.db_manager.server_identity()
+        self.bulk_unfinished = self.get_bulk_store().unfinished(server) if server else []
+        labels = [
+            f"#{job.job_id} {job.spec.describe()} ({job.characters_done}/{job.characters_total})"
+            for job in self.bulk_unfinished
+        ]
+        try:
+            self.bulk_resume_combo.configure(values=labels)
+            self.bulk_resume_var.set(labels[0] if labels else "")
+        except tk.TclError:
+            pass
+
+    def selected_unfinished_bulk_job(self):
+        index = self.bulk_resume_combo.current()
+        if index < 0 or index >= len(self.bulk_unfinished):
+            return None
+        return self.bulk_unfinished[index]
+
+    def resume_bulk_job(self):
+        if self.bulk_job is not None:
+            messagebox.showinfo("Bulk Operation", "A bulk job is already running.", parent=self.bulk_window)
+            return
+        job = self.selected_unfinished_bulk_job()
+        if job is not None:
+            self.start_bulk_job(job)
+
+    def discard_bulk_job(self):
+        job = self.selected_unfinished_bulk_job()
+        if job is None or (self.bulk_job is not None and self.bulk_job.job_id == job.job_id):
+            return
+        if messagebox.askyesno(
+            "Discard Bulk Job",
+            f"Forget job #{job.job_id}? Changes it already made stay in place.",
+            parent=self.bulk_window,
+        ):
+            self.get_bulk_store().discard(job.job_id)
+            self.refresh_bulk_unfinished()
+
+    # ------------------------------------------------------------------
+    # Economy report
+    # ------------------------------------------------------------------
+    def show_economy_report(self):
+        """Open the economy report, showing the last cached run for this server"""
+        try:
+            if self.economy_window is not None and self.economy_window.winfo_exists():
+                self.economy_window.lift()
+                return
+        except tk.TclError:
+            pass
+
+        window = tk.Toplevel(self.main_frame)
+        window.title("Economy Report")
+        window.geometry("760x520")
+        window.grid_rowconfigure(1, weight=1)
+        window.grid_columnconfigure(0, weight=1)
+        self.economy_window = window
+
+        header = ttk.Frame(window, padding="5")
+        header.grid(row=0, column=0, sticky="ew")
+        header.grid_columnconfigure(1, weight=1)
+        ttk.Button(header, text="Run Report", command=self.run_economy_report).grid(row=0, column=0, padx=5)
+        self.economy_status_var = tk.StringVar(value="No report yet for this server.")
+        ttk.Label(header, textvariable=self.economy_status_var).grid(row=0, column=1, sticky="w", padx=5)
+
+        notebook = ttk.Notebook(window)
+        notebook.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.economy_trees = {}
+        tabs = (
+            ("summary", "Summary", [("Statistic", 200, False), ("Platinum", 140, True)]),
+            ("distribution", "Distribution", [("Total Platinum", 160, True), ("Characters", 90, True),
+                                              ("", 320, False)]),
+            ("brackets", "Level Brackets", [("Levels", 70, True), ("Characters", 80, True),
+                                            ("Total", 110, True), ("Average", 90, True), ("Max", 100, True),
+                                            ("", 240, False)]),
+            ("holders", "Top Holders", [("ID", 60, True), ("Name", 120, False), ("Level", 50, True),
+                                        ("Account", 70, True), ("Plat", 90, True), ("Bank", 90, True),
+                                        ("Cursor", 80, True), ("Total", 100, True)]),
+            ("items", "Most-Held Items", [("Item ID", 70, True), ("Item Name", 220, False), ("Holders", 80, True),
+                                          ("Stacks", 80, True), ("Count", 90, True)]),
+        )
+        for key, title, columns in tabs:
+            frame = ttk.Frame(notebook)
+            frame.grid_rowconfigure(0, weight=1)
+            frame.grid_columnconfigure(0, weight=1)
+            notebook.add(frame, text=title)
+            names = [name or f"bar{index}" for index, (name, _width, _numeric) in enumerate(columns)]
+            tree = ttk.Treeview(frame, columns=names, show="headings", selectmode="browse")
+            for name, (text, width, numeric) in zip(names, columns):
+                tree.heading(name, text=text, command=lambda t=tree, c=name, n=numeric: self.sort_report_tree(t, c, n))
+                tree.column(name, width=width, anchor="e" if numeric else "w")
+            tree.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+            self.economy_trees[key] = tree
+
+        server = self.db_manager.server_identity()
+        report = self.get_economy_store().latest(server) if server else None
+        if report is not None:
+            self.show_economy_data(report)
+
+    def get_economy_store(self):
+        if self.economy_store is None:
+            self.economy_store = EconomyReportStore()
+        return self.economy_store
+
+    def run_economy_report(self):
+        """Recompute the report on the server and cache it"""
+        server = self.db_manager.server_identity()
+        if server is None:
+            return
+        self.economy_status_var.set("Running report...")
+        self.economy_window.update_idletasks()
+        report = run_report(self.db_manager)
+        if report is None:
+            self.economy_status_var.set("The report query failed.")
+            return
+        self.get_economy_store().save(server, report)
+        self.show_economy_data(report)
+
+    @staticmethod
+    def _report_bar(value, peak):
+        return "\u2588" * max(1, round(value * REPORT_BAR_WIDTH / peak)) if peak and value else ""
+
+    def show_economy_data(self, report):
+        """Fill every report tab from an EconomyReport"""
+        for tree in self.economy_trees.values():
+            tree.delete(*tree.get_children())
+
+        totals = report.totals
+        summary = self.economy_trees["summary"]
+        for label, key in (("Characters", "characters"), ("Platinum (carried)", "platinum"),
+                           ("Platinum (bank)", "platinum_bank"), ("Platinum (cursor)", "platinum_cursor"),
+                           ("Total platinum", "total"), ("Average per character", "average"),
+                           ("Richest character", "max_total")):
+            summary.insert("", tk.END, values=[label, f"{totals.get(key, 0):,}"])
+        for percent, value in report.percentiles:
+            summary.insert("", tk.END, values=[f"{percent}th percentile", f"{value:,}"])
+
+        distribution = self.economy_trees["distribution"]
+        peak = max((count for _low, _high, count in report.distribution), default=0)
+        for low, high, count in report.distribution:
+            label = "0" if high == 0 else f"{low:,} - {high:,}"
+            distribution.insert("", tk.END, values=[label, f"{count:,}", self._report_bar(count, peak)])
+
+        brackets = self.economy_trees["brackets"]
+        peak = max((row[3] for row in report.level_brackets), default=0)
+        for first, last, characters, total, average, max_total in report.level_brackets:
+            brackets.insert("", tk.END, values=[
+                f"{first}-{last}", f"{characters:,}", f"{total:,}", f"{average:,}", f"{max_total:,}",
+                self._report_bar(total, peak)
+            ])
+
+        holders = self.economy_trees["holders"]
+        for row in report.top_holders:
+            holders.insert("", tk.END, values=[
+                row["id"], row["name"], row["level"], row["account_id"], f"{row['platinum']:,}",
+                f"{row['platinum_bank']:,}", f"{row['platinum_cursor']:,}", f"{row['total']:,}"
+            ])
+
+        items = self.economy_trees["items"]
+        for row in report.top_items:
+            items.insert("", tk.END, values=[
+                row["item_id"], row["item_name"], f"{row['holders']:,}", f"{row['stacks']:,}", f"{row['quantity']:,}"
+            ])
+
+        generated = datetime.fromtimestamp(report.generated_at).strftime("%Y-%m-%d %H:%M")
+        self.economy_status_var.set(f"Generated {generated} in {report.elapsed:.1f}s")
+
+    def sort_report_tree(self, tree, col, numeric):
+        """Sort a report table by a column, toggling direction on repeat clicks"""
+        reverse = getattr(tree, "_sort_state", None) == (col, False)
+        tree._sort_state = (col, reverse)
+
+        def key(value):
+            if not numeric:
+                return str(value).lower()
+            # Ranges such as "11-20" sort by their first number
+            try:
+                return float(str(value).replace(",", "").split("-")[0])
+            except ValueError:
+                return 0.0
+
+        items = [(tree.set(child, col), child) for child in tree.get_children("")]
+        items.sort(key=lambda item: key(item[0]), reverse=reverse)
+        for index, (_value, child) in enumerate(items):
+            tree.move(child, "", index)
+
+    # ------------------------------------------------------------------
+    # Inventory snapshots
+    # ------------------------------------------------------------------
+    def get_snapshot_store(self):
+        if self.snapshot_store is None:
+            self.snapshot_store = InventorySnapshotStore()
+        return self.snapshot_store
+
+    def refresh_snapshot_list(self):
+        """List the saved snapshots of the selected character, newest first"""
+        self.snapshots_tree.delete(*self.snapshots_tree.get_children())
+        self.snapshot_infos = {}
+        if self.snapshot_char_id is None:
+            return
+        server = self.db_manager.server_identity()
+        if server is None:
+            return
+        for info in self.get_snapshot_store().for_character(server, self.snapshot_char_id):
+            self.snapshot_infos[str(info.snapshot_id)] = info
+            taken = datetime.fromtimestamp(info.taken_at).strftime("%Y-%m-%d %H:%M:%S")
+            self.snapshots_tree.insert("", tk.END, iid=str(info.snapshot_id), values=[
+                info.snapshot_id, taken, info.label, info.item_count, info.content_hash[:10]
+            ])
+        self.snapshot_status_var.set(f"{len(self.snapshot_infos)} snapshots")
+
+    def take_snapshot(self):
+        """Save the selected character's current inventory"""
+        if self.snapshot_char_id is None:
+            messagebox.showinfo("Snapshots", "Select a character first.")
+            return
+        server = self.db_manager.server_identity()
+        if server is None:
+            return
+        inventories = fetch_live_inventories(self.db_manager, [self.snapshot_char_id])
+        self.get_snapshot_store().add(server, inventories, label="Manual")
+        self.refresh_snapshot_list()
+
+    def selected_snapshots(self):
+        """Return the selected snapshots, oldest first"""
+        infos = [self.snapshot_infos[iid] for iid in self.snapshots_tree.selection() if iid in self.snapshot_infos]
+        return sorted(infos, key=lambda info: (info.taken_at, info.snapshot_id))
+
+    def compare_snapshots(self):
+        """Show what changed between the two selected snapshots"""
+        selected = self.selected_snapshots()
+        if len(selected) != 2:
+            messagebox.showinfo("Snapshots", "Select exactly two snapshots to compare.")
+            return
+        before, after = selected
+        store = self.get_snapshot_store()
+        if before.content_hash == after.content_hash:
+            changes = []
+        else:
+            changes = diff_rows(store.rows(before.snapshot_id), store.rows(after.snapshot_id))
+        self.show_snapshot_diff(changes, f"#{before.snapshot_id} to #{after.snapshot_id}")
+
+    def compare_snapshot_with_live(self):
+        """Show what changed between the selected snapshot and the character's inventory now"""
+        selected = self.selected_snapshots()
+        if len(selected) != 1:
+            messagebox.showinfo("Snapshots", "Select one snapshot to compare with the live inventory.")
+            return
+        snapshot = selected[0]
+        live = fetch_live_inventories(self.db_manager, [snapshot.character_id])
+        live_rows = live.get(snapshot.character_id, ("", []))[1]
+        changes = diff_rows(self.get_snapshot_store().rows(snapshot.snapshot_id), live_rows)
+        self.show_snapshot_diff(changes, f"#{snapshot.snapshot_id} to live")
+
+    def show_snapshot_diff(self, changes, description):
+        """Fill the diff table, naming every item involved with one items query"""
+        self.snapshot_diff_tree.delete(*self.snapshot_diff_tree.get_children())
+        item_ids = sorted({
+            side[0] for change in changes for side in (change.before, change.after) if side is not None
+        })
+        names = {}
+        if item_ids:
+            rows = self.db_manager.execute_query(
+                f"SELECT id, Name FROM items WHERE id IN ({', '.join(['%s'] * len(item_ids))})", tuple(item_ids)
+            )
+            names = {row["id"]: row["Name"] for row in rows}
+
+        def describe(side):
+            if side is None:
+                return ""
+            item_id, charges = side
+            return f"{names.get(item_id, 'Unknown Item')} ({item_id}) x{charges}"
+
+        for change in changes:
+            self.snapshot_diff_tree.insert("", tk.END, values=[
+                SLOT_ID_TO_NAME.get(change.slot_id, f"Slot {change.slot_id}"), change.kind,
+                describe(change.before), describe(change.after)
+            ])
+        self.snapshot_status_var.set(f"{description}: {len(changes)} slots changed")
+
+    def delete_snapshots(self):
+        selected = self.selected_snapshots()
+        if not selected:
+            return
+        if messagebox.askyesno("Delete Snapshots", f"Delete {len(selected)} snapshot(s)?"):
+            self.get_snapshot_store().delete(info.snapshot_id for info in selected)
+            self.snapshot_diff_tree.delete(*self.snapshot_diff_tree.get_children())
+            self.refresh_snapshot_list()
+
+    def use_loaded_players_for_schedule(self):
+        """Schedule every character currently listed in the player list"""
+        ids = [self.player_tree.set(item, "ID") for item in self.player_tree.get_children()]
+        self.schedule_ids_var.set(", ".join(ids))
+
+    def toggle_snapshot_schedule(self):
+        """Start snapshotting the entered characters in the background, or stop the running schedule"""
+        if self.snapshot_scheduler is not None and self.snapshot_scheduler.running:
+            self.snapshot_scheduler.stop()
+            self.schedule_status_var.set("Stopping after the current run...")
+            return
+
+        try:
+            character_ids = parse_item_ids(self.schedule_ids_var.get(), label="character IDs")
+            try:
+                interval = float(self.schedule_interval_var.get())
+            except ValueError:
+                interval = 0
+            if interval <= 0:
+                raise ValueError("The interval must be a number of minutes greater than zero.")
+        except ValueError as e:
+            messagebox.showerror("Invalid Schedule", str(e))
+            return
+        settings = self.db_manager.connection_settings()
+        server = self.db_manager.server_identity()
+        if not settings["host"] or server is None:
+            return
+
+        self.snapshot_scheduler = SnapshotScheduler(settings, server, character_ids, interval * 60)
+        self.snapshot_scheduler_runs = 0
+        self.snapshot_scheduler.start()
+        self.schedule_button.configure(text="Stop Schedule")
+        self.poll_snapshot_schedule()
+
+    def poll_snapshot_schedule(self):
+        """Show the scheduler's progress and pick up its snapshots of the selected character"""
+        scheduler = self.snapshot_scheduler
+        if scheduler is None:
+            return
+        self.schedule_status_var.set(f"{len(scheduler.character_ids)} characters: {scheduler.status}")
+        if scheduler.runs != self.snapshot_scheduler_runs:
+            self.snapshot_scheduler_runs = scheduler.runs
+            if self.snapshot_char_id in scheduler.character_ids:
+                self.refresh_snapshot_list()
+        if scheduler.running:
+            self.main_frame.after(1000, self.poll_snapshot_schedule)
+        else:
+            self.schedule_button.configure(text="Start Schedule")
+
     def display_item_details(self, event=None):
-        """CRITICAL: Handle item selection and display stats on image overlay - EXACT COPY from loot tool"""
+        """Handle item selection and display the shared item card"""
         # Determine which treeview triggered the event
         if not event:
             return
@@ -926,197 +1603,12 @@ class InventoryManagerTool:
             return
        
         item_id = tree.item(selected_item, "values")[1]
-       
-        for item in self.canvas.find_all():  # Clear previous item image and stats
-            self.canvas.delete(item) 
-        
-        if hasattr(self, 'bg_image') and self.bg_image:
-            self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image)  # Redraw the background image
-       
-        query = """
-            SELECT DISTINCT Name, aagi, ac, accuracy, acha, adex, aint, asta, astr, attack, augrestrict,  
-                   augtype, avoidance, awis, bagsize, bagslots, bagtype, bagwr, banedmgamt, banedmgraceamt, 
-                   banedmgbody, banedmgrace, classes, color, combateffects, extradmgskill, extradmgamt, cr, damage, 
-                   damageshield, deity, delay, dotshielding, dr, elemdmgtype, elemdmgamt, endur, fr, fvnodrop, 
-                   haste, hp, regen, icon, itemclass, itemtype, lore, loregroup, magic, mana, manaregen, enduranceregen, mr, nodrop, norent, pr, races, 
-                   `range`, reclevel, recskill, reqlevel, shielding, size, skillmodtype, skillmodvalue, 
-                   slots, clickeffect, spellshield, strikethrough, stunresist, weight, attuneable, svcorruption, skillmodmax,
-                   heroic_str, heroic_int, heroic_wis, heroic_agi, heroic_dex, 
-                   heroic_sta, heroic_cha, heroic_pr, heroic_dr, heroic_fr, 
-                   heroic_cr, heroic_mr, heroic_svcorrup, healamt, spelldmg, clairvoyance, backstabdmg
-            FROM items
-            WHERE id = %s
-        """
-        item_data = self.db_manager.execute_query(query, (item_id,), fetch_all=False)
-        
-        if item_data:
-            item_stats = dict(item_data)
-            
-            # Handle icon - display item image
-            icon_id = item_stats.get("icon")
-            if icon_id:
-                try:
-                    # Load icon image based on icon_id
-                    icon_path = f"images/icons/item_{icon_id}.gif"  # Adjust path format as needed
-                    item_icon = Image.open(icon_path)
-                    item_photo = ImageTk.PhotoImage(item_icon)
-                    
-                    # Save reference to prevent garbage collection
-                    self.canvas.item_photo = item_photo  
-                    
-                    # Display icon at specific pixel location
-                    self.canvas.create_image(28, 57, image=item_photo)
-                except Exception as e:
-                    print(f"Could not load icon: {e}")
-            
-            # Handle classes bitmask using centralized dictionary
-            classes_bitmask = item_stats.get("classes")
-            if classes_bitmask is not None:
-                # Convert to int if it's a string
-                if isinstance(classes_bitmask, str):
-                    classes_bitmask = int(classes_bitmask)
-                
-                if classes_bitmask == 65535:
-                    item_stats["classes"] = "ALL"
-                else:
-                    class_names = [
-                        class_name
-                        for bit_value, class_name in self.class_bitmask_display.items()
-                        if bit_value != 65535 and classes_bitmask & bit_value
-                    ]
-                    item_stats["classes"] = ", ".join(class_names)
-            
-            # Handle races bitmask using centralized dictionary
-            races_bitmask = item_stats.get("races")
-            if races_bitmask is not None:
-                # Convert to int if it's a string
-                if isinstance(races_bitmask, str):
-                    races_bitmask = int(races_bitmask)
-                    
-                if races_bitmask == 65535:
-                    item_stats["races"] = "ALL"
-                else:
-                    race_names = [
-                        race_name
-                        for bit_value, race_name in self.race_bitmask_display.items()
-                        if bit_value != 65535 and races_bitmask & bit_value
-                    ]
-                    item_stats["races"] = ", ".join(race_names)
-    
-            # Handle item slots bitmask using centralized dictionary
-            slots_bitmask = item_stats.get("slots")  
-            if slots_bitmask is not None:
-                # Convert to int if it's a string
-                if isinstance(slots_bitmask, str):
-                    slots_bitmask = int(slots_bitmask)
-                    
-                slot_names = []
-                for bit_value, slot_name in SLOT_BITMASK_DISPLAY.items():
-                    if slots_bitmask & bit_value:
-                        if slot_name not in slot_names:
-                            slot_names.append(slot_name)
-                item_stats["slots"] = ", ".join(slot_names)
-            
-            # Use the centralized display configuration
-            config = ITEM_STAT_DISPLAY_CONFIG
-            
-            # Display header information
-            for stat_name, pos_config in config["header_positions"].items():
-                if stat_name in item_stats and item_stats[stat_name] is not None:
-                    value = item_stats[stat_name]
-                    if value == "":
-                        continue
-                    
-                    if pos_config.get("label") is None:
-                        stat_text = f"{value}"
-                    else:
-                        stat_text = f"{pos_config['label']}: {value}"
-    
-                    self.canvas.create_text(
-                        pos_config["x"], 
-                        pos_config["y"], 
-                        text=stat_text, 
-                        fill=pos_config["color"], 
-                        anchor="nw", 
-                        font=pos_config["font"]
-                    )
-    
-            # Display special property row
-            property_config = config["property_row"]
-            items_placed = 0
-            
-            for prop_name, prop_config in property_config["properties"].items():
-                if prop_name in item_stats and item_stats[prop_name] is not None:
-                    value = item_stats[prop_name]
-                    
-                    if "format" in prop_config:
-                        formatted_value = prop_config["format"](value)
-                        if not formatted_value:
-                            continue
-                        value = formatted_value
-                    elif value == "":
-                        continue
-    
-                    current_x = property_config["base_x"] + (items_placed * property_config["spacing"])
-    
-                    self.canvas.create_text(current_x, property_config["y"], text=value, 
-                                          fill=prop_config["color"], anchor="nw", font=prop_config["font"])
-    
-                    items_placed += 1
-            
-            # Display stat columns
-            def display_column_stats(column_config, item_stats):
-                x = column_config["x"]
-                y = column_config["y"]
-                spacing = column_config["spacing"]
-                
-                for stat in column_config["stats"]:
-                    stat_name = stat["name"]
-                    stat_label = stat["label"]
-                    stat_color = stat["color"]
-                    
-                    if stat_name in item_stats and item_stats[stat_name] != 0:
-                        value = item_stats[stat_name]
-                        stat_text = f"{stat_label}: {value}"
-                        
-                        self.canvas.create_text(
-                            x, y, 
-                            text=stat_text, 
-                            fill=stat_color, 
-                            anchor="nw", 
-                            font=("Arial", 8)
-                        )
-                        
-                        if "heroic_stats" in column_config:
-                            for heroic_stat in column_config["heroic_stats"]:
-                                if heroic_stat["label"] == stat_label:
-                                    heroic_stat_name = heroic_stat["name"]
-                                    if heroic_stat_name in item_stats and item_stats[heroic_stat_name] != 0:
-                                        heroic_value = item_stats[heroic_stat_name]
-                                        heroic_text = f" ({heroic_value})"
-                                        
-                                        try:
-                                            bbox = self.canvas.bbox(self.canvas.find_all()[-1])
-                                            if bbox:
-                                                heroic_x = bbox[2]
-                                            else:
-                                                heroic_x = x + 50
-                                        except:
-                                            heroic_x = x + 50
-                                        
-                                        self.canvas.create_text(
-                                            heroic_x, y, 
-                                            text=heroic_text, 
-                                            fill="gold", 
-                                            anchor="nw", 
-                                            font=("Arial", 9)
-                                        )
-    
-                        y += spacing
-            
-            for column in config["stat_columns"]:
-                display_column_stats(column, item_stats)
-    
+
+        if not self.item_cards.draw_card(self.canvas, item_id):
+            self.canvas.delete("all")
+            if hasattr(self, 'bg_image') and self.bg_image:
+                self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image)
+
     def delete_selected_item(self):
         """Delete selected item"""
         # Determine which treeview has selection
@@ -1161,6 +1653,9 @@ class InventoryManagerTool:
         # Delete from Database
         delete_query = "DELETE FROM inventory WHERE character_id = %s AND slot_id = %s AND item_id = %s"
         self.db_manager.execute_update(delete_query, (char_id, slot_id, item_id))
+        self.refresh_player_summaries([char_id])
+        self.prefetcher.invalidate([char_id])
+        self.ownership_cache.invalidate([item_id])
         
         # Remove from GUI
         tree.delete(selected_item)
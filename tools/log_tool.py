@@ -1,15 +1,44 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, filedialog, messagebox
+import bisect
+import calendar
 import os
-import re
+import queue
+import sqlite3
+import time
+from array import array
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Add parent directory to path for imports if needed
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from shared.coordinate_export import (
+    DEFAULT_DEDUPE_DISTANCE,
+    DEFAULT_RESPAWN_SECONDS,
+    ExportPoint,
+    collect_points,
+    dedupe_points,
+    export_grid,
+    export_spawns,
+    write_csv,
+)
+from shared.log_cache import SEARCH_PAGE_SIZE, LogIndexCache, SearchPage
+from shared.log_store import LogStore, TimeIndex, histogram, make_ref, merge_keyword_rows, split_ref
+from shared.log_parser import (
+    LogEntry,
+    LogParser,
+    LogParseWorker,
+    is_compressed,
+    is_log_file_name,
+    iter_log_lines,
+    log_character_name,
+    log_data_size,
+    read_log_line,
+)
+
 
 class _TreeviewScrollMixin:
     """Provide invisible scrollbar behaviour for scrollable widgets."""
@@ -52,29 +81,25 @@ class _TreeviewScrollMixin:
             widget.bind("<Shift-Button-5>", lambda event: _on_mousewheel(event, horizontal=True))
 
 
-@dataclass
-class LogEntry:
-    timestamp: str
-    channel: str
-    speaker: str
-    message: str
-    raw_line: str
-    coordinates: Optional[Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]]
-
-
 class LogManagerTool(_TreeviewScrollMixin):
     """Log Manager Tool - load EQ client logs and group messages by keyword."""
 
-    LOG_LINE_RE = re.compile(r"^\[(?P<timestamp>.*?)\]\s+(?P<content>.*)$")
-    QUOTED_MESSAGE_RE = re.compile(r"^(?P<prefix>[^']*)'(?P<message>.*)'$")
-    LOCATION_RE = re.compile(
-        r"Your Location is\s+(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)(?:,\s*(-?\d+(?:\.\d+)?))?",
-        re.IGNORECASE,
-    )
-    LOCATION_FOR_RE = re.compile(
-        r"Location for .*?\|\s*XYZ:\s*(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?),\s*(-?\d+(?:\.\d+)?)(?:\s*Heading:\s*(-?\d+(?:\.\d+)?))?",
-        re.IGNORECASE,
-    )
+    PARSE_POLL_MS = 50
+    FOLLOW_POLL_MS = 500
+    FOLLOW_MAX_BYTES = 1 << 20
+    MAX_TIMELINE_WORKERS = 4
+    TIME_FILTER_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+    # Window presets in seconds, measured back from the newest loaded entry
+    TIME_WINDOWS = {
+        "All": None,
+        "Last 30 minutes": 30 * 60,
+        "Last hour": 60 * 60,
+        "Last 6 hours": 6 * 60 * 60,
+        "Last day": 24 * 60 * 60,
+        "Last week": 7 * 24 * 60 * 60,
+    }
+    HISTOGRAM_BUCKETS = {"Minute": 60, "Hour": 60 * 60}
+    HISTOGRAM_BAR_WIDTH = 40
 
     def __init__(self, parent_frame, db_manager=None):
         self.parent = parent_frame
@@ -87,7 +112,10 @@ class LogManagerTool(_TreeviewScrollMixin):
         self.main_frame.grid(row=0, column=0, sticky="nsew")
 
         # State
-        self.keyword_entries: Dict[str, List[LogEntry]] = defaultdict(list)
+        # Entries live in columnar LogStores; keyword_entries maps each keyword to
+        # entry references (see shared.log_store.make_ref) in time order.
+        self.stores: List[LogStore] = []
+        self.keyword_entries: Dict[str, array] = {}
         self.log_directory: str = ""
         self.logs_path: str = ""
         self.log_files: List[str] = []
@@ -98,7 +126,65 @@ class LogManagerTool(_TreeviewScrollMixin):
         self.current_keyword: Optional[str] = None
         self.selected_keyword: Optional[str] = None
         self.keyword_tree_ids: Dict[str, str] = {}
-        self.entry_item_map: Dict[str, LogEntry] = {}
+        self.visible_keywords: List[str] = []
+        self.keyword_filter_text = ""
+        self.entry_item_map: Dict[str, int] = {}
+        self.entry_tree_ids: Dict[int, str] = {}
+        self.visible_refs: List[int] = []
+        self.entry_filter_state: Optional[Tuple] = None
+        self.keyword_order: List[str] = []
+        self.parse_worker: Optional[LogParseWorker] = None
+        self.parse_status_var = tk.StringVar()
+        self.follow_var = tk.BooleanVar(value=False)
+        self.parallel_var = tk.BooleanVar(value=(os.cpu_count() or 1) > 1)
+        self.log_parser = LogParser()
+        self.parsed_path: str = ""
+        self.parsed_offset = 0
+        self.parsed_file_id: Optional[int] = None
+        self.parse_complete = False
+        self.log_cache: Optional[LogIndexCache] = None
+        self.follow_job: Optional[str] = None
+        self.all_logs_var = tk.BooleanVar(value=False)
+        self.speaker_filter_var = tk.StringVar()
+        self.time_from_var = tk.StringVar()
+        self.time_to_var = tk.StringVar()
+        self.time_window_var = tk.StringVar(value="All")
+        # Time-sorted entry references per keyword; the None key indexes every entry
+        self.time_indexes: Dict[Optional[str], TimeIndex] = {}
+        self.histogram_window: Optional[tk.Toplevel] = None
+        self.histogram_bucket_var = tk.StringVar(value="Minute")
+        self.histogram_scope_var = tk.StringVar()
+        self.histogram_items: Dict[str, int] = {}
+        self.search_var = tk.StringVar()
+        self.search_status_var = tk.StringVar()
+        self.search_window: Optional[tk.Toplevel] = None
+        self.search_query = ""
+        self.search_file_ids: Optional[List[int]] = None
+        self.search_page_start = 0
+        self.search_page: Optional[SearchPage] = None
+        self.search_items: Dict[str, Tuple[str, int]] = {}
+        self.export_window: Optional[tk.Toplevel] = None
+        self.export_keywords_var = tk.StringVar()
+        self.export_distance_var = tk.StringVar(value=str(DEFAULT_DEDUPE_DISTANCE))
+        self.export_target_var = tk.StringVar(value="grid")
+        self.export_zone_var = tk.StringVar()
+        self.export_grid_var = tk.StringVar()
+        self.export_pause_var = tk.StringVar(value="0")
+        self.export_spawngroup_var = tk.StringVar()
+        self.export_version_var = tk.StringVar(value="0")
+        self.export_respawn_var = tk.StringVar(value=str(DEFAULT_RESPAWN_SECONDS))
+        self.export_variance_var = tk.StringVar(value="0")
+        self.export_status_var = tk.StringVar()
+        # path -> (size, mtime_ns, store) for every log in the All characters timeline
+        self.timeline_files: Dict[str, Tuple[int, int, LogStore]] = {}
+        self.timeline_workers: Dict[str, LogParseWorker] = {}
+        self.timeline_pending: List[str] = []
+        self.timeline_stats: Dict[str, Tuple[int, int]] = {}
+        self.timeline_batches: Dict[str, LogStore] = {}
+        self.timeline_offsets: Dict[str, int] = {}
+        # path -> error text for logs that could not be parsed in the last timeline load
+        self.timeline_errors: Dict[str, str] = {}
+        self.timeline_total_bytes = 0
 
         # Build UI
         self.create_ui()
@@ -133,15 +219,42 @@ class LogManagerTool(_TreeviewScrollMixin):
         )
         self.load_button = ttk.Button(control_frame, text="Load", command=self.load_selected_file, width=8)
         self.load_button.grid(row=0, column=3, padx=(5, 0))
+        self.cancel_button = ttk.Button(
+            control_frame, text="Cancel", command=self.cancel_parse, width=8, state="disabled"
+        )
+        self.cancel_button.grid(row=0, column=4, padx=(5, 0))
 
         ttk.Label(control_frame, text="Selected Path:").grid(row=1, column=0, sticky="w", pady=(5, 0))
         file_entry = ttk.Entry(control_frame, textvariable=self.loaded_file_var, state="readonly")
         file_entry.grid(row=1, column=1, sticky="ew", pady=(5, 0))
+        ttk.Checkbutton(
+            control_frame, text="All characters", variable=self.all_logs_var, command=self.update_load_state
+        ).grid(row=1, column=2, columnspan=3, sticky="w", padx=(5, 0), pady=(5, 0))
 
         ttk.Label(control_frame, text="Keyword Filter:").grid(row=2, column=0, sticky="w", pady=(5, 0))
         keyword_filter_entry = ttk.Entry(control_frame, textvariable=self.keyword_filter_var)
         keyword_filter_entry.grid(row=2, column=1, sticky="ew", pady=(5, 0))
         self.keyword_filter_var.trace_add("write", lambda *args: self.refresh_keyword_tree())
+        ttk.Checkbutton(
+            control_frame, text="Follow", variable=self.follow_var, command=self.on_follow_toggled
+        ).grid(row=2, column=2, sticky="w", padx=(5, 0), pady=(5, 0))
+        ttk.Checkbutton(control_frame, text="Multi-core", variable=self.parallel_var).grid(
+            row=2, column=3, columnspan=2, sticky="w", padx=(5, 0), pady=(5, 0)
+        )
+
+        ttk.Label(control_frame, text="Search Logs:").grid(row=3, column=0, sticky="w", pady=(5, 0))
+        search_entry = ttk.Entry(control_frame, textvariable=self.search_var)
+        search_entry.grid(row=3, column=1, sticky="ew", pady=(5, 0))
+        search_entry.bind("<Return>", lambda event: self.search_logs())
+        ttk.Button(control_frame, text="Search", command=self.search_logs, width=10).grid(
+            row=3, column=2, columnspan=3, sticky="w", padx=(5, 0), pady=(5, 0)
+        )
+
+        self.parse_progress = ttk.Progressbar(control_frame, mode="determinate", maximum=100)
+        self.parse_progress.grid(row=4, column=1, sticky="ew", pady=(5, 0))
+        ttk.Label(control_frame, textvariable=self.parse_status_var).grid(
+            row=4, column=2, columnspan=3, sticky="w", padx=(5, 0), pady=(5, 0)
+        )
 
     def create_content_area(self):
         content_frame = ttk.Frame(self.main_frame)
@@ -187,6 +300,26 @@ class LogManagerTool(_TreeviewScrollMixin):
         entry_filter_entry.grid(row=0, column=1, sticky="ew", padx=(5, 0))
         self.entry_filter_var.trace_add("write", lambda *args: self.refresh_entry_tree())
 
+        range_row = ttk.Frame(filter_row)
+        range_row.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+        range_row.grid_columnconfigure(1, weight=1)
+        ttk.Label(range_row, text="Speaker:").grid(row=0, column=0, sticky="w")
+        ttk.Entry(range_row, textvariable=self.speaker_filter_var).grid(row=0, column=1, sticky="ew", padx=(5, 10))
+        ttk.Label(range_row, text="From:").grid(row=0, column=2, sticky="w")
+        ttk.Entry(range_row, textvariable=self.time_from_var, width=19).grid(row=0, column=3, padx=(5, 10))
+        ttk.Label(range_row, text="To:").grid(row=0, column=4, sticky="w")
+        ttk.Entry(range_row, textvariable=self.time_to_var, width=19).grid(row=0, column=5, padx=(5, 10))
+        ttk.Label(range_row, text="Window:").grid(row=0, column=6, sticky="w")
+        ttk.Combobox(
+            range_row,
+            textvariable=self.time_window_var,
+            state="readonly",
+            values=list(self.TIME_WINDOWS),
+            width=15,
+        ).grid(row=0, column=7, padx=(5, 0))
+        for var in (self.speaker_filter_var, self.time_from_var, self.time_to_var, self.time_window_var):
+            var.trace_add("write", lambda *args: self.refresh_entry_tree())
+
         button_row = ttk.Frame(entries_frame)
         button_row.grid(row=1, column=0, sticky="ew", pady=(5, 5))
 
@@ -205,20 +338,32 @@ class LogManagerTool(_TreeviewScrollMixin):
             state="disabled",
         )
         self.copy_coords_commas_btn.grid(row=0, column=2, padx=(0, 5))
-        ttk.Button(button_row, text="Refresh", command=self.load_selected_file, width=10).grid(row=0, column=3)
+        ttk.Button(button_row, text="Copy Line", command=self.copy_raw_line, width=10).grid(
+            row=0, column=3, padx=(0, 5)
+        )
+        ttk.Button(button_row, text="Histogram", command=self.show_histogram, width=10).grid(
+            row=0, column=4, padx=(0, 5)
+        )
+        ttk.Button(button_row, text="Export Coordinates", command=self.show_coordinate_export, width=18).grid(
+            row=0, column=5, padx=(0, 5)
+        )
+        ttk.Button(button_row, text="Refresh", command=self.load_selected_file, width=10).grid(row=0, column=6)
 
         self.entry_tree = ttk.Treeview(
             entries_frame,
-            columns=("timestamp", "channel", "speaker", "message"),
+            columns=("timestamp", "character", "channel", "speaker", "message"),
+            displaycolumns=("timestamp", "channel", "speaker", "message"),
             show="headings",
             selectmode="browse",
         )
         self._make_treeview_invisible_scroll(self.entry_tree)
         self.entry_tree.heading("timestamp", text="Timestamp")
+        self.entry_tree.heading("character", text="Character")
         self.entry_tree.heading("channel", text="Channel")
         self.entry_tree.heading("speaker", text="Speaker")
         self.entry_tree.heading("message", text="Message")
         self.entry_tree.column("timestamp", width=155, anchor="w")
+        self.entry_tree.column("character", width=110, anchor="w")
         self.entry_tree.column("channel", width=150, anchor="w")
         self.entry_tree.column("speaker", width=150, anchor="w")
         self.entry_tree.column("message", width=600, anchor="w")
@@ -239,9 +384,7 @@ class LogManagerTool(_TreeviewScrollMixin):
         if self.logs_path and os.path.isdir(self.logs_path):
             files = [
                 f for f in os.listdir(self.logs_path)
-                if os.path.isfile(os.path.join(self.logs_path, f))
-                and f.lower().startswith("eqlog_")
-                and f.lower().endswith(".txt")
+                if os.path.isfile(os.path.join(self.logs_path, f)) and is_log_file_name(f)
             ]
             files.sort(key=lambda name: name.lower())
             self.log_files = files
@@ -271,10 +414,17 @@ class LogManagerTool(_TreeviewScrollMixin):
 
     def update_load_state(self):
         if self.load_button:
-            state = "normal" if self.loaded_file_var.get() else "disabled"
+            parsing = self.parse_worker is not None or bool(self.timeline_workers)
+            loadable = bool(self.log_files) if self.all_logs_var.get() else bool(self.loaded_file_var.get())
+            state = "normal" if loadable and not parsing else "disabled"
             self.load_button.configure(state=state)
+            self.cancel_button.configure(state="normal" if parsing else "disabled")
 
     def load_selected_file(self):
+        if self.all_logs_var.get():
+            self.load_all_logs()
+            return
+
         filepath = self.loaded_file_var.get()
         if not filepath:
             messagebox.showinfo("No File", "Please select a log file to load.", parent=self.main_frame)
@@ -282,94 +432,523 @@ class LogManagerTool(_TreeviewScrollMixin):
         if not os.path.exists(filepath):
             messagebox.showerror("File Missing", "The selected log file no longer exists.", parent=self.main_frame)
             return
+        if self.parse_worker is not None or self.timeline_workers:
+            return
+        self.start_parse(filepath)
+
+    def start_parse(self, filepath: str):
+        self.clear_parsed_entries()
+        self.selected_keyword = None
 
+        self.log_parser = LogParser()
+        self.stores = [LogStore(filepath)]
+        self.keyword_entries = self.stores[0].keyword_rows
+        self.parsed_path = filepath
+        self.parsed_offset = 0
+        self.parsed_file_id = None
+        self.parse_complete = False
+        self.parse_worker = LogParseWorker(
+            filepath,
+            parser=self.log_parser,
+            include_partial=not self.follow_var.get(),
+            parallel=self.parallel_var.get(),
+        )
+        self.entry_tree.configure(displaycolumns=("timestamp", "channel", "speaker", "message"))
+        self.parse_progress.configure(value=0)
+        self.parse_status_var.set("Parsing...")
+        self.update_load_state()
+        self.parse_worker.start()
+        self.main_frame.after(self.PARSE_POLL_MS, self._poll_parse_worker)
+
+    def cancel_parse(self):
+        if self.parse_worker is not None:
+            self.parse_worker.cancel()
+            self.parse_status_var.set("Cancelling...")
+        if self.timeline_workers or self.timeline_pending:
+            self.timeline_pending.clear()
+            for worker in self.timeline_workers.values():
+                worker.cancel()
+            self.parse_status_var.set("Cancelling...")
+
+    def _poll_parse_worker(self):
+        worker = self.parse_worker
+        if worker is None:
+            return
         try:
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as log_file:
-                lines = log_file.readlines()
-        except OSError as err:
-            messagebox.showerror("Read Error", f"Could not read log file:\n{err}", parent=self.main_frame)
+            if not self.main_frame.winfo_exists():
+                worker.cancel()
+                return
+        except tk.TclError:
+            worker.cancel()
             return
 
-        self.parse_log_lines(lines)
-        self.refresh_keyword_tree()
-        self.entry_tree.delete(*self.entry_tree.get_children())
-        self.selected_keyword = None
-        self.set_coordinate_buttons_state(False)
+        finished = False
+        while True:
+            try:
+                kind, payload, offset = worker.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "error":
+                finished = True
+                self.parse_status_var.set("Read failed")
+                messagebox.showerror("Read Error", f"Could not read log file:\n{payload}", parent=self.main_frame)
+                break
+
+            self.add_parsed_entries(payload)
+            self.parsed_offset = offset
+            if worker.total_bytes:
+                self.parse_progress.configure(value=min(100, offset * 100 / worker.total_bytes))
+            if kind in ("done", "cancelled"):
+                finished = True
+                self.parsed_file_id = worker.file_id
+                # Following resumes from a complete parse only
+                self.parse_complete = kind == "done"
+                total = sum(len(entries) for entries in self.keyword_entries.values())
+                label = "Loaded" if kind == "done" else "Cancelled after"
+                self.parse_status_var.set(f"{label} {total:,} entries")
+                break
+
+        if finished:
+            self.parse_worker = None
+            self.update_load_state()
+        else:
+            self.main_frame.after(self.PARSE_POLL_MS, self._poll_parse_worker)
 
     # ------------------------------------------------------------------
-    # Parsing and data preparation
+    # All characters timeline
     # ------------------------------------------------------------------
-    def parse_log_lines(self, lines: List[str]):
-        self.keyword_entries.clear()
-        self.entry_item_map.clear()
-        self.current_keyword = None
+    def load_all_logs(self):
+        """Parse every log in the logs directory and merge them into one timeline.
 
-        last_keyword_for_loc: Optional[str] = None
+        Logs whose size and mtime are unchanged since the last load keep their
+        entries; only new or changed files are parsed again.
+        """
+        if self.parse_worker is not None or self.timeline_workers:
+            return
+        paths = [os.path.join(self.logs_path, name) for name in self.log_files]
+        if not paths:
+            messagebox.showinfo("No Logs", "No log files were found in the logs directory.", parent=self.main_frame)
+            return
 
-        for raw_line in lines:
-            line = raw_line.strip()
-            if not line:
-                continue
+        for path in [p for p in self.timeline_files if p not in paths]:
+            del self.timeline_files[path]
 
-            log_match = self.LOG_LINE_RE.match(line)
-            if not log_match:
+        self.timeline_pending = []
+        self.timeline_stats.clear()
+        self.timeline_offsets.clear()
+        self.timeline_errors.clear()
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.timeline_files.pop(path, None)
                 continue
+            cached = self.timeline_files.get(path)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                continue
+            self.timeline_pending.append(path)
+            self.timeline_stats[path] = (stat.st_size, stat.st_mtime_ns)
+        # Progress counts decompressed bytes, as worker offsets do
+        self.timeline_total_bytes = sum(
+            self._log_data_size(path) or size for path, (size, _mtime) in self.timeline_stats.items()
+        )
 
-            timestamp = log_match.group("timestamp")
-            content = log_match.group("content")
+        self.clear_parsed_entries()
+        self.entry_tree.configure(displaycolumns=("timestamp", "character", "channel", "speaker", "message"))
+        self.selected_keyword = None
+        self.parsed_path = ""
+        self.parse_complete = False
 
-            message_match = self.QUOTED_MESSAGE_RE.match(content)
-            if message_match:
-                prefix = message_match.group("prefix").strip()
-                prefix = prefix[:-1].strip() if prefix.endswith(",") else prefix
-                message = message_match.group("message").strip()
-                if not message:
-                    continue
+        self.parse_progress.configure(value=0)
+        self.parse_status_var.set(f"Parsing {len(self.timeline_pending)} of {len(paths)} logs...")
+        self._start_timeline_workers()
+        self.update_load_state()
+        self._poll_timeline_workers()
 
-                keyword = message.split()[0].lower()
-                last_keyword_for_loc = keyword
-
-                channel, speaker = self.parse_prefix(prefix)
-                coordinates = self.extract_coordinates(raw_line)
-                entry = LogEntry(
-                    timestamp=timestamp,
-                    channel=channel,
-                    speaker=speaker,
-                    message=message,
-                    raw_line=line,
-                    coordinates=coordinates,
-                )
-                self.keyword_entries[keyword].append(entry)
-                continue
+    @staticmethod
+    def _log_data_size(path: str) -> int:
+        try:
+            return log_data_size(path)
+        except OSError:
+            return 0
+
+    def _start_timeline_workers(self):
+        while self.timeline_pending and len(self.timeline_workers) < self.MAX_TIMELINE_WORKERS:
+            path = self.timeline_pending.pop(0)
+            worker = LogParseWorker(path, parallel=self.parallel_var.get())
+            self.timeline_workers[path] = worker
+            self.timeline_batches[path] = LogStore(path)
+            worker.start()
+
+    def _poll_timeline_workers(self):
+        try:
+            if not self.main_frame.winfo_exists():
+                self.cancel_parse()
+                return
+        except tk.TclError:
+            self.cancel_parse()
+            return
 
-            # Handle /loc style output if we have a last keyword to attach it to
-            system_message = content.lower()
-            if last_keyword_for_loc:
-                loc_match = self.LOCATION_RE.search(content)
-                loc_for_match = self.LOCATION_FOR_RE.search(content)
-                if loc_match:
-                    x_val, y_val, z_val, heading_val = loc_match.groups()
-                    coordinates = (x_val, y_val, z_val, heading_val)
-                elif loc_for_match:
-                    x_val, y_val, z_val, heading_val = loc_for_match.groups()
-                    coordinates = (x_val, y_val, z_val, heading_val)
+        for path, worker in list(self.timeline_workers.items()):
+            while True:
+                try:
+                    kind, payload, offset = worker.results.get_nowait()
+                except queue.Empty:
+                    break
+
+                if kind == "error":
+                    self.timeline_errors[path] = str(payload)
                 else:
-                    coordinates = None
-
-                if not coordinates:
-                    if "location" in system_message or "heading" in system_message or "xyz" in system_message:
-                        coordinates = self.extract_coordinates(content)
-
-                if coordinates:
-                    entry = LogEntry(
-                        timestamp=timestamp,
-                        channel="System",
-                        speaker="",
-                        message=content,
-                        raw_line=line,
-                        coordinates=coordinates,
-                    )
-                self.keyword_entries[last_keyword_for_loc].append(entry)
+                    self.timeline_batches[path].extend(payload)
+                    self.timeline_offsets[path] = offset
+
+                if kind in ("done", "cancelled", "error"):
+                    del self.timeline_workers[path]
+                    store = self.timeline_batches.pop(path)
+                    if kind == "done":
+                        size, mtime_ns = self.timeline_stats[path]
+                        self.timeline_files[path] = (size, mtime_ns, store)
+                    break
+
+        self._start_timeline_workers()
+        if self.timeline_total_bytes:
+            done = sum(self.timeline_offsets.values())
+            self.parse_progress.configure(value=min(100, done * 100 / self.timeline_total_bytes))
+
+        if self.timeline_workers or self.timeline_pending:
+            self.main_frame.after(self.PARSE_POLL_MS, self._poll_timeline_workers)
+            return
+
+        self.build_timeline()
+        self.parse_progress.configure(value=100)
+        self.update_load_state()
+        if self.timeline_errors:
+            self.show_timeline_errors()
+
+    def show_timeline_errors(self):
+        """Tell the user which logs were left out of the timeline and why."""
+        failed = sorted(self.timeline_errors.items())
+        self.parse_status_var.set(f"{self.parse_status_var.get()} ({len(failed)} failed)")
+        lines = [f"{os.path.basename(path)}: {error}" for path, error in failed[:10]]
+        if len(failed) > 10:
+            lines.append(f"...and {len(failed) - 10} more")
+        messagebox.showwarning(
+            "Some Logs Failed",
+            "These logs could not be read and are not in the timeline:\n\n" + "\n".join(lines),
+            parent=self.main_frame,
+        )
+
+    def build_timeline(self):
+        """Merge the per-file entries into time order and regroup them by keyword."""
+        self.clear_parsed_entries()
+        self.stores = [self.timeline_files[path][2] for path in sorted(self.timeline_files)]
+        keywords = set()
+        for store in self.stores:
+            keywords.update(store.keyword_rows)
+        self.keyword_entries = {keyword: merge_keyword_rows(self.stores, keyword) for keyword in keywords}
+        self.keyword_order = sorted(keywords)
+        self.refresh_keyword_tree()
+        self.refresh_entry_tree()
+
+        total = sum(len(store) for store in self.stores)
+        self.parse_status_var.set(f"Timeline: {total:,} entries from {len(self.stores)} logs")
+
+    # ------------------------------------------------------------------
+    # Follow mode
+    # ------------------------------------------------------------------
+    def on_follow_toggled(self):
+        if not self.follow_var.get():
+            if self.follow_job is not None:
+                self.main_frame.after_cancel(self.follow_job)
+                self.follow_job = None
+            return
+
+        filepath = self.loaded_file_var.get()
+        if (
+            not self.all_logs_var.get()
+            and self.parse_worker is None
+            and filepath
+            and filepath != self.parsed_path
+        ):
+            self.load_selected_file()
+        self._schedule_follow()
+
+    def _schedule_follow(self):
+        if self.follow_job is None:
+            self.follow_job = self.main_frame.after(self.FOLLOW_POLL_MS, self._follow_tick)
+
+    def _follow_tick(self):
+        self.follow_job = None
+        if not self.follow_var.get():
+            return
+        try:
+            if not self.main_frame.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        # Archives are never appended to
+        if self.parse_worker is None and self.parse_complete and not is_compressed(self.parsed_path):
+            self.read_appended_lines()
+        self._schedule_follow()
+
+    def read_appended_lines(self):
+        """Parse lines appended since the last read, at most FOLLOW_MAX_BYTES per call.
+
+        The file is polled with os.stat; a file that shrank was truncated or
+        replaced, so it is parsed again from the start.
+        """
+        try:
+            size = os.path.getsize(self.parsed_path)
+        except OSError:
+            return
+        if size < self.parsed_offset:
+            self.start_parse(self.parsed_path)
+            return
+        if size == self.parsed_offset:
+            return
+
+        start_offset = self.parsed_offset
+        parsed = []
+        try:
+            # Leave an unfinished last line for the next tail read
+            for line_start, end, line in iter_log_lines(self.parsed_path, start_offset, include_partial=False):
+                result = self.log_parser.parse_line(line, line_start)
+                if result is not None:
+                    parsed.append(result)
+                self.parsed_offset = end
+                if end - start_offset >= self.FOLLOW_MAX_BYTES:
+                    break
+        except OSError:
+            return
+
+        self.store_appended_entries(parsed)
+        if parsed:
+            self.add_parsed_entries(parsed)
+            total = sum(len(entries) for entries in self.keyword_entries.values())
+            self.parse_status_var.set(f"Following: {total:,} entries")
+
+    def store_appended_entries(self, parsed: List[Tuple[str, LogEntry]]):
+        """Add tail-read entries to the log index so the next load resumes after them."""
+        if self.parsed_file_id is None:
+            return
+        try:
+            self.get_log_cache().add_entries(self.parsed_file_id, parsed)
+            self.log_cache.mark_parsed(
+                self.parsed_file_id, self.parsed_path, self.parsed_offset, self.log_parser.last_keyword_for_loc
+            )
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Warning: could not update log index: {exc}")
+            self.parsed_file_id = None
+
+    def get_log_cache(self) -> LogIndexCache:
+        """Return the UI thread's connection to the log index, opening it on first use."""
+        if self.log_cache is None:
+            self.log_cache = LogIndexCache()
+        return self.log_cache
+
+    # ------------------------------------------------------------------
+    # Full-text search
+    # ------------------------------------------------------------------
+    def search_logs(self):
+        """Search the indexed logs for the query in the search box and show the first page.
+
+        With All characters checked every log in the logs directory is
+        searched; otherwise only the selected log. Logs are indexed as they are
+        loaded, so a log that was never loaded has nothing to find yet.
+        """
+        query = self.search_var.get().strip()
+        if not query:
+            return
+        if self.all_logs_var.get():
+            paths = [os.path.join(self.logs_path, name) for name in self.log_files]
+        else:
+            paths = [self.loaded_file_var.get()] if self.loaded_file_var.get() else []
+        if not paths:
+            messagebox.showinfo("No Logs", "Select a log file to search.", parent=self.main_frame)
+            return
+
+        try:
+            self.search_file_ids = self.get_log_cache().file_ids(paths)
+        except (OSError, sqlite3.Error) as exc:
+            messagebox.showerror("Search Error", f"Could not open the log index:\n{exc}", parent=self.main_frame)
+            return
+        self.search_query = query
+        self.show_search_window()
+        self.show_search_page(0)
+
+    def show_search_page(self, start: int):
+        try:
+            page = self.get_log_cache().search(self.search_query, self.search_file_ids, SEARCH_PAGE_SIZE, start)
+        except sqlite3.OperationalError as exc:
+            # Malformed FTS5 syntax, e.g. an unterminated quote
+            self.search_status_var.set(f"Invalid search: {exc}")
+            return
+        except sqlite3.Error as exc:
+            self.search_status_var.set(f"Search failed: {exc}")
+            return
+
+        self.search_page_start = start
+        self.search_page = page
+        self.search_tree.delete(*self.search_tree.get_children())
+        self.search_items.clear()
+        for hit in page.hits:
+            tree_id = self.search_tree.insert(
+                "", "end",
+                values=(log_character_name(hit.path), hit.timestamp, hit.channel, hit.speaker, hit.snippet),
+            )
+            self.search_items[tree_id] = (hit.path, hit.offset)
+
+        if page.total:
+            shown = f"{start + 1:,}-{start + len(page.hits):,} of {page.total:,}"
+        else:
+            shown = "No matches"
+        self.search_status_var.set(f"{shown} ({page.elapsed * 1000:.0f} ms)")
+        self.search_prev_btn.configure(state="normal" if start > 0 else "disabled")
+        self.search_next_btn.configure(state="normal" if start + len(page.hits) < page.total else "disabled")
+
+    def show_search_window(self):
+        try:
+            if self.search_window is not None and self.search_window.winfo_exists():
+                self.search_window.title(f"Search: {self.search_query}")
+                self.search_window.lift()
+                return
+        except tk.TclError:
+            pass
+
+        window = tk.Toplevel(self.main_frame)
+        window.title(f"Search: {self.search_query}")
+        window.geometry("900x450")
+        window.grid_rowconfigure(0, weight=1)
+        window.grid_columnconfigure(0, weight=1)
+        self.search_window = window
+
+        self.search_tree = ttk.Treeview(
+            window,
+            columns=("character", "timestamp", "channel", "speaker", "snippet"),
+            show="headings",
+            selectmode="browse",
+        )
+        self._make_treeview_invisible_scroll(self.search_tree)
+        for column, text, width in (
+            ("character", "Character", 100),
+            ("timestamp", "Timestamp", 155),
+            ("channel", "Channel", 130),
+            ("speaker", "Speaker", 110),
+            ("snippet", "Match", 400),
+        ):
+            self.search_tree.heading(column, text=text)
+            self.search_tree.column(column, width=width, anchor="w")
+        self.search_tree.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.search_tree.bind("<Double-1>", self.on_search_result_activated)
+
+        nav = ttk.Frame(window, padding="5")
+        nav.grid(row=1, column=0, sticky="ew")
+        nav.grid_columnconfigure(2, weight=1)
+        self.search_prev_btn = ttk.Button(
+            nav, text="Previous", width=10,
+            command=lambda: self.show_search_page(max(0, self.search_page_start - SEARCH_PAGE_SIZE)),
+        )
+        self.search_prev_btn.grid(row=0, column=0, padx=(0, 5))
+        self.search_next_btn = ttk.Button(
+            nav, text="Next", width=10,
+            command=lambda: self.show_search_page(self.search_page_start + SEARCH_PAGE_SIZE),
+        )
+        self.search_next_btn.grid(row=0, column=1, padx=(0, 5))
+        ttk.Label(nav, textvariable=self.search_status_var).grid(row=0, column=2, sticky="w")
+
+    def on_search_result_activated(self, event=None):
+        """Show a search hit in the entry list when its log is loaded."""
+        selected = self.search_tree.selection()
+        if not selected or selected[0] not in self.search_items:
+            return
+        path, offset = self.search_items[selected[0]]
+        ref = self.find_entry_ref(path, offset)
+        if ref is None:
+            self.search_status_var.set("Load this log to show the entry")
+            return
+        self.reveal_entry(ref)
+
+    def find_entry_ref(self, path: str, offset: int) -> Optional[int]:
+        path = os.path.abspath(path)
+        for store_index, store in enumerate(self.stores):
+            if os.path.abspath(store.path) != path:
+                continue
+            row = bisect.bisect_left(store.offsets, offset)
+            if row < len(store) and store.offsets[row] == offset:
+                return make_ref(store_index, row)
+        return None
+
+    def reveal_entry(self, ref: int):
+        """Select ref's keyword and entry, clearing filters that would hide it."""
+        store_index, row = split_ref(ref)
+        keyword = self.stores[store_index].keyword(row)
+        if keyword not in self.keyword_tree_ids:
+            self.keyword_filter_var.set("")
+        self.selected_keyword = keyword
+        self.keyword_tree.selection_set(self.keyword_tree_ids[keyword])
+        self.keyword_tree.see(self.keyword_tree_ids[keyword])
+        self.refresh_entry_tree()
+        if ref not in self.entry_tree_ids:
+            self.time_window_var.set("All")
+            for var in (self.entry_filter_var, self.speaker_filter_var, self.time_from_var, self.time_to_var):
+                var.set("")
+        tree_id = self.entry_tree_ids.get(ref)
+        if tree_id is not None:
+            self.entry_tree.selection_set(tree_id)
+            self.entry_tree.see(tree_id)
+
+    # ------------------------------------------------------------------
+    # Parsing and data preparation
+    # ------------------------------------------------------------------
+    def clear_parsed_entries(self):
+        self.stores = []
+        self.keyword_entries = {}
+        self.keyword_order.clear()
+        self.current_keyword = None
+        self.keyword_tree.delete(*self.keyword_tree.get_children())
+        self.keyword_tree_ids.clear()
+        self.visible_keywords = []
+        self.keyword_filter_text = ""
+        self.time_indexes.clear()
+        self.clear_entry_rows()
+
+    def clear_entry_rows(self):
+        self.entry_tree.delete(*self.entry_tree.get_children())
+        self.entry_item_map.clear()
+        self.entry_tree_ids.clear()
+        self.visible_refs = []
+        self.entry_filter_state = None
+        self.set_coordinate_buttons_state(False)
+
+    def add_parsed_entries(self, parsed: Iterable[Tuple[str, LogEntry]]):
+        """Append (keyword, entry) pairs to the single loaded store and update only the affected tree rows.
+
+        The store's own keyword index doubles as keyword_entries, since row
+        numbers of the first store are also its entry references.
+        """
+        store = self.stores[0]
+        changed: Dict[str, List[int]] = defaultdict(list)
+        for keyword, entry in parsed:
+            changed[keyword].append(store.append(keyword, entry))
+
+        filter_text = self.keyword_filter_var.get().strip().lower()
+        for keyword, new_rows in changed.items():
+            count = len(self.keyword_entries[keyword])
+            if count == len(new_rows):
+                bisect.insort(self.keyword_order, keyword)
+            tree_id = self.keyword_tree_ids.get(keyword)
+            if tree_id is not None:
+                self.keyword_tree.set(tree_id, "count", count)
+            elif not filter_text or filter_text in keyword:
+                index = bisect.bisect_left(self.visible_keywords, keyword)
+                self.visible_keywords.insert(index, keyword)
+                self.keyword_tree_ids[keyword] = self.keyword_tree.insert(
+                    "", index, values=(keyword, count)
+                )
+            if keyword == self.selected_keyword:
+                self.insert_entry_rows(new_rows)
 
     def _resolve_logs_path(self) -> str:
         if not self.log_directory:
@@ -400,80 +979,456 @@ class LogManagerTool(_TreeviewScrollMixin):
     def _contains_log_files(self, directory: str) -> bool:
         try:
             for name in os.listdir(directory):
-                if not os.path.isfile(os.path.join(directory, name)):
-                    continue
-                lower_name = name.lower()
-                if lower_name.startswith("eqlog_") and lower_name.endswith(".txt"):
+                if os.path.isfile(os.path.join(directory, name)) and is_log_file_name(name):
                     return True
             return False
         except OSError:
             return False
 
-    def parse_prefix(self, prefix: str) -> Tuple[str, str]:
-        if not prefix:
-            return "", ""
-
-        parts = prefix.split(None, 1)
-        speaker = parts[0] if parts else ""
-        channel = prefix
-        return channel, speaker
-
-    def extract_coordinates(
-        self, text: str
-    ) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]]:
-        numbers = re.findall(r"-?\d+(?:\.\d+)?", text)
-        if len(numbers) >= 3:
-            x_val = numbers[0]
-            y_val = numbers[1]
-            z_val = numbers[2]
-            h_val = numbers[3] if len(numbers) >= 4 else None
-            return (x_val, y_val, z_val, h_val)
-        return None
-
     # ------------------------------------------------------------------
     # Tree refresh helpers
     # ------------------------------------------------------------------
-    def refresh_keyword_tree(self):
-        self.keyword_tree.delete(*self.keyword_tree.get_children())
-        self.keyword_tree_ids.clear()
+    @staticmethod
+    def _sync_tree_rows(tree: ttk.Treeview, current: List, target: List, tree_ids: Dict,
+                        values_for, item_keys: Optional[Dict] = None):
+        """Make tree show the keys in target, in order, given that it shows current.
+
+        Both lists must be ordered subsequences of the same sequence. Only rows
+        whose visibility changes are deleted or inserted; item_keys, if given,
+        maps tree ids back to keys and is kept in step.
+        """
+        target_set = set(target)
+        removed = [tree_ids.pop(key) for key in current if key not in target_set]
+        if removed:
+            tree.delete(*removed)
+            if item_keys is not None:
+                for tree_id in removed:
+                    item_keys.pop(tree_id, None)
+
+        kept_left = len(current) - len(removed)
+        for index, key in enumerate(target):
+            if key in tree_ids:
+                kept_left -= 1
+                continue
+            # Once every kept row is behind us, appending avoids an index walk
+            tree_id = tree.insert("", "end" if kept_left == 0 else index, values=values_for(key))
+            tree_ids[key] = tree_id
+            if item_keys is not None:
+                item_keys[tree_id] = key
 
+    def refresh_keyword_tree(self):
+        """Apply the keyword filter, narrowing the visible list when the filter text was extended."""
         filter_text = self.keyword_filter_var.get().strip().lower()
-        for keyword in sorted(self.keyword_entries.keys()):
-            if filter_text and filter_text not in keyword:
-                continue
-            count = len(self.keyword_entries[keyword])
-            tree_id = self.keyword_tree.insert("", "end", values=(keyword, count))
-            self.keyword_tree_ids[keyword] = tree_id
+        if self.keyword_filter_text and filter_text.startswith(self.keyword_filter_text):
+            candidates = self.visible_keywords
+        else:
+            candidates = self.keyword_order
+        target = [keyword for keyword in candidates if not filter_text or filter_text in keyword]
+
+        self._sync_tree_rows(
+            self.keyword_tree,
+            self.visible_keywords,
+            target,
+            self.keyword_tree_ids,
+            lambda keyword: (keyword, len(self.keyword_entries[keyword])),
+        )
+        self.visible_keywords = target
+        self.keyword_filter_text = filter_text
 
     def refresh_entry_tree(self):
-        self.entry_tree.delete(*self.entry_tree.get_children())
-        self.entry_item_map.clear()
-        self.set_coordinate_buttons_state(False)
+        """Show the selected keyword's entries that pass the entry filters.
 
+        The time range is cut out of the keyword's time index by binary
+        search. When the filters only got stricter (text extended, same keyword
+        and time range) the previous result is narrowed instead of rescanning
+        the keyword, and only rows whose visibility changes touch the tree.
+        """
         if not self.selected_keyword:
+            self.clear_entry_rows()
+            self.refresh_histogram()
             return
 
-        entries = self.keyword_entries.get(self.selected_keyword, [])
-        filter_text = self.entry_filter_var.get().strip().lower()
+        state = self.get_entry_filter_state()
+        previous = self.entry_filter_state
+        if previous is None or previous[0] != state[0]:
+            self.clear_entry_rows()
+            candidates = self.get_time_index(self.selected_keyword).window(state[3], state[4])
+        elif (
+            previous[3:] == state[3:]
+            and state[1].startswith(previous[1])
+            and state[2].startswith(previous[2])
+        ):
+            candidates = self.visible_refs
+        else:
+            candidates = self.get_time_index(self.selected_keyword).window(state[3], state[4])
+
+        target = self.filter_entry_refs(candidates, state)
+        self._sync_tree_rows(
+            self.entry_tree,
+            self.visible_refs,
+            target,
+            self.entry_tree_ids,
+            self.entry_row_values,
+            self.entry_item_map,
+        )
+        self.visible_refs = target
+        self.entry_filter_state = state
+        self.on_entry_selected()
+        if previous is None or previous[0] != state[0] or previous[3:] != state[3:]:
+            self.refresh_histogram()
+
+    def parse_time_filter(self, text: str, end_of_range: bool = False) -> Optional[int]:
+        """Parse a From/To value into the same epoch scale as parse_timestamp."""
+        text = text.strip()
+        for fmt in self.TIME_FILTER_FORMATS:
+            try:
+                moment = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            epoch = calendar.timegm(moment.timetuple())
+            # A bare date in To covers the whole day
+            return epoch + 86399 if end_of_range and fmt == "%Y-%m-%d" else epoch
+        return None
+
+    def get_time_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return the (from, to) epochs set by the From/To fields and the window preset."""
+        time_from = self.parse_time_filter(self.time_from_var.get())
+        time_to = self.parse_time_filter(self.time_to_var.get(), end_of_range=True)
+        window = self.TIME_WINDOWS.get(self.time_window_var.get())
+        if window is not None:
+            latest = self.get_time_index(None).last_epoch
+            if latest is not None:
+                time_from = max(time_from, latest - window) if time_from is not None else latest - window
+        return time_from, time_to
+
+    def get_entry_filter_state(self) -> Tuple:
+        """Return (keyword, text, speaker, time from, time to) for the current entry filters."""
+        return (
+            self.selected_keyword,
+            self.entry_filter_var.get().strip().lower(),
+            self.speaker_filter_var.get().strip().lower(),
+            *self.get_time_range(),
+        )
+
+    def get_time_index(self, keyword: Optional[str]) -> TimeIndex:
+        """Return the time index for keyword, or for every entry when keyword is None.
 
-        for entry in entries:
-            combined_text = " ".join(
-                [
-                    entry.timestamp.lower(),
-                    entry.channel.lower(),
-                    entry.speaker.lower(),
-                    entry.message.lower(),
-                ]
-            )
-            if filter_text and filter_text not in combined_text:
+        Indexes are built on first use and extended as entries are appended;
+        clear_parsed_entries drops them.
+        """
+        if keyword is None:
+            count = sum(len(store) for store in self.stores)
+        else:
+            count = len(self.keyword_entries.get(keyword, ()))
+        index = self.time_indexes.get(keyword)
+        if index is not None and len(index) == count:
+            return index
+
+        if keyword is None:
+            if len(self.stores) == 1:
+                refs = range(count)
+            else:
+                refs = [make_ref(position, row) for position, store in enumerate(self.stores) for row in range(len(store))]
+        else:
+            refs = self.keyword_entries[keyword]
+        if index is None or len(index) > count or not index.extend(self.stores, refs[len(index):]):
+            index = self.time_indexes[keyword] = TimeIndex.build(self.stores, refs)
+        return index
+
+    def filter_entry_refs(self, refs: Iterable[int], state: Tuple) -> List[int]:
+        """Return the refs passing the filters, matched against the stores' precomputed search keys."""
+        _keyword, filter_text, speaker_text, time_from, time_to = state
+        needle = filter_text.encode("utf-8")
+        speaker_ids: Dict[int, set] = {}
+        matched = []
+        for ref in refs:
+            store_index, row = split_ref(ref)
+            store = self.stores[store_index]
+            if speaker_text:
+                allowed = speaker_ids.get(store_index)
+                if allowed is None:
+                    allowed = speaker_ids[store_index] = store.string_ids_matching(speaker_text)
+                if store.speaker_ids[row] not in allowed:
+                    continue
+            epoch = store.epochs[row]
+            if (time_from is not None and epoch < time_from) or (time_to is not None and epoch > time_to):
+                continue
+            if needle and not store.matches_text(row, needle):
                 continue
+            matched.append(ref)
+        return matched
+
+    def entry_row_values(self, ref: int) -> Tuple[str, str, str, str, str]:
+        store_index, row = split_ref(ref)
+        store = self.stores[store_index]
+        character = log_character_name(store.path) if len(self.stores) > 1 else ""
+        return (store.timestamp(row), character, store.channel(row), store.speaker(row), store.message(row))
+
+    def insert_entry_rows(self, refs: Iterable[int]):
+        """Append newly parsed entries of the selected keyword that pass the filters."""
+        if self.entry_filter_state is None:
+            self.refresh_entry_tree()
+            return
+        for ref in self.filter_entry_refs(refs, self.entry_filter_state):
+            tree_id = self.entry_tree.insert("", "end", values=self.entry_row_values(ref))
+            self.entry_tree_ids[ref] = tree_id
+            self.entry_item_map[tree_id] = ref
+            self.visible_refs.append(ref)
+
+    def get_entry_location(self, tree_id: str) -> Optional[Tuple[LogStore, int]]:
+        """Return the (store, row) behind an entry tree item."""
+        ref = self.entry_item_map.get(tree_id)
+        if ref is None:
+            return None
+        store_index, row = split_ref(ref)
+        return self.stores[store_index], row
+
+    def get_entry(self, tree_id: str) -> Optional[LogEntry]:
+        location = self.get_entry_location(tree_id)
+        if location is None:
+            return None
+        store, row = location
+        return store.entry(row)
+
+    # ------------------------------------------------------------------
+    # Histogram
+    # ------------------------------------------------------------------
+    def show_histogram(self):
+        """Open a per-minute or per-hour count of the selected keyword's entries in the current time range."""
+        if self._histogram_open():
+            self.histogram_window.lift()
+            self.refresh_histogram()
+            return
+
+        window = tk.Toplevel(self.main_frame)
+        window.title("Entries Over Time")
+        window.geometry("520x420")
+        window.grid_rowconfigure(1, weight=1)
+        window.grid_columnconfigure(0, weight=1)
+        self.histogram_window = window
+
+        options = ttk.Frame(window, padding="5")
+        options.grid(row=0, column=0, sticky="ew")
+        ttk.Label(options, text="Per:").grid(row=0, column=0, sticky="w")
+        for column, name in enumerate(self.HISTOGRAM_BUCKETS, start=1):
+            ttk.Radiobutton(
+                options, text=name, value=name, variable=self.histogram_bucket_var, command=self.refresh_histogram
+            ).grid(row=0, column=column, padx=(5, 0))
+        ttk.Label(options, textvariable=self.histogram_scope_var).grid(
+            row=0, column=len(self.HISTOGRAM_BUCKETS) + 1, sticky="w", padx=(10, 0)
+        )
+
+        self.histogram_tree = ttk.Treeview(
+            window, columns=("start", "count", "bar"), show="headings", selectmode="browse"
+        )
+        self._make_treeview_invisible_scroll(self.histogram_tree)
+        self.histogram_tree.heading("start", text="Start")
+        self.histogram_tree.heading("count", text="Entries")
+        self.histogram_tree.heading("bar", text="")
+        self.histogram_tree.column("start", width=130, anchor="w")
+        self.histogram_tree.column("count", width=70, anchor="e")
+        self.histogram_tree.column("bar", width=300, anchor="w")
+        self.histogram_tree.grid(row=1, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        # Double-clicking a bucket narrows the entry list to it
+        self.histogram_tree.bind("<Double-1>", self.on_histogram_activated)
+
+        self.refresh_histogram()
+
+    def _histogram_open(self) -> bool:
+        try:
+            return self.histogram_window is not None and bool(self.histogram_window.winfo_exists())
+        except tk.TclError:
+            return False
 
-            tree_id = self.entry_tree.insert(
-                "",
-                "end",
-                values=(entry.timestamp, entry.channel, entry.speaker, entry.message),
+    def refresh_histogram(self):
+        """Recount the histogram buckets from the time index in one pass."""
+        if not self._histogram_open():
+            return
+        time_from, time_to = self.get_time_range()
+        epochs = self.get_time_index(self.selected_keyword).window_epochs(time_from, time_to)
+        bucket_seconds = self.HISTOGRAM_BUCKETS[self.histogram_bucket_var.get()]
+        buckets = histogram(epochs, bucket_seconds)
+
+        self.histogram_tree.delete(*self.histogram_tree.get_children())
+        self.histogram_items.clear()
+        peak = max((count for _start, count in buckets), default=0)
+        for start, count in buckets:
+            bar = "\u2588" * max(1, round(count * self.HISTOGRAM_BAR_WIDTH / peak))
+            tree_id = self.histogram_tree.insert(
+                "", "end", values=(time.strftime("%Y-%m-%d %H:%M", time.gmtime(start)), count, bar)
             )
-            self.entry_item_map[tree_id] = entry
+            self.histogram_items[tree_id] = start
+
+        scope = self.selected_keyword or "All entries"
+        self.histogram_scope_var.set(f"{scope}: {len(epochs):,} entries in {len(buckets):,} buckets")
+
+    def on_histogram_activated(self, event=None):
+        selected = self.histogram_tree.selection()
+        if not selected or selected[0] not in self.histogram_items:
+            return
+        start = self.histogram_items[selected[0]]
+        end = start + self.HISTOGRAM_BUCKETS[self.histogram_bucket_var.get()] - 1
+        self.time_window_var.set("All")
+        self.time_from_var.set(time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start)))
+        self.time_to_var.set(time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(end)))
+
+    # ------------------------------------------------------------------
+    # Coordinate export
+    # ------------------------------------------------------------------
+    def show_coordinate_export(self):
+        """Open the batch export of coordinates for the chosen keywords and current time range."""
+        if self.selected_keyword and not self.export_keywords_var.get().strip():
+            self.export_keywords_var.set(self.selected_keyword)
+        try:
+            if self.export_window is not None and self.export_window.winfo_exists():
+                self.export_window.lift()
+                self.preview_coordinate_export()
+                return
+        except tk.TclError:
+            pass
+
+        window = tk.Toplevel(self.main_frame)
+        window.title("Export Coordinates")
+        window.resizable(False, False)
+        self.export_window = window
+        frame = ttk.Frame(window, padding="10")
+        frame.grid(row=0, column=0, sticky="nsew")
+
+        def field(row: int, column: int, label: str, variable: tk.StringVar, width: int = 10):
+            ttk.Label(frame, text=label).grid(row=row, column=column, sticky="w", padx=(0, 5), pady=2)
+            ttk.Entry(frame, textvariable=variable, width=width).grid(row=row, column=column + 1, sticky="w", pady=2)
+
+        field(0, 0, "Keywords:", self.export_keywords_var, 30)
+        ttk.Label(frame, text="(comma separated; uses the From/To range)").grid(
+            row=0, column=2, columnspan=2, sticky="w", padx=(5, 0)
+        )
+        field(1, 0, "Merge within:", self.export_distance_var)
+        ttk.Button(frame, text="Preview", command=self.preview_coordinate_export, width=10).grid(
+            row=1, column=2, sticky="w", padx=(5, 0)
+        )
+
+        ttk.Radiobutton(frame, text="Grid waypoints", value="grid", variable=self.export_target_var).grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(10, 2)
+        )
+        field(3, 0, "Grid ID:", self.export_grid_var)
+        ttk.Label(frame, text="(blank for a new grid)").grid(row=3, column=2, sticky="w", padx=(5, 0))
+        field(4, 0, "Pause:", self.export_pause_var)
+
+        ttk.Radiobutton(frame, text="Spawn points", value="spawn2", variable=self.export_target_var).grid(
+            row=5, column=0, columnspan=2, sticky="w", pady=(10, 2)
+        )
+        field(6, 0, "Spawngroup ID:", self.export_spawngroup_var)
+        field(6, 2, "Version:", self.export_version_var)
+        field(7, 0, "Respawn:", self.export_respawn_var)
+        field(7, 2, "Variance:", self.export_variance_var)
+
+        field(8, 0, "Zone:", self.export_zone_var, 20)
+        ttk.Label(frame, textvariable=self.export_status_var).grid(row=9, column=0, columnspan=4, sticky="w", pady=(10, 0))
+
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=10, column=0, columnspan=4, sticky="e", pady=(10, 0))
+        ttk.Button(buttons, text="Export CSV", command=self.export_coordinates_csv, width=12).grid(
+            row=0, column=0, padx=(0, 5)
+        )
+        ttk.Button(buttons, text="Write to Database", command=self.export_coordinates_to_database, width=18).grid(
+            row=0, column=1, padx=(0, 5)
+        )
+        ttk.Button(buttons, text="Close", command=window.destroy, width=8).grid(row=0, column=2)
+
+        self.preview_coordinate_export()
+
+    def collect_export_points(self) -> Optional[List[ExportPoint]]:
+        """Return the deduplicated points to export, or None after reporting a bad input."""
+        keywords = [keyword.strip().lower() for keyword in self.export_keywords_var.get().split(",") if keyword.strip()]
+        try:
+            distance = float(self.export_distance_var.get() or 0)
+        except ValueError:
+            self.export_status_var.set("Merge distance must be a number.")
+            return None
+        if not keywords:
+            self.export_status_var.set("Enter at least one keyword.")
+            return None
+
+        time_from, time_to = self.get_time_range()
+        refs = [
+            ref
+            for keyword in keywords if keyword in self.keyword_entries
+            for ref in self.get_time_index(keyword).window(time_from, time_to)
+        ]
+        # Several keywords are interleaved back into capture order
+        if len(keywords) > 1:
+            refs = list(TimeIndex.build(self.stores, refs).refs)
+        points = collect_points(self.stores, refs)
+        kept = dedupe_points(points, distance)
+        self.export_status_var.set(f"{len(points):,} coordinates, {len(kept):,} after merging near-duplicates")
+        return kept
+
+    def preview_coordinate_export(self):
+        self.collect_export_points()
+
+    def export_coordinates_csv(self):
+        points = self.collect_export_points()
+        if not points:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.export_window,
+            title="Export Coordinates",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            count = write_csv(path, points)
+        except OSError as exc:
+            messagebox.showerror("Export Error", f"Could not write CSV:\n{exc}", parent=self.export_window)
+            return
+        self.export_status_var.set(f"Wrote {count:,} points to {os.path.basename(path)}")
+
+    def export_coordinates_to_database(self):
+        points = self.collect_export_points()
+        if not points:
+            return
+        if self.db_manager is None:
+            messagebox.showerror("Database", "No database connection is configured.", parent=self.export_window)
+            return
+        zone = self.export_zone_var.get().strip()
+        if not zone:
+            self.export_status_var.set("Enter the zone short name.")
+            return
+
+        try:
+            if self.export_target_var.get() == "grid":
+                grid_text = self.export_grid_var.get().strip()
+                grid_id = int(grid_text) if grid_text else None
+                pause = int(self.export_pause_var.get() or 0)
+                target = f"grid {grid_id} in {zone}" if grid_id is not None else f"a new grid in {zone}"
+                if not messagebox.askyesno(
+                    "Confirm Export", f"Add {len(points):,} waypoints to {target}?", parent=self.export_window
+                ):
+                    return
+                result = export_grid(self.db_manager, zone, points, grid_id, pause)
+                if result:
+                    grid_id, first_number = result
+                    self.export_status_var.set(
+                        f"Added waypoints {first_number}-{first_number + len(points) - 1} to grid {grid_id}"
+                    )
+            else:
+                spawngroup_id = int(self.export_spawngroup_var.get())
+                version = int(self.export_version_var.get() or 0)
+                respawn = int(self.export_respawn_var.get() or DEFAULT_RESPAWN_SECONDS)
+                variance = int(self.export_variance_var.get() or 0)
+                if not messagebox.askyesno(
+                    "Confirm Export",
+                    f"Add {len(points):,} spawn2 rows for spawngroup {spawngroup_id} in {zone}?",
+                    parent=self.export_window,
+                ):
+                    return
+                if export_spawns(self.db_manager, zone, spawngroup_id, points, version, respawn, variance):
+                    self.export_status_var.set(f"Added {len(points):,} spawn points to {zone}")
+        except ValueError as exc:
+            # Non-numeric ids, or a zone the server does not know
+            messagebox.showerror("Export Error", str(exc), parent=self.export_window)
 
     # ------------------------------------------------------------------
     # Event handlers
@@ -496,8 +1451,8 @@ class LogManagerTool(_TreeviewScrollMixin):
             self.set_coordinate_buttons_state(False)
             return
 
-        entry = self.entry_item_map.get(selected[0])
-        if entry and entry.coordinates:
+        location = self.get_entry_location(selected[0])
+        if location and location[0].coordinates_at(location[1]):
             self.set_coordinate_buttons_state(True)
         else:
             self.set_coordinate_buttons_state(False)
@@ -517,7 +1472,7 @@ class LogManagerTool(_TreeviewScrollMixin):
             messagebox.showinfo("No Entry", "Select an entry to copy its text.", parent=self.main_frame)
             return
 
-        entry = self.entry_item_map.get(selected[0])
+        entry = self.get_entry(selected[0])
         if not entry:
             return
 
@@ -526,12 +1481,34 @@ class LogManagerTool(_TreeviewScrollMixin):
         toplevel.clipboard_append(entry.message)
         toplevel.update_idletasks()
 
+    def copy_raw_line(self):
+        selected = self.entry_tree.selection()
+        if not selected:
+            messagebox.showinfo("No Entry", "Select an entry to copy its log line.", parent=self.main_frame)
+            return
+
+        location = self.get_entry_location(selected[0])
+        if not location:
+            return
+
+        store, row = location
+        try:
+            raw_line = read_log_line(store.path, store.offsets[row])
+        except OSError as err:
+            messagebox.showerror("Read Error", f"Could not read log file:\n{err}", parent=self.main_frame)
+            return
+
+        toplevel = self.main_frame.winfo_toplevel()
+        toplevel.clipboard_clear()
+        toplevel.clipboard_append(raw_line)
+        toplevel.update_idletasks()
+
     def copy_coordinates(self):
         selected = self.entry_tree.selection()
         if not selected:
             return
 
-        entry = self.entry_item_map.get(selected[0])
+        entry = self.get_entry(selected[0])
         if not entry or not entry.coordinates:
             messagebox.showinfo("No Coordinates", "The selected entry does not contain coordinates.", parent=self.main_frame)
             return
@@ -550,7 +1527,7 @@ class LogManagerTool(_TreeviewScrollMixin):
         if not selected:
             return
 
-        entry = self.entry_item_map.get(selected[0])
+        entry = self.get_entry(selected[0])
         if not entry or not entry.coordinates:
             messagebox.showinfo("No Coordinates", "The selected entry does not contain coordinates.", parent=self.main_frame)
             return
@@ -2,12 +2,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import sys
 import os
-from PIL import Image, ImageTk
-import glob
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from shared.theme import set_dark_theme
-from dictionaries import (SLOT_BITMASK_DISPLAY, ITEM_STAT_DISPLAY_CONFIG, NPC_TYPES_COLUMNS)
+from dictionaries import NPC_TYPES_COLUMNS
+from shared.asset_catalog import get_asset_catalog
+from shared.image_registry import get_image_registry, DEFAULT_BACKGROUND, ITEM_BACKGROUND
+from shared.item_card import get_item_card_renderer
 from lookup_data import (
     class_lookup as CLASS_LOOKUP_SEED,
     race_lookup as RACE_LOOKUP_SEED,
@@ -22,6 +23,7 @@ class LootManagerTool:
         self.notes_db = notes_db_manager
         self.class_bitmask_display = {}
         self.race_bitmask_display = {}
+        self.item_cards = get_item_card_renderer(db_manager, notes_db_manager)
         self.load_lookup_data()
     def load_lookup_data(self):
         """Load race and class bitmask displays with seed fallbacks."""
@@ -138,8 +140,7 @@ class LootManagerTool:
         image_frame = ttk.Frame(self.top_root, relief=tk.SUNKEN, borderwidth=2)
         image_frame.grid(row=0, column=2, padx=5, pady=5, sticky="nsew")
         try:
-            backingimage2 = Image.open("images/other/default.jpg")
-            self.bg2_image = ImageTk.PhotoImage(backingimage2)
+            self.bg2_image = get_image_registry().get_photo(DEFAULT_BACKGROUND)
             self.main_canvas = tk.Canvas(image_frame, width=self.bg2_image.width(), height=self.bg2_image.height(), highlightthickness=0)
             self.main_canvas.grid(row=0, column=0, sticky="nsew")
             self.main_canvas.create_image(0, 0, anchor="nw", image=self.bg2_image)
@@ -152,8 +153,7 @@ class LootManagerTool:
         item_frame = ttk.Frame(self.top_root, relief=tk.SUNKEN, borderwidth=2)
         item_frame.grid(row=0, column=3, sticky="nsew", padx=5, pady=5)
         try:
-            backingimage = Image.open("images/other/itemback.png")
-            self.bg_image = ImageTk.PhotoImage(backingimage)
+            self.bg_image = get_image_registry().get_photo(ITEM_BACKGROUND)
             self.canvas = tk.Canvas(item_frame, width=self.bg_image.width(), height=self.bg_image.height(), highlightthickness=0)
             self.canvas.grid(row=0, column=0, sticky="nsew")
             self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image)
@@ -1238,176 +1238,19 @@ class LootManagerTool:
         item_id = self.loot_tree2.item(selected_loot_item, "values")[0]
         self._display_item_details(item_id)
     def _display_item_details(self, item_id):
-        """Render item stats and icon for the supplied item ID on the preview canvas."""
+        """Render the shared item card for the supplied item ID on the preview canvas."""
         if item_id in ("", None):
             return False
         try:
             item_id = int(item_id)
         except (TypeError, ValueError):
             return False
-        for canvas_item in self.canvas.find_all():
-            self.canvas.delete(canvas_item)
+        if self.item_cards.draw_card(self.canvas, item_id):
+            return True
+        self.canvas.delete("all")
         if hasattr(self, 'bg_image') and self.bg_image:
             self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image)
-        query = """
-            SELECT DISTINCT Name, aagi, ac, accuracy, acha, adex, aint, asta, astr, attack, augrestrict,
-                   augtype, avoidance, awis, bagsize, bagslots, bagtype, bagwr, banedmgamt, banedmgraceamt,
-                   banedmgbody, banedmgrace, classes, color, combateffects, extradmgskill, extradmgamt, cr, damage,
-                   damageshield, deity, delay, dotshielding, dr, elemdmgtype, elemdmgamt, endur, fr, fvnodrop,
-                   haste, hp, regen, icon, itemclass, itemtype, lore, loregroup, magic, mana, manaregen, enduranceregen, mr, nodrop, norent, pr, races,
-                   `range`, reclevel, recskill, reqlevel, shielding, size, skillmodtype, skillmodvalue,
-                   slots, clickeffect, spellshield, strikethrough, stunresist, weight, attuneable, svcorruption, skillmodmax,
-                   heroic_str, heroic_int, heroic_wis, heroic_agi, heroic_dex,
-                   heroic_sta, heroic_cha, heroic_pr, heroic_dr, heroic_fr,
-                   heroic_cr, heroic_mr, heroic_svcorrup, healamt, spelldmg, clairvoyance, backstabdmg
-            FROM items
-            WHERE id = %s
-        """
-        try:
-            self.cursor.execute(query, (item_id,))
-            item_data = self.cursor.fetchone()
-        except Exception as exc:
-            messagebox.showerror("Error", f"Failed to load item: {exc}")
-            return False
-        if not item_data:
-            return False
-        if isinstance(item_data, dict):
-            item_stats = item_data
-        else:
-            columns = [
-                "Name", "aagi", "ac", "accuracy", "acha", "adex", "aint", "asta", "astr", "attack", "augrestrict",
-                "augtype", "avoidance", "awis", "bagsize", "bagslots", "bagtype", "bagwr", "banedmgamt", "banedmgraceamt",
-                "banedmgbody", "banedmgrace", "classes", "color", "combateffects", "extradmgskill", "extradmgamt", "cr", "damage",
-                "damageshield", "deity", "delay", "dotshielding", "dr", "elemdmgtype", "elemdmgamt", "endur", "fr", "fvnodrop",
-                "haste", "hp", "regen", "icon", "itemclass", "itemtype", "lore", "loregroup", "magic", "mana", "manaregen", "enduranceregen", "mr", "nodrop", "norent", "pr", "races",
-                "range", "reclevel", "recskill", "reqlevel", "shielding", "size", "skillmodtype", "skillmodvalue",
-                "slots", "clickeffect", "spellshield", "strikethrough", "stunresist", "weight", "attuneable", "svcorruption", "skillmodmax",
-                "heroic_str", "heroic_int", "heroic_wis", "heroic_agi", "heroic_dex",
-                "heroic_sta", "heroic_cha", "heroic_pr", "heroic_dr", "heroic_fr",
-                "heroic_cr", "heroic_mr", "heroic_svcorrup", "healamt", "spelldmg", "clairvoyance", "backstabdmg"
-            ]
-            item_stats = dict(zip(columns, item_data))
-        classes_bitmask = item_stats.get("classes")
-        if classes_bitmask is not None:
-            if classes_bitmask == 65535:
-                item_stats["classes"] = "ALL"
-            else:
-                class_names = []
-                for bit_value, class_name in self.class_bitmask_display.items():
-                    if bit_value != 65535 and classes_bitmask & bit_value:
-                        class_names.append(class_name)
-                item_stats["classes"] = ", ".join(class_names)
-        races_bitmask = item_stats.get("races")
-        if races_bitmask is not None:
-            if races_bitmask == 65535:
-                item_stats["races"] = "ALL"
-            else:
-                race_names = []
-                for bit_value, race_name in self.race_bitmask_display.items():
-                    if bit_value != 65535 and races_bitmask & bit_value:
-                        race_names.append(race_name)
-                item_stats["races"] = ", ".join(race_names)
-        slots_bitmask = item_stats.get("slots")
-        if slots_bitmask is not None:
-            slot_names = []
-            for bit_value, slot_name in SLOT_BITMASK_DISPLAY.items():
-                if slots_bitmask & bit_value and slot_name not in slot_names:
-                    slot_names.append(slot_name)
-            item_stats["slots"] = ", ".join(slot_names)
-        icon_id = item_stats.get("icon")
-        if icon_id:
-            try:
-                icon_path = f"images/icons/item_{icon_id}.gif"
-                item_icon = Image.open(icon_path)
-                item_photo = ImageTk.PhotoImage(item_icon)
-                self.canvas.item_photo = item_photo
-                self.canvas.create_image(28, 57, image=item_photo)
-            except Exception as icon_exc:
-                print(f"Could not load icon: {icon_exc}")
-        if not self.notes_db:
-            display_text = f"{item_stats.get('Name')} (ID: {item_id})"
-            self.canvas.create_text(5, 5, text=display_text, fill="white", anchor="nw", font=("Arial", 10, "bold"))
-        config = ITEM_STAT_DISPLAY_CONFIG
-        for stat_name, pos_config in config["header_positions"].items():
-            if stat_name in item_stats and item_stats[stat_name] not in (None, ""):
-                value = item_stats[stat_name]
-                if pos_config.get("label") is None:
-                    stat_text = f"{value}"
-                else:
-                    stat_text = f"{pos_config['label']}: {value}"
-                self.canvas.create_text(
-                    pos_config["x"],
-                    pos_config["y"],
-                    text=stat_text,
-                    fill=pos_config["color"],
-                    anchor="nw",
-                    font=pos_config["font"]
-                )
-        property_config = config["property_row"]
-        items_placed = 0
-        for prop_name, prop_config in property_config["properties"].items():
-            if prop_name in item_stats and item_stats[prop_name] is not None:
-                value = item_stats[prop_name]
-                if "format" in prop_config:
-                    formatted_value = prop_config["format"](value)
-                    if not formatted_value:
-                        continue
-                    value = formatted_value
-                elif value == "":
-                    continue
-                current_x = property_config["base_x"] + (items_placed * property_config["spacing"])
-                self.canvas.create_text(
-                    current_x,
-                    property_config["y"],
-                    text=str(value),
-                    fill=prop_config["color"],
-                    anchor="nw",
-                    font=prop_config["font"]
-                )
-                items_placed += 1
-        def display_column_stats(column_config, stats):
-            x = column_config["x"]
-            y = column_config["y"]
-            spacing = column_config["spacing"]
-            for stat in column_config["stats"]:
-                stat_name = stat["name"]
-                stat_label = stat["label"]
-                stat_color = stat["color"]
-                if stat_name in stats and stats[stat_name] != 0:
-                    value = stats[stat_name]
-                    stat_text = f"{stat_label}: {value}"
-                    self.canvas.create_text(
-                        x,
-                        y,
-                        text=stat_text,
-                        fill=stat_color,
-                        anchor="nw",
-                        font=("Arial", 8)
-                    )
-                    if "heroic_stats" in column_config:
-                        for heroic_stat in column_config["heroic_stats"]:
-                            if heroic_stat["label"] == stat_label:
-                                heroic_stat_name = heroic_stat["name"]
-                                if heroic_stat_name in stats and stats[heroic_stat_name] != 0:
-                                    heroic_value = stats[heroic_stat_name]
-                                    heroic_text = f" ({heroic_value})"
-                                    try:
-                                        bbox = self.canvas.bbox(self.canvas.find_all()[-1])
-                                        heroic_x = bbox[2] if bbox else x + 50
-                                    except Exception:
-                                        heroic_x = x + 50
-                                    self.canvas.create_text(
-                                        heroic_x,
-                                        y,
-                                        text=heroic_text,
-                                        fill="gold",
-                                        anchor="nw",
-                                        font=("Arial", 9)
-                                    )
-                    y += spacing
-        for column in config["stat_columns"]:
-            display_column_stats(column, item_stats)
-        return True
+        return False
     def on_lootdrop_edit(self, event):
         """Handle loot drop editing"""
         tree = event.widget
@@ -1608,22 +1451,9 @@ class LootManagerTool:
     def _set_background_image_for_race(self, race_id, gender=None):
         """Update the MAIN background (default.jpg) based on race; do NOT touch item viewer."""
         try:
-            pattern = os.path.join("images", "raceimages", f"{race_id}_*.jpg")
-            candidates = sorted(glob.glob(pattern))
-            def score(path):
-                base = os.path.basename(path)
-                parts = base.split("_")
-                s = 0
-                if len(parts) >= 2 and parts[1] == '2':
-                    s += 10
-                if gender is not None and len(parts) >= 2 and parts[1].isdigit() and int(parts[1]) == gender:
-                    s += 5
-                return -s
-            if candidates:
-                candidates.sort(key=score)
-                chosen = candidates[0]
-                img = Image.open(chosen)
-                self.bg2_image = ImageTk.PhotoImage(img)
+            chosen = get_asset_catalog().find_race_image(race_id, gender=gender)
+            if chosen:
+                self.bg2_image = get_image_registry().get_photo(chosen)
                 if hasattr(self, 'main_canvas') and self.main_canvas:
                     try:
                         self.main_canvas.configure(width=self.bg2_image.width(), height=self.bg2_image.height())
@@ -2,13 +2,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import os
-import glob
 from PIL import Image, ImageTk
 from mysql.connector import Error
 
 # Allow running this module standalone by adding parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from shared.asset_catalog import get_asset_catalog
+from shared.image_registry import get_image_registry, DEFAULT_BACKGROUND
+
 SPECIAL_ABILITIES_FIELD_TUPLES = [
     ("sa_summon", "Summon", "check", {"fullrow": True}),
     ("sa_summon_p1", "Type (1=To NPC, 2=To Target)", "text", {"default": "1", "width": 8}),
@@ -650,9 +652,7 @@ class NPCEditorTool:
     def _initialize_preview_background(self):
         max_width, max_height = 230, 180
         try:
-            img = Image.open(os.path.join(os.path.dirname(__file__), "..", "images", "other", "default.jpg"))
-            img.thumbnail((max_width, max_height), Image.LANCZOS)
-            self.preview_bg_image = ImageTk.PhotoImage(img)
+            self.preview_bg_image = get_image_registry().get_photo(DEFAULT_BACKGROUND, (max_width, max_height))
             self.preview_canvas.config(width=max_width, height=max_height)
         except Exception:
             self.preview_bg_image = None
@@ -1334,36 +1334,12 @@ class NPCEditorTool:
         race = self._safe_int(self._get_field_value("race"))
         if race is None:
             return None
-        gender = self._safe_int(self._get_field_value("gender"))
-        texture = self._safe_int(self._get_field_value("texture"))
-        helm = self._safe_int(self._get_field_value("helmtexture"))
-        pattern = os.path.join(os.path.dirname(__file__), "..", "images", "raceimages", f"{race}_*.jpg")
-        candidates = glob.glob(pattern)
-        if not candidates:
-            return None
-
-        def score(path):
-            base = os.path.basename(path).replace(".jpg", "")
-            parts = base.split("_")
-            s = 0
-            try:
-                p_gender = int(parts[1]) if len(parts) > 1 else None
-                p_texture = int(parts[2]) if len(parts) > 2 else None
-                p_helm = int(parts[3]) if len(parts) > 3 else None
-            except Exception:
-                p_gender = p_texture = p_helm = None
-            if gender is not None and p_gender == gender:
-                s += 8
-            elif gender is None and p_gender == 2:
-                s += 2
-            if texture is not None and p_texture == texture:
-                s += 4
-            if helm is not None and p_helm == helm:
-                s += 1
-            return -s
-
-        candidates.sort(key=score)
-        return candidates[0]
+        return get_asset_catalog().find_race_image(
+            race,
+            gender=self._safe_int(self._get_field_value("gender")),
+            texture=self._safe_int(self._get_field_value("texture")),
+            helm=self._safe_int(self._get_field_value("helmtexture")),
+        )
 
     def _get_weapon_image_paths(self):
         """Return available weapon image paths for primary, secondary, and ammo models."""
@@ -1380,33 +1356,7 @@ class NPCEditorTool:
             # Suppress default ammo placeholder IT10
             if key == "ammo_idfile" and str(raw).strip().lower() in ("it10", "10"):
                 continue
-            if isinstance(raw, str):
-                cleaned = raw.strip().lower()
-                if cleaned.startswith("it"):
-                    cleaned = cleaned[2:]
-            else:
-                cleaned = str(raw)
-            digits_only = "".join(ch for ch in cleaned if ch.isdigit())
-            if not digits_only:
-                continue
-            base = digits_only.lstrip("0") or "0"
-            candidates = [
-                base,
-                digits_only,
-                base.zfill(3),
-                base.zfill(4),
-                base.zfill(5),
-            ]
-            seen = set()
-            chosen = None
-            for c in candidates:
-                if c in seen:
-                    continue
-                seen.add(c)
-                candidate_path = os.path.join(os.path.dirname(__file__), "..", "images", "Weapon_Images", f"weapon_{c}.jpg")
-                if os.path.exists(candidate_path):
-                    chosen = candidate_path
-                    break
+            chosen = get_asset_catalog().find_weapon_image(raw)
             if chosen:
                 paths.append((chosen, _label.title()))
         return paths
@@ -1420,7 +1370,7 @@ class NPCEditorTool:
         pil_images = []
 
         for entry in image_entries:
-            img = Image.open(entry["path"])
+            img = get_image_registry().get_image(entry["path"]).copy()
             img.thumbnail((max_w, target_height), Image.LANCZOS)
             pil_images.append((img, entry.get("label")))
 
@@ -6,6 +6,8 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from shared.icon_atlas import get_icon_atlas
+
 
 class SpellsManagerTool:
     """Spell Manager Tool modeled after the AA tool layout."""
@@ -1110,16 +1112,10 @@ class SpellsManagerTool:
             icon_id = int(self.new_icon_entry.get() or 0)
         except Exception:
             icon_id = 0
-        icons_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "images", "icons")
-        icon_path = os.path.join(icons_dir, f"{icon_id}.gif")
-        if os.path.exists(icon_path):
-            try:
-                img = tk.PhotoImage(file=icon_path)
-                self.icon_image_ref = img
-                self.icon_preview_label.config(image=img, text="")
-            except Exception:
-                self.icon_preview_label.config(image="", text="No icon")
-                self.icon_image_ref = None
+        img = get_icon_atlas().get_spell_photo(icon_id)
+        if img is not None:
+            self.icon_image_ref = img
+            self.icon_preview_label.config(image=img, text="")
         else:
             self.icon_preview_label.config(image="", text="No icon")
             self.icon_image_ref = None
@@ -3,16 +3,13 @@ from tkinter import ttk, messagebox
 import sys
 import os
 import random
-from PIL import Image, ImageTk
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from shared.theme import set_dark_theme
-from dictionaries import (
-    SLOT_BITMASK_DISPLAY,
-    ITEM_STAT_DISPLAY_CONFIG,
-)
+from shared.image_registry import get_image_registry, ITEM_BACKGROUND
+from shared.item_card import get_item_card_renderer
 
 class TreeviewEdit:
     """Cell editing functionality for Treeview widgets"""
@@ -143,12 +140,9 @@ class TradeskillManagerTool:
         self.tradeskill_names = []
         self.container_lookup = {}
         self.container_ids = []
-        self.class_bitmask_display = {}
-        self.race_bitmask_display = {}
-        self.all_class_mask = 0
-        self.all_race_mask = 0
 
         self.load_lookup_data()
+        self.item_cards = get_item_card_renderer(db_manager, notes_db_manager)
         
         # Initialize UI components
         self.create_ui()
@@ -180,45 +174,6 @@ class TradeskillManagerTool:
 
         self.container_lookup = {row['id']: row['name'] for row in containers}
         self.container_ids = sorted(self.container_lookup)
-
-        try:
-            class_bitmasks = self.notes_db.get_class_bitmasks()
-        except Exception as exc:
-            print(f"Warning: Could not load class bitmask lookup data: {exc}")
-            class_bitmasks = []
-
-        self.class_bitmask_display = {
-            row['bit_value']: row.get('abbr') or row['name']
-            for row in class_bitmasks
-        }
-
-        try:
-            race_bitmasks = self.notes_db.get_race_bitmasks()
-        except Exception as exc:
-            print(f"Warning: Could not load race bitmask lookup data: {exc}")
-            race_bitmasks = []
-
-        self.race_bitmask_display = {
-            row['bit_value']: row.get('abbr') or row['name']
-            for row in race_bitmasks
-        }
-        self.all_class_mask = self._compute_all_mask(self.class_bitmask_display, explicit_all=65535)
-        self.all_race_mask = self._compute_all_mask(self.race_bitmask_display, explicit_all=65535)
-
-    def _compute_all_mask(self, mapping, explicit_all=None):
-        """Compute a combined mask of all individual bits in a lookup mapping."""
-        combined = 0
-        for bit_value in mapping.keys():
-            try:
-                bit_int = int(bit_value)
-            except (TypeError, ValueError):
-                continue
-            if explicit_all is not None and bit_int == explicit_all:
-                continue
-            if bit_int <= 0:
-                continue
-            combined |= bit_int
-        return combined
     
     def create_ui(self):
         """Create the complete Tradeskill Manager UI"""
@@ -307,8 +262,7 @@ class TradeskillManagerTool:
         item_viewer_frame.grid_columnconfigure(0, weight=1)
 
         try:
-            backing_image = Image.open("images/other/itemback.png")
-            self.item_bg_image = ImageTk.PhotoImage(backing_image)
+            self.item_bg_image = get_image_registry().get_photo(ITEM_BACKGROUND)
             display_height = min(260, self.item_bg_image.height())
             self.item_canvas = tk.Canvas(
                 item_viewer_frame,
@@ -775,216 +729,12 @@ class TradeskillManagerTool:
             self.clear_item_viewer("Item details unavailable.")
             return
 
-        item_query = """
-            SELECT DISTINCT Name, aagi, ac, accuracy, acha, adex, aint, asta, astr, attack, augrestrict,
-                   augtype, avoidance, awis, bagsize, bagslots, bagtype, bagwr, banedmgamt, banedmgraceamt,
-                   banedmgbody, banedmgrace, classes, color, combateffects, extradmgskill, extradmgamt, cr, damage,
-                   damageshield, deity, delay, dotshielding, dr, elemdmgtype, elemdmgamt, endur, fr, fvnodrop,
-                   haste, hp, regen, icon, itemclass, itemtype, lore, loregroup, magic, mana, manaregen, enduranceregen, mr,
-                   nodrop, norent, pr, races, `range`, reclevel, recskill, reqlevel, shielding, size, skillmodtype, skillmodvalue,
-                   slots, clickeffect, spellshield, strikethrough, stunresist, weight, attuneable, svcorruption, skillmodmax,
-                   heroic_str, heroic_int, heroic_wis, heroic_agi, heroic_dex,
-                   heroic_sta, heroic_cha, heroic_pr, heroic_dr, heroic_fr,
-                   heroic_cr, heroic_mr, heroic_svcorrup, healamt, spelldmg, clairvoyance, backstabdmg
-            FROM items
-            WHERE id = %s
-        """
-        item_data = self.fetch_data(item_query, (item_id_int,), fetch_all=False)
-        if not item_data:
+        if not self.item_cards.draw_card(self.item_canvas, item_id_int):
             self.clear_item_viewer(f"Item ID {item_id_int} not found.")
             return
 
-        self.clear_item_viewer(None)
-
-        # Support both dict and sequence results
-        columns = [
-            "Name", "aagi", "ac", "accuracy", "acha", "adex", "aint", "asta", "astr", "attack", "augrestrict",
-            "augtype", "avoidance", "awis", "bagsize", "bagslots", "bagtype", "bagwr", "banedmgamt", "banedmgraceamt",
-            "banedmgbody", "banedmgrace", "classes", "color", "combateffects", "extradmgskill", "extradmgamt", "cr", "damage",
-            "damageshield", "deity", "delay", "dotshielding", "dr", "elemdmgtype", "elemdmgamt", "endur", "fr", "fvnodrop",
-            "haste", "hp", "regen", "icon", "itemclass", "itemtype", "lore", "loregroup", "magic", "mana", "manaregen", "enduranceregen", "mr",
-            "nodrop", "norent", "pr", "races", "range", "reclevel", "recskill", "reqlevel", "shielding", "size", "skillmodtype", "skillmodvalue",
-            "slots", "clickeffect", "spellshield", "strikethrough", "stunresist", "weight", "attuneable", "svcorruption", "skillmodmax",
-            "heroic_str", "heroic_int", "heroic_wis", "heroic_agi", "heroic_dex",
-            "heroic_sta", "heroic_cha", "heroic_pr", "heroic_dr", "heroic_fr",
-            "heroic_cr", "heroic_mr", "heroic_svcorrup", "healamt", "spelldmg", "clairvoyance", "backstabdmg"
-        ]
-
-        if isinstance(item_data, dict):
-            item_stats = dict(item_data)
-        else:
-            item_stats = dict(zip(columns, item_data))
-
-        # Display icon if available
-        icon_id = item_stats.get("icon")
-        if icon_id:
-            try:
-                icon_path = f"images/icons/item_{icon_id}.gif"
-                icon_image = Image.open(icon_path)
-                icon_photo = ImageTk.PhotoImage(icon_image)
-                self.item_canvas.item_photo = icon_photo
-                self.item_canvas.create_image(28, 57, image=icon_photo)
-            except Exception as exc:
-                print(f"Could not load icon: {exc}")
-
-        # Decode class, race, and slot bitmasks for readability
-        classes_bitmask = item_stats.get("classes")
-        if classes_bitmask is not None:
-            if isinstance(classes_bitmask, str):
-                try:
-                    classes_bitmask = int(classes_bitmask)
-                except ValueError:
-                    classes_bitmask = None
-            if classes_bitmask is not None:
-                mask_value = classes_bitmask
-                if mask_value == 65535 or (self.all_class_mask and (mask_value & self.all_class_mask) == self.all_class_mask):
-                    item_stats["classes"] = "ALL"
-                else:
-                    class_names = []
-                    for bit_value, class_name in self.class_bitmask_display.items():
-                        try:
-                            bit_int = int(bit_value)
-                        except (TypeError, ValueError):
-                            continue
-                        if bit_int == 65535 or bit_int <= 0:
-                            continue
-                        if mask_value & bit_int:
-                            class_names.append(class_name)
-                    item_stats["classes"] = ", ".join(class_names) if class_names else str(mask_value)
-
-        races_bitmask = item_stats.get("races")
-        if races_bitmask is not None:
-            if isinstance(races_bitmask, str):
-                try:
-                    races_bitmask = int(races_bitmask)
-                except ValueError:
-                    races_bitmask = None
-            if races_bitmask is not None:
-                mask_value = races_bitmask
-                if mask_value == 65535 or (self.all_race_mask and (mask_value & self.all_race_mask) == self.all_race_mask):
-                    item_stats["races"] = "ALL"
-                else:
-                    race_names = []
-                    for bit_value, race_name in self.race_bitmask_display.items():
-                        try:
-                            bit_int = int(bit_value)
-                        except (TypeError, ValueError):
-                            continue
-                        if bit_int == 65535 or bit_int <= 0:
-                            continue
-                        if mask_value & bit_int:
-                            race_names.append(race_name)
-                    item_stats["races"] = ", ".join(race_names) if race_names else str(mask_value)
-
-        slots_bitmask = item_stats.get("slots")
-        if slots_bitmask is not None:
-            if isinstance(slots_bitmask, str):
-                try:
-                    slots_bitmask = int(slots_bitmask)
-                except ValueError:
-                    slots_bitmask = None
-            if slots_bitmask is not None:
-                slot_names = [
-                    slot_name for bit_value, slot_name in SLOT_BITMASK_DISPLAY.items() if slots_bitmask & bit_value
-                ]
-                item_stats["slots"] = ", ".join(dict.fromkeys(slot_names))
-
-        config = ITEM_STAT_DISPLAY_CONFIG
-        def _has_value(val):
-            if val in (None, "", 0, 0.0):
-                return False
-            if isinstance(val, str):
-                stripped = val.strip()
-                if stripped == "":
-                    return False
-                try:
-                    return float(stripped) != 0
-                except ValueError:
-                    return True
-            return True
-
-        # Header information
-        for stat_name, pos_config in config["header_positions"].items():
-            if stat_name in item_stats and item_stats[stat_name] not in (None, ""):
-                value = item_stats[stat_name]
-                if pos_config.get("label") is None:
-                    stat_text = f"{value}"
-                else:
-                    stat_text = f"{pos_config['label']}: {value}"
-                self.item_canvas.create_text(
-                    pos_config["x"],
-                    pos_config["y"],
-                    text=stat_text,
-                    fill=pos_config["color"],
-                    anchor="nw",
-                    font=pos_config["font"],
-                )
-
-        # Property row
-        property_config = config["property_row"]
-        items_placed = 0
-        for prop_name, prop_config in property_config["properties"].items():
-            if prop_name in item_stats and _has_value(item_stats[prop_name]):
-                value = item_stats[prop_name]
-                if "format" in prop_config:
-                    value = prop_config["format"](value)
-                    if not value:
-                        continue
-                current_x = property_config["base_x"] + (items_placed * property_config["spacing"])
-                self.item_canvas.create_text(
-                    current_x,
-                    property_config["y"],
-                    text=value,
-                    fill=prop_config["color"],
-                    anchor="nw",
-                    font=prop_config["font"],
-                )
-                items_placed += 1
-
-        # Stat columns
-        def display_column_stats(column_config, stats):
-            x = column_config["x"]
-            y = column_config["y"]
-            spacing = column_config["spacing"]
-            for stat in column_config["stats"]:
-                stat_name = stat["name"]
-                stat_label = stat["label"]
-                stat_color = stat["color"]
-                if stat_name in stats and _has_value(stats[stat_name]):
-                    value = stats[stat_name]
-                    stat_text = f"{stat_label}: {value}"
-                    self.item_canvas.create_text(
-                        x,
-                        y,
-                        text=stat_text,
-                        fill=stat_color,
-                        anchor="nw",
-                        font=("Arial", 8),
-                    )
-
-                    if "heroic_stats" in column_config:
-                        for heroic_stat in column_config["heroic_stats"]:
-                            if heroic_stat["label"] == stat_label:
-                                heroic_name = heroic_stat["name"]
-                                if heroic_name in stats and _has_value(stats[heroic_name]):
-                                    heroic_value = stats[heroic_name]
-                                    try:
-                                        bbox = self.item_canvas.bbox(self.item_canvas.find_all()[-1])
-                                        heroic_x = bbox[2] if bbox else x + 50
-                                    except Exception:
-                                        heroic_x = x + 50
-                                    self.item_canvas.create_text(
-                                        heroic_x,
-                                        y,
-                                        text=f" ({heroic_value})",
-                                        fill="gold",
-                                        anchor="nw",
-                                        font=("Arial", 9),
-                                    )
-                    y += spacing
-
-        for column in config["stat_columns"]:
-            display_column_stats(column, item_stats)
+        if self.item_bg_image:
+            self.item_canvas.configure(scrollregion=(0, 0, self.item_bg_image.width(), self.item_bg_image.height()))
 
     def get_tradeskill_id_from_name(self, tradeskill_name):
         """Resolve a tradeskill name to its numeric ID."""